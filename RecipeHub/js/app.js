@@ -157,9 +157,9 @@ const fetchPodcastData = () => {
 };
 
 const verificationCheck = async () => {
-  const res = await fetch("/api/chat/profile/");
-  const data = await res.json();
   const userId = localStorage.getItem("user_id");
+  const res = await fetch(`/api/chat/profile/?user=${userId}`);
+  const data = await res.json();
   const userProfile = data.find((item) => item.user.id == userId);
   if (userProfile) {
     return userProfile.verified;
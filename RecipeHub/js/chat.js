@@ -34,7 +34,7 @@ const allGroup = () => {
 allGroup();
 
 const setGroupIdLocalStorage = () => {
-  fetch("/api/chat/group/")
+  fetch(`/api/chat/group/?group_name=${encodeURIComponent(search_group_name)}`)
     .then((res) => res.json())
     .then((data) =>
       data.forEach((item) => {
@@ -48,16 +48,13 @@ const setGroupIdLocalStorage = () => {
 setGroupIdLocalStorage();
 
 const showMessage = () => {
-  fetch("/api/chat/message/")
+  // Latest page of the room's history, oldest message first
+  fetch(`/api/chat/group/${localStorage.getItem("group")}/messages/`)
     .then((res) => res.json())
     .then((data) => {
       const chatMessages = document.getElementById("chatMessages"); // Assuming chatMessages is the container for messages
       chatMessages.innerHTML = ""; // Clear the container first
-      data.forEach((item) => {
-        if (item.group == localStorage.getItem("group")) {
-          displayMsg(item);
-        }
-      });
+      data.results.forEach((item) => displayMsg(item));
       // Scroll to the bottom after all messages are displayed
       chatMessages.scrollTop = chatMessages.scrollHeight;
     });
@@ -68,61 +65,47 @@ showMessage();
 const displayMsg = (item) => {
   const chatMessages = document.getElementById("chatMessages");
 
-  // Fetch the user data for the message author
-  fetch(`/api/user/list/${item.author}/`)
-    .then((res) => res.json())
-    .then((userData) => {
-      // Fetch the profile to get the user images
-      fetch("/api/chat/profile/")
-        .then((res) => res.json())
-        .then((profiles) => {
-          // Find the profile for the message author
-          const authorProfile = profiles.find((profile) => profile.user.id == item.author);
-
-          let profileImage = "./assets/card4.jpg"; // Default image if no profile found
-          if (authorProfile) {
-            profileImage = authorProfile.image; // Use profile image if found
-          }
-
-          let messageHTML = ""; // Initialize message HTML
-
-          // Check if the logged-in user is the message author
-          if (getUserId() == item.author) {
-            messageHTML = `
-                <div class="flex justify-end items-center space-x-3 new-message">
-                    <div>
-                        <div class="text-sm font-semibold text-right text-base-200 px-4">${userData.username}</div>
-                        <div class="bg-blue-500 text-white rounded-lg p-4 max-w-xs shadow">
-                            <p>${item.body}</p> <!-- Display message content here -->
-                        </div>
-                    </div>
-                    <img src="${profileImage}" alt="${userData.username}" class="w-12 h-12 mt-5 rounded-full" />
+  // Author name and image come with the message
+  const username = item.author_username || "User";
+  const profileImage = item.author_image || "./assets/card4.jpg"; // Default image if no profile found
+
+  let messageHTML = ""; // Initialize message HTML
+
+  // Check if the logged-in user is the message author
+  if (getUserId() == item.author) {
+    messageHTML = `
+        <div class="flex justify-end items-center space-x-3 new-message">
+            <div>
+                <div class="text-sm font-semibold text-right text-base-200 px-4">${username}</div>
+                <div class="bg-blue-500 text-white rounded-lg p-4 max-w-xs shadow">
+                    <p>${item.body}</p> <!-- Display message content here -->
                 </div>
-              `;
-          } else {
-            messageHTML = `
-                <div class="flex justify-start items-center space-x-3 new-message">
-                    <img src="${profileImage}" alt="${userData.username}" class="w-11 h-11 mt-5 rounded-full" />
-                    <div>
-                        <div class="text-sm font-semibold text-left text-base-200 px-4">${userData.username}</div>
-                        <div class="bg-gray-200 text-black rounded-lg p-4 max-w-xs shadow">
-                            <p>${item.body}</p> <!-- Display message content here -->
-                        </div>
-                    </div>
+            </div>
+            <img src="${profileImage}" alt="${username}" class="w-12 h-12 mt-5 rounded-full" />
+        </div>
+      `;
+  } else {
+    messageHTML = `
+        <div class="flex justify-start items-center space-x-3 new-message">
+            <img src="${profileImage}" alt="${username}" class="w-11 h-11 mt-5 rounded-full" />
+            <div>
+                <div class="text-sm font-semibold text-left text-base-200 px-4">${username}</div>
+                <div class="bg-gray-200 text-black rounded-lg p-4 max-w-xs shadow">
+                    <p>${item.body}</p> <!-- Display message content here -->
                 </div>
-              `;
-          }
-
-          // Append the new message HTML to the chat container
-          chatMessages.innerHTML += messageHTML;
+            </div>
+        </div>
+      `;
+  }
 
-          // Scroll to the bottom after new messages are added
-          chatMessages.scrollTop = chatMessages.scrollHeight;
-        });
-    });
+  // Append the new message HTML to the chat container
+  chatMessages.insertAdjacentHTML("beforeend", messageHTML);
 };
 
-var ws = new WebSocket(`ws://localhost:8000/ws/ac/${search_group_name_modified}/`);
+// The access token tells the server who is posting, messages of sockets
+// without one are not accepted
+const accessToken = JSON.parse(localStorage.getItem("tokens") || "{}").access || "";
+var ws = new WebSocket(`ws://localhost:8000/ws/ac/${search_group_name_modified}/?token=${accessToken}`);
 
 ws.onopen = function (event) {
   console.log("Websocket connection open...");
@@ -151,32 +134,13 @@ const chatMessages = document.getElementById("chatMessages");
 sendButton.addEventListener("click", () => {
   const messageText = messageInput.value.trim();
   if (messageText) {
-    // Message send to the backend
+    // Message send to the backend, which also saves it to the database
     ws.send(
       JSON.stringify({
         msg: messageText,
       })
     );
 
-    // Save the message to the database
-    const group = localStorage.getItem("group");
-    const info = {
-      group: group,
-      author: getUserId(),
-      body: messageText,
-    };
-    fetch("/api/chat/message/", {
-      method: "POST",
-      headers: {
-        "Content-Type": "application/json",
-      },
-      body: JSON.stringify(info),
-    })
-      .then((response) => response.json())
-      .then((data) => {
-        console.log("Message saved to database:", data);
-      });
-
     ws.onmessage = function (event) {
       console.log("Message received from server...", event.data);
       const data = JSON.parse(event.data);
@@ -17,6 +17,7 @@ class FoodMapApp {
     this.userFavorites = new Set();
     this.googleMapsApiKey = null;
     this.searchRadius = 2000; // Default 2km
+    this.maxResultPages = 10; // Pages of 100 results loaded per search
     this.locationContext = null;
     this.isTrackingLocation = false;
 
@@ -154,18 +155,10 @@ class FoodMapApp {
         radius: this.searchRadius,
       };
 
-      const response = await fetch(`${this.apiBaseUrl}/food-items/nearby/`, {
-        method: "POST",
-        headers: {
-          "Content-Type": "application/json",
-          "X-CSRFToken": this.getCsrfToken(),
-        },
-        body: JSON.stringify(requestData),
-      });
+      const data = await this.postAllPages("/food-items/nearby/", requestData);
 
-      if (response.ok) {
-        const data = await response.json();
-        this.currentFoodItems = data.results || [];
+      if (data) {
+        this.currentFoodItems = data.results;
         this.locationContext = data.location_context;
 
         this.renderFoodItemsOnMap();
@@ -174,7 +167,8 @@ class FoodMapApp {
         this.hideLoading();
 
         if (data.results.length > 0) {
-          this.showSuccess(`🎉 Found ${data.results.length} food items near you!`);
+          const found = `${data.results.length}${data.has_more ? "+" : ""}`;
+          this.showSuccess(`🎉 Found ${found} food items near you!`);
         } else {
           this.showNotification("😋 No food items found nearby. Be the first to add one!", "info");
         }
@@ -189,6 +183,43 @@ class FoodMapApp {
     }
   }
 
+  // POST a nearby/search request and follow next_cursor through its pages, up
+  // to maxResultPages. Returns the first page's data with the results of all
+  // loaded pages and has_more set when pages were left, or null on failure.
+  async postAllPages(path, requestData) {
+    let data = null;
+    let results = [];
+    let cursor = null;
+
+    for (let page = 0; page < this.maxResultPages; page++) {
+      const response = await fetch(`${this.apiBaseUrl}${path}`, {
+        method: "POST",
+        headers: {
+          "Content-Type": "application/json",
+          "X-CSRFToken": this.getCsrfToken(),
+        },
+        body: JSON.stringify({
+          ...requestData,
+          page_size: 100,
+          // The location context comes with the first page only
+          ...(cursor && { cursor, include_location_context: false }),
+        }),
+      });
+      if (!response.ok) {
+        if (!data) return null;
+        break;
+      }
+
+      const pageData = await response.json();
+      data = data || pageData;
+      results = results.concat(pageData.results || []);
+      cursor = pageData.next_cursor;
+      if (!cursor) break;
+    }
+
+    return { ...data, results, has_more: Boolean(cursor) };
+  }
+
   async searchFoodItems(query) {
     if (!query.trim()) return;
 
@@ -205,18 +236,10 @@ class FoodMapApp {
         requestData.radius = 5000; // 5km for search
       }
 
-      const response = await fetch(`${this.apiBaseUrl}/food-items/search/`, {
-        method: "POST",
-        headers: {
-          "Content-Type": "application/json",
-          "X-CSRFToken": this.getCsrfToken(),
-        },
-        body: JSON.stringify(requestData),
-      });
+      const data = await this.postAllPages("/food-items/search/", requestData);
 
-      if (response.ok) {
-        const data = await response.json();
-        this.currentFoodItems = data.results || [];
+      if (data) {
+        this.currentFoodItems = data.results;
         if (data.location_context) {
           this.locationContext = data.location_context;
         }
@@ -224,7 +247,7 @@ class FoodMapApp {
         this.renderFoodItemsOnMap();
         this.renderFoodItemsList();
         this.hideLoading();
-        this.showSearchResults(query, data.count || 0);
+        this.showSearchResults(query, `${data.results.length}${data.has_more ? "+" : ""}`);
       } else {
         this.hideLoading();
         this.showError("Search failed. Please try again.");
@@ -17,8 +17,7 @@ const navBar = () => {
 };
 
 const loadPostForTrending = () => {
-  fetch("/api/kitchen/post/")
-    .then((res) => res.json())
+  fetchAllPages("/api/kitchen/post/")
     .then((data) => {
       const winterRecipes = data.filter((item) => item.seasonal === "Winter");
       displayTrendingData(winterRecipes);
@@ -70,45 +69,17 @@ const displayTrendingData = (items) => {
 };
 
 const popularRecipeCount = () => {
-  fetch("/api/comment/react/list/")
+  // Trending recipes, ranked by time-decayed reactions and comments
+  fetch("/api/popular/trending/?limit=12")
     .then((res) => res.json())
     .then((data) => {
       if (!data || data.length === 0) {
-        console.log("No reaction data available");
+        console.log("No popular recipes found");
         return;
       }
-
-      // Create a map to count occurrences of each recipe_id
-      const recipeCount = {};
-      data.forEach((item) => {
-        const recipeId = item.recipe;
-        if (recipeCount[recipeId]) {
-          recipeCount[recipeId]++;
-        } else {
-          recipeCount[recipeId] = 1;
-        }
-      });
-      const popularRecipes = Object.keys(recipeCount).filter((recipeId) => recipeCount[recipeId] >= 3);
-      getPopularRecipe(popularRecipes);
-    })
-    .catch((error) => console.error("Error fetching reaction data:", error));
-};
-
-const getPopularRecipe = (recipeIdObject) => {
-  if (!recipeIdObject || recipeIdObject.length === 0) {
-    console.log("No popular recipes found");
-    return;
-  }
-
-  const recipeIds = Object.values(recipeIdObject);
-  fetch("/api/kitchen/post/")
-    .then((res) => res.json())
-    .then((data) => {
-      // Filter the recipes whose recipe IDs match the extracted recipeIds
-      const filteredRecipes = data.filter((recipe) => recipeIds.includes(String(recipe.id)));
-      displayPopularRecipe(filteredRecipes);
+      displayPopularRecipe(data);
     })
-    .catch((error) => console.error("Error fetching recipes:", error));
+    .catch((error) => console.error("Error fetching popular recipes:", error));
 };
 
 const displayPopularRecipe = (recipes) => {
@@ -215,8 +186,7 @@ const loadFilteredRecipes = (filterType) => {
     </div>
   `;
 
-  fetch("/api/kitchen/post/")
-    .then((res) => res.json())
+  fetchAllPages("/api/kitchen/post/")
     .then((data) => {
       let filteredData = [];
 
@@ -0,0 +1,25 @@
+/**
+ * List endpoints return one page of results and announce the next page in a
+ * `Link: <url>; rel="next"` header.
+ */
+
+// URL of the next page of a list response, or null on the last page
+const nextPageUrl = (response) => {
+  const link = response.headers.get("Link");
+  const match = link && link.match(/<([^>]+)>;\s*rel="next"/);
+  return match ? match[1] : null;
+};
+
+// Fetch every page of a list endpoint, resolves to all the results
+const fetchAllPages = async (url, options = {}) => {
+  const results = [];
+  while (url) {
+    const response = await fetch(url, options);
+    if (!response.ok) {
+      throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    results.push(...(await response.json()));
+    url = nextPageUrl(response);
+  }
+  return results;
+};
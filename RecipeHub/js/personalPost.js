@@ -12,7 +12,9 @@ const getUser = () => {
   }
 };
 
-const ws = new WebSocket(`ws://localhost/ws/notifications/`);
+// The access token tells the server whose notifications this socket receives
+const accessToken = JSON.parse(localStorage.getItem("tokens") || "{}").access || "";
+const ws = new WebSocket(`ws://localhost/ws/notifications/?token=${accessToken}`);
 
 ws.onopen = function (event) {
   console.log("Websocket connection open...");
@@ -78,12 +80,10 @@ ws.onmessage = function (event) {
 };
 
 const toggleReaction = (recipeId, to_userId) => {
-  const from_userId = localStorage.getItem("user_id");
+  // The server reacts as the user of the socket's token
   ws.send(
     JSON.stringify({
       recipe_id: recipeId,
-      to_userId: to_userId,
-      from_userId: from_userId,
     })
   );
 };
@@ -109,10 +109,9 @@ function toggleComments(button, recipeID) {
       apiBaseUrl = `${protocol}//localhost:8000`;
     }
 
-    const commentUrl = `${apiBaseUrl}/api/comment/list/`;
+    const commentUrl = `${apiBaseUrl}/api/comment/list/?recipe=${recipeID}`;
 
-    fetch(commentUrl)
-      .then((res) => res.json())
+    fetchAllPages(commentUrl)
       .then((data) => {
         // Clear previous comments (if any)
         commentsSection.innerHTML = ""; // Clear existing comments
@@ -158,9 +157,7 @@ async function fetchGroups() {
 
     const url = `${apiBaseUrl}/api/chat/group/`;
 
-    const response = await fetch(url);
-    if (!response.ok) throw new Error("Network response was not ok");
-    const groups = await response.json();
+    const groups = await fetchAllPages(url);
 
     // Get the group list element
     const groupList = document.getElementById("group-list");
@@ -317,17 +314,10 @@ const allPost = () => {
     apiBaseUrl = `${protocol}//localhost:8000`;
   }
 
-  const url = `${apiBaseUrl}/api/kitchen/post/`;
+  const url = `${apiBaseUrl}/api/kitchen/post/?user=${localStorage.getItem("user_id")}`;
   console.log("🔍 Fetching personal recipes from:", url);
 
-  fetch(url)
-    .then((res) => {
-      console.log("📡 Response status:", res.status);
-      if (!res.ok) {
-        throw new Error(`HTTP error! status: ${res.status}`);
-      }
-      return res.json();
-    })
+  fetchAllPages(url)
     .then((data) => {
       console.log("📊 Received recipes:", data.length);
       const currentUserId = localStorage.getItem("user_id");
@@ -1,7 +1,7 @@
 const userId = localStorage.getItem("user_id");
 var profile_id = 1;
 const loadProfile = () => {
-  fetch(`/api/chat/profile/`)
+  fetch(`/api/chat/profile/?user=${userId}`)
     .then((res) => res.json())
     .then((data) => {
       data.forEach((item) => {
@@ -67,8 +67,7 @@ const navBar = () => {
 };
 
 const orderShow = () => {
-  fetch("/api/order/list/")
-    .then((res) => res.json())
+  fetchAllPages(`/api/order/list/?user=${localStorage.getItem("user_id")}`)
     .then((data) =>
       data.forEach((item) => {
         if (item.user == localStorage.getItem("user_id")) {
@@ -12,7 +12,9 @@ const getUser = () => {
   }
 };
 
-const ws = new WebSocket(`ws://localhost/ws/notifications/`);
+// The access token tells the server whose notifications this socket receives
+const accessToken = JSON.parse(localStorage.getItem("tokens") || "{}").access || "";
+const ws = new WebSocket(`ws://localhost/ws/notifications/?token=${accessToken}`);
 
 ws.onopen = function (event) {
   console.log("Websocket connection open...");
@@ -78,12 +80,10 @@ ws.onmessage = function (event) {
 };
 
 const toggleReaction = (recipeId, to_userId) => {
-  const from_userId = localStorage.getItem("user_id");
+  // The server reacts as the user of the socket's token
   ws.send(
     JSON.stringify({
       recipe_id: recipeId,
-      to_userId: to_userId,
-      from_userId: from_userId,
     })
   );
 };
@@ -98,8 +98,7 @@ function toggleComments(button, recipeID) {
   // Only fetch comments if the section is being opened
   if (isHidden) {
     console.log("Recipe ID:", recipeID);
-    fetch("/api/comment/list/")
-      .then((res) => res.json())
+    fetchAllPages(`/api/comment/list/?recipe=${recipeID}`)
       .then((data) => {
         // Clear previous comments (if any)
         commentsSection.innerHTML = ""; // Clear existing comments
@@ -132,9 +131,7 @@ function toggleComments(button, recipeID) {
 
 async function fetchGroups() {
   try {
-    const response = await fetch("/api/chat/group/");
-    if (!response.ok) throw new Error("Network response was not ok");
-    const groups = await response.json();
+    const groups = await fetchAllPages("/api/chat/group/");
 
     // Get the group list element
     const groupList = document.getElementById("group-list");
@@ -252,15 +249,9 @@ const postSubmit = (event) => {
 
 // For post to view in timeline
 const allPost = () => {
-  fetch("/api/kitchen/post/")
+  fetch(`/api/kitchen/post/${r_id}/`)
     .then((res) => res.json())
-    .then((data) =>
-      data.forEach((item) => {
-        if (item.id == r_id) {
-          displayPost(item);
-        }
-      })
-    )
+    .then((item) => displayPost(item))
     .catch((err) => console.error("Error fetching posts:", err));
 };
 const displayPost = (item) => {
@@ -15,8 +15,7 @@ const navBar = () => {
 };
 
 const user_count = () => {
-  fetch("/api/chat/profile/")
-    .then((res) => res.json())
+  fetchAllPages("/api/chat/profile/")
     .then((data) => {
       const monthlyPremiumCount = Array(12).fill(0); // Array for counting premium users by month
       const monthlyNormalCount = Array(12).fill(0); // Array for counting normal users by month
@@ -136,10 +135,10 @@ function showPlan(planType) {
 }
 
 const checkVerificationAndSubscribe = (planId, price) => {
-  fetch("/api/chat/profile/")
+  const userId = localStorage.getItem("user_id");
+  fetch(`/api/chat/profile/?user=${userId}`)
     .then((res) => res.json())
     .then((data) => {
-      const userId = localStorage.getItem("user_id");
       const userProfile = data.find((item) => item.user.id == userId);
       if (userProfile && userProfile.verified) {
         alert("You already subscribed to a plan");
@@ -193,8 +192,7 @@ const subscriptionHandle = (subscriptionType, amount) => {
 };
 
 const checkSubcribedUser = () => {
-  fetch("/api/order/list/")
-    .then((res) => res.json())
+  fetchAllPages("/api/order/list/?pay_reason=For%20Subcription")
     .then((data) =>
       data.forEach((item) => {
         if (item.pay_reason == "For Subcription") {
@@ -206,7 +204,7 @@ const checkSubcribedUser = () => {
 
 const makeVerified = (user) => {
   console.log(user);
-  fetch("/api/chat/profile/")
+  fetch(`/api/chat/profile/?user=${user}`)
     .then((res) => res.json())
     .then((data) => {
       data.forEach((item) => {
@@ -10,7 +10,9 @@ const getUser = () => {
   }
 };
 
-const ws = new WebSocket(`ws://localhost/ws/notifications/`);
+// The access token tells the server whose notifications this socket receives
+const accessToken = JSON.parse(localStorage.getItem("tokens") || "{}").access || "";
+const ws = new WebSocket(`ws://localhost/ws/notifications/?token=${accessToken}`);
 
 ws.onopen = function (event) {
   console.log("Websocket connection open...");
@@ -66,6 +68,10 @@ function addNotificationMessage(message) {
 // WebSocket onmessage function
 ws.onmessage = function (event) {
   const data = JSON.parse(event.data);
+  if (data["type"] === "reaction_state") {
+    updateLikeButton(data["recipe_id"], data["react"], data["reaction_count"]);
+    return;
+  }
   if (data["to_userId"] == localStorage.getItem("user_id")) {
     notificationCount += 1;
     updateNotificationBadge(notificationCount);
@@ -75,46 +81,21 @@ ws.onmessage = function (event) {
   }
 };
 
-// Function to check if the user has already liked the recipe
-const checkIfUserLiked = async (recipeId) => {
-  const from_userId = localStorage.getItem("user_id");
-
-  try {
-    const res = await fetch("/api/comment/react/list/");
-    const data = await res.json();
-
-    // Check if this user has already liked the recipe
-    const userHasLiked = data.some((reaction) => reaction.user == from_userId && reaction.recipe == recipeId);
-    return userHasLiked;
-  } catch (error) {
-    console.error("Error fetching reaction data:", error);
-    return false;
-  }
-};
-
-const toggleReaction = async (recipeId, to_userId) => {
-  const from_userId = localStorage.getItem("user_id");
-
-  // Check if the user has already liked the recipe
-  const userHasLiked = await checkIfUserLiked(recipeId);
-
-  if (userHasLiked) {
-    alert("You have already liked this recipe!");
-    return;
-  }
+// Like or unlike a recipe, the server answers with a reaction_state message
+const toggleReaction = (recipeId, to_userId) => {
+  // The server reacts as the user of the socket's token
   ws.send(
     JSON.stringify({
       recipe_id: recipeId,
-      to_userId: to_userId,
-      from_userId: from_userId,
     })
   );
+};
 
-  // After the reaction, update the button state
+// Show whether the user likes a recipe and its reaction count
+const updateLikeButton = (recipeId, liked, count) => {
   const likeButton = document.getElementById(`like-button-${recipeId}`);
   if (likeButton) {
-    likeButton.innerHTML = `<i class="fas fa-thumbs-up mr-1"></i> Liked`;
-    likeButton.disabled = true; // Disable the button
+    likeButton.innerHTML = `<i class="fas fa-thumbs-up mr-1"></i> ${liked ? "Liked" : "Like"} (${count})`;
   } else {
     console.error("Like button element not found!");
   }
@@ -130,8 +111,7 @@ function toggleComments(button, recipeID) {
   // Only fetch comments if the section is being opened
   if (isHidden) {
     console.log("Recipe ID:", recipeID);
-    fetch("/api/comment/list/")
-      .then((res) => res.json())
+    fetchAllPages(`/api/comment/list/?recipe=${recipeID}`)
       .then((data) => {
         // Clear previous comments (if any)
         commentsSection.innerHTML = ""; // Clear existing comments
@@ -163,9 +143,7 @@ function toggleComments(button, recipeID) {
 
 async function fetchGroups() {
   try {
-    const response = await fetch("/api/chat/group/");
-    if (!response.ok) throw new Error("Network response was not ok");
-    const groups = await response.json();
+    const groups = await fetchAllPages("/api/chat/group/");
 
     // Get the group list element
     const groupList = document.getElementById("group-list");
@@ -316,14 +294,7 @@ const allPost = () => {
   const url = `${apiBaseUrl}/api/kitchen/post/`;
   console.log("🔍 Fetching recipes from:", url);
 
-  fetch(url)
-    .then((res) => {
-      console.log("📡 Response status:", res.status);
-      if (!res.ok) {
-        throw new Error(`HTTP error! status: ${res.status}`);
-      }
-      return res.json();
-    })
+  fetchAllPages(url)
     .then((data) => {
       console.log("📊 Received recipes:", data.length);
       if (data && data.length > 0) {
@@ -392,7 +363,7 @@ const displayPost = (item) => {
         <!-- Working here -->
 
             <button id="like-button-${item.id}" class="flex items-center hover:text-gray-800 transition primary-text-color" onclick="toggleReaction(${item.id}, ${item.user})">
-                <i class="fas fa-thumbs-up mr-1"></i> Like
+                <i class="fas fa-thumbs-up mr-1"></i> Like (${item.reaction_count})
             </button>
 
         <!-- To here -->
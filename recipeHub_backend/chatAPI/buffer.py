@@ -0,0 +1,74 @@
+import asyncio
+import logging
+
+from channels.db import database_sync_to_async
+from django.conf import settings
+from django.db import DatabaseError
+
+from .models import GroupMessage
+
+logger = logging.getLogger(__name__)
+
+
+def _write(rows):
+    try:
+        GroupMessage.objects.bulk_create(rows, batch_size=500)
+    except DatabaseError as e:
+        # One bad row (e.g. a deleted author) fails the whole insert, keep the rest
+        logger.warning(f"Bulk insert of {len(rows)} chat messages failed: {e}")
+        for row in rows:
+            try:
+                row.save()
+            except DatabaseError as e:
+                logger.warning(f"Dropped chat message in group {row.group_id}: {e}")
+
+
+class GroupMessageBuffer:
+    """
+    Write-behind buffer for chat messages received over WebSockets. Messages
+    are queued on the event loop and written with one bulk_create once
+    `max_size` are waiting or `max_delay` seconds after the first one.
+
+    Messages still buffered when a process is killed are lost.
+    """
+
+    def __init__(self, max_size: int, max_delay: float):
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self._rows = []
+        self._timer = None
+        self._tasks = set()
+
+    def add(self, **fields) -> None:
+        """Queue one message for writing, never waits on the database"""
+        self._rows.append(GroupMessage(**fields))
+        if len(self._rows) >= self.max_size:
+            self._spawn(self.flush())
+        elif self._timer is None:
+            self._timer = self._spawn(self._flush_later())
+
+    async def flush(self) -> None:
+        """Write everything buffered now"""
+        if self._timer is not None and self._timer is not asyncio.current_task():
+            self._timer.cancel()
+        self._timer = None
+        rows, self._rows = self._rows, []
+        if rows:
+            await database_sync_to_async(_write)(rows)
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.max_delay)
+        await self.flush()
+
+    def _spawn(self, coroutine):
+        # Keep a reference so pending writes are not garbage collected
+        task = asyncio.ensure_future(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+
+group_message_buffer = GroupMessageBuffer(
+    max_size=getattr(settings, "CHAT_MESSAGE_BUFFER_SIZE", 100),
+    max_delay=getattr(settings, "CHAT_MESSAGE_FLUSH_INTERVAL", 1.0),
+)
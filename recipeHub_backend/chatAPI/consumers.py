@@ -2,16 +2,22 @@ from channels.consumer import SyncConsumer, AsyncConsumer
 from channels.exceptions import StopConsumer
 from time import sleep
 from asgiref.sync import sync_to_async
+from channels.db import database_sync_to_async
+from django.db.models import Value
+from django.db.models.functions import Replace
 import json
-connection_counts = {}
+
+from .buffer import group_message_buffer
+from .models import ChatGroup, GroupMessage
+from .presence import room_presence
 
 class MyAsyncConsumer(AsyncConsumer):
     async def websocket_connect(self, event):
         print("Websocket Connected...")
         group_name = self.scope['url_route']['kwargs']['group_name']
-        
-        # Increment the connection count for this group
-        connection_counts[group_name] = connection_counts.get(group_name, 0) + 1
+
+        # Group that messages of this room are saved to
+        self.group_id = await self.get_group_id(group_name)
 
         # Add the channel to the group
         await self.channel_layer.group_add(
@@ -23,24 +29,65 @@ class MyAsyncConsumer(AsyncConsumer):
             'type': 'websocket.accept'
         })
 
-        # Now that the socket is accepted, send the updated count
-        await self.send({
-            'type': 'websocket.send',
-            'text': json.dumps({
-                'type': 'connection_count',
-                'count': connection_counts[group_name]
-            })
-        })
+        # Count this connection in the room across all workers, send the
+        # count to the new socket now and to the rest of the room debounced
+        await room_presence.join(group_name, self.channel_name)
+        await self.presence_count({'count': await room_presence.count(group_name)})
+        room_presence.changed(group_name, self.channel_layer)
 
     async def websocket_receive(self, event):
+        # Only logged in users (see JWTAuthMiddleware) post to the room, and
+        # always as themselves: the author the client sends is ignored
+        user = self.scope.get('user')
+        if user is None or not user.is_authenticated:
+            return
+        body = self.message_body(event.get('text'))
+        if not body:
+            return
+
         group_name = self.scope['url_route']['kwargs']['group_name']
         await self.channel_layer.group_send(
             group_name,
             {
                 'type': 'chat.message',
-                'message': event['text']
+                'message': json.dumps({'msg': body, 'author': user.pk})
             }
         )
+        self.save_message(user.pk, body)
+
+    def message_body(self, text):
+        """The message text of a received {"msg": ...} frame, or None"""
+        try:
+            data = json.loads(text or '')
+        except ValueError:
+            return None
+        if not isinstance(data, dict):
+            return None
+        return str(data.get('msg') or '').strip() or None
+
+    def save_message(self, author_id, body):
+        """Queue a received message for the batched write to GroupMessage"""
+        if self.group_id is None:
+            return
+        max_length = GroupMessage._meta.get_field('body').max_length
+        group_message_buffer.add(
+            group_id=self.group_id,
+            author_id=author_id,
+            body=body[:max_length],
+        )
+
+    @database_sync_to_async
+    def get_group_id(self, group_name):
+        group_id = ChatGroup.objects.filter(group_name=group_name).values_list('id', flat=True).first()
+        if group_id is None:
+            # Room URLs carry the group name with whitespace removed
+            group_id = (
+                ChatGroup.objects.annotate(room=Replace('group_name', Value(' '), Value('')))
+                .filter(room=group_name)
+                .values_list('id', flat=True)
+                .first()
+            )
+        return group_id
 
     async def chat_message(self, event):
         print('Event...', event)
@@ -50,26 +97,24 @@ class MyAsyncConsumer(AsyncConsumer):
             'text': event['message']
         })
     
+    async def presence_count(self, event):
+        await self.send({
+            'type': 'websocket.send',
+            'text': json.dumps({
+                'type': 'connection_count',
+                'count': event['count']
+            })
+        })
+
     async def websocket_disconnect(self, event):
         group_name = self.scope['url_route']['kwargs']['group_name']
-        
-        # Decrement the connection count for this group
-        if group_name in connection_counts:
-            connection_counts[group_name] -= 1
-            if connection_counts[group_name] <= 0:
-                del connection_counts[group_name]  # Remove the group if count is 0
 
+        await room_presence.leave(group_name, self.channel_name)
         await self.channel_layer.group_discard(
             group_name, 
             self.channel_name
             )
 
-        # Send the updated count to the frontend
-        await self.send({
-            'type': 'websocket.send',
-            'text': json.dumps({
-                'type': 'connection_count',
-                'count': connection_counts.get(group_name, 0)
-            })
-        })
+        # Tell the rest of the room, the closed socket cannot be sent to
+        room_presence.changed(group_name, self.channel_layer)
         raise StopConsumer()
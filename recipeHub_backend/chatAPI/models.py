@@ -39,5 +39,11 @@ class GroupMessage(models.Model):
     body = models.CharField(max_length=300)
     created = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Latest messages of a group, read backwards by GroupMessageHistory
+            models.Index(fields=['group', '-created', '-id']),
+        ]
+
     def __str__(self) -> str:
         return f'{self.author} : {self.body}'
\ No newline at end of file
@@ -0,0 +1,168 @@
+import asyncio
+import logging
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "chat:presence:"
+
+
+def _redis_url():
+    """URL of the channel layer's Redis, None for other layers"""
+    layer = settings.CHANNEL_LAYERS.get("default", {})
+    if "redis" not in layer.get("BACKEND", "").lower():
+        return None
+    host = (layer.get("CONFIG", {}).get("hosts") or [("127.0.0.1", 6379)])[0]
+    if isinstance(host, str):
+        return host
+    if isinstance(host, dict):
+        return host.get("address")
+    return f"redis://{host[0]}:{host[1]}"
+
+
+class LocalPresenceStore:
+    """Presence of this process only, for the in-memory channel layer"""
+
+    def __init__(self):
+        self._rooms = {}
+
+    async def touch(self, room, members, expires):
+        self._rooms.setdefault(room, {}).update(dict.fromkeys(members, expires))
+
+    async def remove(self, room, member):
+        self._rooms.get(room, {}).pop(member, None)
+
+    async def count(self, room, now):
+        members = self._rooms.get(room, {})
+        for member in [m for m, expires in members.items() if expires <= now]:
+            del members[member]
+        if not members:
+            self._rooms.pop(room, None)
+        return len(members)
+
+
+class RedisPresenceStore:
+    """
+    Presence shared by every worker: one sorted set per room mapping channel
+    names to the time they expire. Members of a crashed worker stop being
+    refreshed and are dropped once expired.
+    """
+
+    def __init__(self, url, ttl):
+        self.url = url
+        self.ttl = ttl
+        self._client = None
+        self._loop = None
+
+    def client(self):
+        # Connections belong to the event loop they were opened on
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            from redis.asyncio import Redis
+
+            self._client = Redis.from_url(self.url)
+            self._loop = loop
+        return self._client
+
+    async def touch(self, room, members, expires):
+        async with self.client().pipeline(transaction=True) as pipe:
+            pipe.zadd(KEY_PREFIX + room, dict.fromkeys(members, expires))
+            pipe.expire(KEY_PREFIX + room, int(self.ttl * 2))
+            await pipe.execute()
+
+    async def remove(self, room, member):
+        await self.client().zrem(KEY_PREFIX + room, member)
+
+    async def count(self, room, now):
+        async with self.client().pipeline(transaction=True) as pipe:
+            pipe.zremrangebyscore(KEY_PREFIX + room, "-inf", now)
+            pipe.zcard(KEY_PREFIX + room)
+            _, count = await pipe.execute()
+        return count
+
+
+class RoomPresence:
+    """
+    Who is connected to each chat room, across all workers.
+
+    Connections join and leave a room; a heartbeat task re-announces this
+    process's connections every ttl / 3 seconds. Count changes are sent to
+    the room's group at most once per `broadcast_delay` per process, so a
+    reconnect storm costs one broadcast instead of one per connection.
+    """
+
+    def __init__(self, store, ttl, broadcast_delay):
+        self.store = store
+        self.ttl = ttl
+        self.broadcast_delay = broadcast_delay
+        self._local = {}  # room -> channel names connected to this process
+        self._pending = {}  # room -> scheduled broadcast task
+        self._heartbeat = None
+
+    async def join(self, room, channel_name):
+        self._local.setdefault(room, set()).add(channel_name)
+        await self.store.touch(room, [channel_name], time.time() + self.ttl)
+        if self._heartbeat is None or self._heartbeat.done():
+            self._heartbeat = asyncio.ensure_future(self._beat())
+
+    async def leave(self, room, channel_name):
+        members = self._local.get(room, set())
+        members.discard(channel_name)
+        if not members:
+            self._local.pop(room, None)
+        await self.store.remove(room, channel_name)
+
+    async def count(self, room):
+        return await self.store.count(room, time.time())
+
+    def changed(self, room, channel_layer):
+        """Broadcast the room's count once the current burst settles"""
+        if room not in self._pending:
+            self._pending[room] = asyncio.ensure_future(
+                self._broadcast(room, channel_layer)
+            )
+
+    async def _broadcast(self, room, channel_layer):
+        try:
+            await asyncio.sleep(self.broadcast_delay)
+        finally:
+            del self._pending[room]
+        try:
+            count = await self.count(room)
+            await channel_layer.group_send(
+                room, {"type": "presence.count", "count": count}
+            )
+        except Exception as e:
+            logger.warning(f"Could not broadcast presence of {room}: {e}")
+
+    async def _beat(self):
+        while self._local:
+            await asyncio.sleep(self.ttl / 3)
+            expires = time.time() + self.ttl
+            for room, members in list(self._local.items()):
+                try:
+                    await self.store.touch(room, list(members), expires)
+                except Exception as e:
+                    logger.warning(f"Presence heartbeat of {room} failed: {e}")
+
+
+def _store(ttl):
+    url = _redis_url()
+    if url is None:
+        return LocalPresenceStore()
+    try:
+        import redis.asyncio  # noqa: F401
+    except ImportError:
+        logger.warning("redis is not installed, counting chat presence per process")
+        return LocalPresenceStore()
+    return RedisPresenceStore(url, ttl)
+
+
+_ttl = getattr(settings, "CHAT_PRESENCE_TTL", 60)
+room_presence = RoomPresence(
+    _store(_ttl),
+    ttl=_ttl,
+    broadcast_delay=getattr(settings, "CHAT_PRESENCE_BROADCAST_DELAY", 1.0),
+)
@@ -17,3 +17,12 @@ class GroupMessageSerializer(serializers.ModelSerializer):
     class Meta:
         model = GroupMessage
         fields = '__all__'
+
+class GroupMessageHistorySerializer(serializers.ModelSerializer):
+    """Just what a chat room renders, with the author inlined"""
+    author_username = serializers.CharField(source='author.username', read_only=True, default=None)
+    author_image = serializers.ImageField(source='author.profile.image', read_only=True, default=None)
+
+    class Meta:
+        model = GroupMessage
+        fields = ['id', 'author', 'author_username', 'author_image', 'body', 'created']
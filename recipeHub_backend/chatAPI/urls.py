@@ -1,7 +1,7 @@
 from django.urls import path, include
 from .views import SearchUser
 from rest_framework.routers import DefaultRouter
-from .views import ChatGroupViewset, GroupMessageViewSet ,ProfileViewset
+from .views import ChatGroupViewset, GroupMessageViewSet ,ProfileViewset, GroupMessageHistory
 
 
 router = DefaultRouter()
@@ -11,5 +11,6 @@ router.register('profile', ProfileViewset)
 
 urlpatterns = [
     path('search/<username>/', SearchUser.as_view()),
+    path('group/<int:group_id>/messages/', GroupMessageHistory.as_view()),
     path('', include(router.urls)),
 ]
\ No newline at end of file
@@ -5,8 +5,16 @@ from django.views.decorators.csrf import csrf_exempt
 from rest_framework import generics, status, viewsets
 from rest_framework.response import Response
 
+from recipeHub_backend.filters import FieldFilter
+from recipeHub_backend.pagination import KeysetPagination, LinkHeaderKeysetPagination
+
 from .models import ChatGroup, GroupMessage, Profile
-from .serializers import ChatGroupSerializers, GroupMessageSerializer, ProfileSerializer
+from .serializers import (
+    ChatGroupSerializers,
+    GroupMessageHistorySerializer,
+    GroupMessageSerializer,
+    ProfileSerializer,
+)
 
 
 class SearchUser(generics.ListAPIView):
@@ -32,19 +40,72 @@ class SearchUser(generics.ListAPIView):
         return Response(serializer.data)
 
 
+class ChatHistoryPagination(KeysetPagination):
+    """
+    Pages backwards from the newest message: `?before=<cursor>` returns the
+    messages sent before the oldest one of the previous page. Each page is
+    returned oldest first, ready to prepend to the room.
+    """
+
+    page_size = 50
+    max_page_size = 200
+    page_size_query_param = "limit"
+    cursor_query_param = "before"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return super().paginate_queryset(queryset, request, view)[::-1]
+
+    def get_paginated_response(self, data):
+        return Response({"previous": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["previous"] = response_schema["properties"].pop(
+            "next"
+        )
+        return response_schema
+
+
+class GroupMessageHistory(generics.ListAPIView):
+    """
+    Message history of one group, newest page first.
+    GET /api/chat/group/<group_id>/messages/?before=<cursor>&limit=<n>
+    """
+
+    serializer_class = GroupMessageHistorySerializer
+    pagination_class = ChatHistoryPagination
+
+    def get_queryset(self):
+        # Range read of the (group, created, id) index
+        return (
+            GroupMessage.objects.filter(group_id=self.kwargs["group_id"])
+            .select_related("author__profile")
+            .order_by("-created", "-id")
+        )
+
+
 @method_decorator(csrf_exempt, name="dispatch")
 class ProfileViewset(viewsets.ModelViewSet):
     queryset = Profile.objects.all()
     serializer_class = ProfileSerializer
+    pagination_class = LinkHeaderKeysetPagination
+    filter_backends = [FieldFilter]
+    filter_fields = ("user",)
 
 
 @method_decorator(csrf_exempt, name="dispatch")
 class ChatGroupViewset(viewsets.ModelViewSet):
     queryset = ChatGroup.objects.all()
     serializer_class = ChatGroupSerializers
+    pagination_class = LinkHeaderKeysetPagination
+    filter_backends = [FieldFilter]
+    filter_fields = ("user", "group_name")
 
 
 @method_decorator(csrf_exempt, name="dispatch")
 class GroupMessageViewSet(viewsets.ModelViewSet):
     queryset = GroupMessage.objects.all()
     serializer_class = GroupMessageSerializer
+    pagination_class = LinkHeaderKeysetPagination
+    filter_backends = [FieldFilter]
+    filter_fields = ("group", "author")
@@ -1,74 +1,116 @@
 import json
+import logging
 from channels.generic.websocket import AsyncWebsocketConsumer
-from .models import Reaction
 from kitchen.models import Recipe
-from user.models import CustomUser
+from .models import Reaction
 from channels.db import database_sync_to_async
-from asgiref.sync import sync_to_async
+
+logger = logging.getLogger(__name__)
+
+def notification_group(user_id):
+    """Group of every socket of one user, so a notification reaches only them"""
+    return f'user_notifications_{user_id}'
+
 
 class NotificationConsumer(AsyncWebsocketConsumer):
     async def connect(self):
-        group_name = "notifications"
-        print("websocket connected....", group_name)
-        group_name = f'user_notifications_{group_name}'
-        print("Group Name...", group_name)
-
-        # Join the user notification group
+        # Reactions are made as the socket's user (see JWTAuthMiddleware),
+        # anonymous sockets are refused
+        user = self.scope.get('user')
+        self.group_name = None
+        if user is None or not user.is_authenticated:
+            logger.debug("Refused anonymous notification socket")
+            await self.close()
+            return
+        self.group_name = notification_group(user.pk)
         await self.channel_layer.group_add(
-            group_name, 
+            self.group_name,
             self.channel_name
             )
-        
+        logger.debug("Notification socket connected", extra={'group': self.group_name})
+
         await self.accept()
 
     async def disconnect(self, close_code):
-        print("Websocket disconnected...", close_code)
-        group_name = "notifications"
-        print("websocket disconnected....", group_name)
-        group_name = f'user_notifications_{group_name}'
-        print("Dis Group Name...", group_name)
-        await self.channel_layer.group_discard(
-            group_name, 
-            self.channel_name
-            )
+        logger.debug("Notification socket disconnected", extra={'group': self.group_name, 'close_code': close_code})
+        if self.group_name:
+            await self.channel_layer.group_discard(
+                self.group_name,
+                self.channel_name
+                )
 
     async def receive(self, text_data):
-        group_name = "notifications"
-        group_name = f'user_notifications_{group_name}'
-        data = json.loads(text_data)
-        print("Messaged recived from user ...", data)
-
-        recipe_id = data['recipe_id']
-        from_userId = data['from_userId']
-        to_userId = data['to_userId']
-        print("Recipe ID recived from user...",recipe_id)
-        print("Who reacted: user...",from_userId)
-        print("Where reacted: user...",to_userId)
+        try:
+            data = json.loads(text_data)
+            recipe_id = int(data['recipe_id'])
+            # true/false sets the reaction, leaving it out toggles it
+            react = data.get('react')
+            if react is not None and not isinstance(react, bool):
+                raise ValueError(react)
+        except (ValueError, TypeError, KeyError):
+            logger.warning("Ignored malformed reaction", extra={'payload': text_data[:200]})
+            return
+        from_userId = self.scope['user'].pk
 
-        # Save the reaction to the database
-        reaction, recipe = await self.create_reaction(from_userId, recipe_id)
+        # Save the reaction and load what the notification needs in one hop
+        # to the database thread
+        result = await self.toggle_reaction(from_userId, recipe_id, react)
+        if result is None:
+            return
+        reacted, reaction, reaction_count = result
 
-        user = await sync_to_async(CustomUser.objects.get)(pk=from_userId)
-        await sync_to_async(print)("Username:....", user)
+        # Tell the reacting socket where its reaction now stands
+        await self.send(text_data=json.dumps({
+            'type': 'reaction_state',
+            'recipe_id': recipe_id,
+            'react': reacted,
+            'reaction_count': reaction_count,
+        }))
+        if reaction is None:
+            return
+        logger.info(
+            "Reaction saved",
+            extra={'reaction_id': reaction.pk, 'recipe_id': recipe_id, 'from_user_id': from_userId, 'to_user_id': reaction.recipe.user_id},
+        )
 
-        await sync_to_async(print)("Reaction...:", reaction)
-        await sync_to_async(print)("Recipe...:", recipe)
-        # Notify the user about the new reaction
+        # Notify the recipe's owner, on their sockets only
+        if reaction.recipe.user_id is None:
+            return
+        user = reaction.user
         await self.channel_layer.group_send(
-            group_name,
+            notification_group(reaction.recipe.user_id),
             {
                 'type': 'send_notification',
-                'message': f'{user.first_name} {user.last_name} Reacted To Your {recipe.title} Post',
+                'message': f'{user.first_name} {user.last_name} Reacted To Your {reaction.recipe.title} Post',
                 'recipe_id': recipe_id,
                 'from_userId': from_userId,
-                'to_userId': to_userId
+                'to_userId': reaction.recipe.user_id
             }
         )
+
     @database_sync_to_async
-    def create_reaction(self, user_id, recipe_id):
-        reaction = Reaction.objects.create(user_id=user_id, recipe_id=recipe_id, react=True)
-        recipe = Recipe.objects.get(pk=recipe_id)
-        return reaction, recipe
+    def toggle_reaction(self, user_id, recipe_id, react):
+        """
+        Set or flip a user's reaction (see ReactionQuerySet.toggle). Returns
+        (reacted, the new reaction read back with its user's name and its
+        recipe's title and owner in one joined query or None, the recipe's
+        reaction_count), or None if the recipe or user does not exist.
+        """
+        result = Reaction.objects.toggle(user_id, recipe_id, react)
+        if result is None:
+            logger.warning("Reaction to a missing recipe or user", extra={'recipe_id': recipe_id, 'from_user_id': user_id})
+            return None
+        reacted, changed = result
+
+        if changed is None:
+            reaction_count = Recipe.objects.filter(pk=recipe_id).values_list('reaction_count', flat=True).first()
+            return reacted, None, reaction_count or 0
+        reaction = (
+            Reaction.objects.select_related('user', 'recipe')
+            .only('user__first_name', 'user__last_name', 'recipe__title', 'recipe__user_id', 'recipe__reaction_count')
+            .get(pk=changed.pk)
+        )
+        return True, reaction, reaction.recipe.reaction_count
 
     async def send_notification(self, event):
         message = event['message']
@@ -1,15 +1,78 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from user.models import CustomUser
 from kitchen.models import Recipe
 
+
+class ReactionQuerySet(models.QuerySet):
+    def toggle(self, user_id, recipe_id, react=None):
+        """
+        Set (react=True/False) or flip (react=None) a user's reaction to a
+        recipe; repeating a set is a no-op. The stored row is locked while it
+        changes, so concurrent toggles of the same reaction are applied one
+        after the other and the recipe's reaction_count moves once per real
+        change. Returns (reacted, the reaction if it was just liked or None),
+        or None if the recipe or user does not exist.
+        """
+        with transaction.atomic():
+            reactions = self.filter(user_id=user_id, recipe_id=recipe_id).select_for_update()
+            existing = reactions.first()
+            if react is None:
+                react = not (existing and existing.react)
+
+            if not react:
+                if existing:
+                    existing.delete()
+                return False, None
+            if existing:
+                if existing.react:
+                    return True, None
+                existing.react = True
+                existing.save()
+                return True, existing
+            try:
+                with transaction.atomic():
+                    return True, self.create(user_id=user_id, recipe_id=recipe_id, react=True)
+            except IntegrityError:
+                # A concurrent reaction won the unique constraint, unless the
+                # recipe or user is missing
+                if not reactions.exists():
+                    return None
+                return True, None
+
+
 class Reaction(models.Model):
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE,blank=True, null= True)
     recipe = models.ForeignKey(Recipe, on_delete=models.CASCADE,blank=True, null= True)
     react = models.BooleanField(default=False,blank=True, null= True)
+    created = models.DateTimeField(auto_now_add=True, blank=True, null=True)
+    # Bumped on every save, so a reaction liked again is seen as new activity
+    updated = models.DateTimeField(auto_now=True, blank=True, null=True, db_index=True)
+
+    objects = ReactionQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            # One reaction per user and recipe, reacting again toggles it
+            models.UniqueConstraint(fields=['user', 'recipe'], name='unique_reaction_per_user_recipe'),
+        ]
 
     def __str__(self):
         return f'{self.user} Reacted On Your {self.recipe} Recipe Post'
 
+    def save(self, *args, **kwargs):
+        # The pre_save handler locks the stored row and the post_save handler
+        # updates Recipe.reaction_count, keep all of it in one transaction
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        # Deleting a row twice (two concurrent unlikes) would decrement the
+        # recipe's count twice, only delete it if it is still there
+        with transaction.atomic():
+            if not Reaction.objects.filter(pk=self.pk).select_for_update().exists():
+                return 0, {}
+            return super().delete(*args, **kwargs)
+
 
 class Comment(models.Model):
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, blank=True, null= True)
@@ -0,0 +1,42 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from kitchen.models import Recipe, deleting_recipes
+from .models import Reaction
+
+
+def counted_recipe(recipe_id, react):
+    """The recipe whose reaction_count a reaction adds to, if any"""
+    return recipe_id if react else None
+
+
+@receiver(pre_save, sender=Reaction)
+def remember_counted_recipe(sender, instance, **kwargs):
+    # Updates may flip `react` or move the reaction, compare with the stored
+    # row, locked until Reaction.save commits so concurrent saves of the same
+    # reaction count once
+    instance._counted_recipe = None
+    if not instance._state.adding:
+        stored = Reaction.objects.filter(pk=instance.pk).select_for_update().values_list('recipe_id', 'react').first()
+        if stored:
+            instance._counted_recipe = counted_recipe(*stored)
+
+
+@receiver(post_save, sender=Reaction)
+def update_reaction_count(sender, instance, **kwargs):
+    before = getattr(instance, '_counted_recipe', None)
+    after = counted_recipe(instance.recipe_id, instance.react)
+    if before != after:
+        if before is not None:
+            Recipe.objects.adjust_reactions(before, -1)
+        if after is not None:
+            Recipe.objects.adjust_reactions(after, 1)
+
+
+@receiver(post_delete, sender=Reaction)
+def decrement_reaction_count(sender, instance, origin=None, **kwargs):
+    if deleting_recipes(origin):
+        return
+    recipe_id = counted_recipe(instance.recipe_id, instance.react)
+    if recipe_id is not None:
+        Recipe.objects.adjust_reactions(recipe_id, -1)
@@ -1,3 +1,53 @@
 from django.test import TestCase
 
-# Create your tests here.
+from kitchen.models import Recipe
+from user.models import CustomUser
+from .models import Reaction
+
+
+class ReactionToggleTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user('cook@example.com', 'cook', 'password')
+        self.recipe = Recipe.objects.create(
+            user=self.user, title='Khichuri', ingredients='Rice, lentils', flavour='Savory', region='Dhaka'
+        )
+
+    def reaction_count(self):
+        self.recipe.refresh_from_db()
+        return self.recipe.reaction_count
+
+    def test_toggle_flips_the_reaction(self):
+        reacted, reaction = Reaction.objects.toggle(self.user.pk, self.recipe.pk)
+        self.assertTrue(reacted)
+        self.assertIsNotNone(reaction)
+        self.assertEqual(self.reaction_count(), 1)
+
+        self.assertEqual(Reaction.objects.toggle(self.user.pk, self.recipe.pk), (False, None))
+        self.assertFalse(Reaction.objects.exists())
+        self.assertEqual(self.reaction_count(), 0)
+
+    def test_repeated_set_is_a_no_op(self):
+        Reaction.objects.toggle(self.user.pk, self.recipe.pk, True)
+        self.assertEqual(Reaction.objects.toggle(self.user.pk, self.recipe.pk, True), (True, None))
+        self.assertEqual(self.reaction_count(), 1)
+
+        Reaction.objects.toggle(self.user.pk, self.recipe.pk, False)
+        self.assertEqual(Reaction.objects.toggle(self.user.pk, self.recipe.pk, False), (False, None))
+        self.assertEqual(self.reaction_count(), 0)
+
+    def test_reactivating_counts_once(self):
+        reaction = Reaction.objects.create(user=self.user, recipe=self.recipe, react=False)
+        self.assertEqual(self.reaction_count(), 0)
+
+        reacted, changed = Reaction.objects.toggle(self.user.pk, self.recipe.pk, True)
+        self.assertTrue(reacted)
+        self.assertEqual(changed.pk, reaction.pk)
+        self.assertEqual(self.reaction_count(), 1)
+
+    def test_deleting_a_deleted_reaction_counts_once(self):
+        reaction = Reaction.objects.create(user=self.user, recipe=self.recipe, react=True)
+        stale = Reaction.objects.get(pk=reaction.pk)
+
+        reaction.delete()
+        self.assertEqual(stale.delete(), (0, {}))
+        self.assertEqual(self.reaction_count(), 0)
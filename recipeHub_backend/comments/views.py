@@ -2,6 +2,9 @@ from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 from rest_framework import viewsets
 
+from recipeHub_backend.filters import FieldFilter
+from recipeHub_backend.pagination import LinkHeaderKeysetPagination
+
 from . import models, serializers
 
 
@@ -9,9 +12,15 @@ from . import models, serializers
 class CommentViewset(viewsets.ModelViewSet):
     queryset = models.Comment.objects.all()
     serializer_class = serializers.CommentSerializer
+    pagination_class = LinkHeaderKeysetPagination
+    filter_backends = [FieldFilter]
+    filter_fields = ("recipe", "user")
 
 
 @method_decorator(csrf_exempt, name="dispatch")
 class ReactViewset(viewsets.ModelViewSet):
     queryset = models.Reaction.objects.all()
     serializer_class = serializers.ReactionSerializers
+    pagination_class = LinkHeaderKeysetPagination
+    filter_backends = [FieldFilter]
+    filter_fields = ("recipe", "user")
@@ -6,6 +6,7 @@ from .models import (
     FoodItemImage,
     FoodItemReview,
     SearchHistory,
+    TasteProfile,
     UserFavoriteFoodItem,
 )
 
@@ -209,3 +210,10 @@ class SearchHistoryAdmin(admin.ModelAdmin):
             {"fields": ("created_at",), "classes": ("collapse",)},
         ),
     )
+
+
+@admin.register(TasteProfile)
+class TasteProfileAdmin(admin.ModelAdmin):
+    list_display = ["user", "updated_at"]
+    search_fields = ["user__username"]
+    readonly_fields = ["categories", "food_types", "price_bands", "updated_at"]
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class FoodMapConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'food_map'
+
+    def ready(self):
+        from . import signals  # noqa: F401
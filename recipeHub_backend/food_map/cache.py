@@ -0,0 +1,125 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from django.core.cache import InvalidCacheBackendError, caches
+
+logger = logging.getLogger(__name__)
+
+
+def shared_cache():
+    """The cache every worker sees, the default cache when none is configured"""
+    try:
+        return caches["shared"]
+    except InvalidCacheBackendError:
+        return caches["default"]
+
+
+class TieredCache:
+    """
+    Two-level cache for slow external lookups.
+
+    A small in-process LRU with TTL answers repeated keys without any I/O;
+    misses fall through to a persistent Django cache backend shared between
+    workers and restarts. Hit/miss counters are kept per process.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        timeout: int,
+        max_entries: int,
+        cache_alias: str = "geocoding",
+    ):
+        self.namespace = namespace
+        self.timeout = timeout
+        self.max_entries = max_entries
+        self.cache_alias = cache_alias
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"memory_hits": 0, "persistent_hits": 0, "misses": 0}
+
+    @property
+    def persistent(self):
+        try:
+            return caches[self.cache_alias]
+        except InvalidCacheBackendError:
+            return caches["default"]
+
+    def _persistent_key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._counters["memory_hits"] += 1
+                    return value
+                del self._entries[key]
+
+        try:
+            value = self.persistent.get(self._persistent_key(key))
+        except Exception as e:
+            logger.warning(f"Persistent cache read failed for {self.namespace}: {e}")
+            value = None
+
+        with self._lock:
+            if value is None:
+                self._counters["misses"] += 1
+                return None
+            self._counters["persistent_hits"] += 1
+            self._remember(key, value, now)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store value in both tiers"""
+        with self._lock:
+            self._remember(key, value, time.monotonic())
+
+        try:
+            self.persistent.set(self._persistent_key(key), value, self.timeout)
+        except Exception as e:
+            logger.warning(f"Persistent cache write failed for {self.namespace}: {e}")
+
+    def _remember(self, key: str, value: Any, now: float) -> None:
+        """Insert into the in-process LRU, evicting the oldest entries (lock held)"""
+        self._entries[key] = (now + self.timeout, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop the in-process tier and reset counters"""
+        with self._lock:
+            self._entries.clear()
+            for name in self._counters:
+                self._counters[name] = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process"""
+        with self._lock:
+            counters = dict(self._counters)
+            size = len(self._entries)
+
+        lookups = sum(counters.values())
+        hits = counters["memory_hits"] + counters["persistent_hits"]
+        return {
+            **counters,
+            "lookups": lookups,
+            "hit_ratio": round(hits / lookups, 4) if lookups else None,
+            "memory_entries": size,
+            "max_entries": self.max_entries,
+            "timeout": self.timeout,
+        }
+
+
+def coordinate_cache_key(latitude, longitude, precision: int) -> str:
+    """Quantize coordinates so lookups in the same neighbourhood share a key"""
+    return f"{round(float(latitude), precision):.{precision}f},{round(float(longitude), precision):.{precision}f}"
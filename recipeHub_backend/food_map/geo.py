@@ -0,0 +1,200 @@
+import math
+from typing import List, Tuple
+
+from django.db.models import FloatField, Q
+from django.db.models.functions import ASin, Cos, Power, Radians, Sin, Sqrt
+
+EARTH_RADIUS_M = 6371000  # Earth's mean radius in meters
+GEOHASH_PRECISION = 9  # ~4.8m x 4.8m cells, stored on every FoodItem
+MAX_COVERING_CELLS = 16  # Upper bound on prefixes OR'ed together per query
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def encode_geohash(latitude, longitude, precision=GEOHASH_PRECISION) -> str:
+    """
+    Encode a coordinate pair as a geohash string.
+    Nearby points share a common prefix, so a prefix match is an index range scan.
+    """
+    latitude = float(latitude)
+    longitude = ((float(longitude) + 180.0) % 360.0) - 180.0
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+
+    geohash = []
+    bits = 0
+    bit_count = 0
+    even = True  # Geohash interleaves bits starting with longitude
+
+    while len(geohash) < precision:
+        if even:
+            mid = (lng_range[0] + lng_range[1]) / 2
+            if longitude >= mid:
+                bits = (bits << 1) | 1
+                lng_range[0] = mid
+            else:
+                bits <<= 1
+                lng_range[1] = mid
+        else:
+            mid = (lat_range[0] + lat_range[1]) / 2
+            if latitude >= mid:
+                bits = (bits << 1) | 1
+                lat_range[0] = mid
+            else:
+                bits <<= 1
+                lat_range[1] = mid
+
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            geohash.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return "".join(geohash)
+
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """Return the (latitude, longitude) size in degrees of a geohash cell"""
+    total_bits = 5 * precision
+    lng_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (2**lat_bits), 360.0 / (2**lng_bits)
+
+
+def bounding_box(latitude, longitude, radius_m) -> Tuple[float, float, float, float]:
+    """
+    Return (min_lat, min_lng, max_lat, max_lng) enclosing a circle of radius_m.
+    Longitude spans the full range when the circle reaches a pole.
+    """
+    latitude = float(latitude)
+    longitude = float(longitude)
+    lat_delta = math.degrees(radius_m / EARTH_RADIUS_M)
+
+    min_lat = max(latitude - lat_delta, -90.0)
+    max_lat = min(latitude + lat_delta, 90.0)
+
+    if min_lat <= -90.0 or max_lat >= 90.0:
+        return min_lat, -180.0, max_lat, 180.0
+
+    lng_delta = math.degrees(
+        radius_m / (EARTH_RADIUS_M * math.cos(math.radians(latitude)))
+    )
+    return min_lat, longitude - lng_delta, max_lat, longitude + lng_delta
+
+
+def _steps(start: float, end: float, size: float) -> List[float]:
+    """Sample points so every cell of the given size between start and end is hit"""
+    first = math.floor(start / size) * size
+    count = int(math.floor(end / size) - math.floor(start / size)) + 1
+    return [first + (i + 0.5) * size for i in range(count)]
+
+
+def covering_cells(latitude, longitude, radius_m) -> List[str]:
+    """
+    Return the geohash prefixes covering the bounding box of a radius search.
+    Picks the finest precision that needs at most MAX_COVERING_CELLS prefixes.
+    """
+    min_lat, min_lng, max_lat, max_lng = bounding_box(latitude, longitude, radius_m)
+
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        lat_size, lng_size = cell_size(precision)
+        lat_steps = _steps(min_lat, max_lat, lat_size)
+        lng_steps = _steps(min_lng, max_lng, lng_size)
+        if len(lat_steps) * len(lng_steps) <= MAX_COVERING_CELLS:
+            return sorted(
+                {
+                    encode_geohash(min(lat, 90.0), lng, precision)
+                    for lat in lat_steps
+                    for lng in lng_steps
+                }
+            )
+
+    return []  # Whole world, no prefix restriction possible
+
+
+def tile_for(latitude, longitude, zoom: int) -> Tuple[int, int]:
+    """Slippy-map (x, y) tile containing a coordinate at the given zoom level"""
+    latitude = max(min(float(latitude), 85.05112878), -85.05112878)
+    longitude = ((float(longitude) + 180.0) % 360.0) - 180.0
+    n = 2**zoom
+    x = int((longitude + 180.0) / 360.0 * n)
+    lat_rad = math.radians(latitude)
+    y = int((1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n)
+    return min(x, n - 1), min(max(y, 0), n - 1)
+
+
+def tile_bounds(x: int, y: int, zoom: int) -> Tuple[float, float, float, float]:
+    """Return (min_lat, min_lng, max_lat, max_lng) of a slippy-map tile"""
+    n = 2**zoom
+
+    def tile_lat(tile_y):
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * tile_y / n))))
+
+    return (
+        tile_lat(y + 1),
+        x / n * 360.0 - 180.0,
+        tile_lat(y),
+        (x + 1) / n * 360.0 - 180.0,
+    )
+
+
+def covering_tiles(latitude, longitude, radius_m, zoom: int) -> List[Tuple[int, int]]:
+    """Slippy-map tiles intersecting the bounding box of a radius search"""
+    min_lat, min_lng, max_lat, max_lng = bounding_box(latitude, longitude, radius_m)
+    n = 2**zoom
+    min_x, min_y = tile_for(max_lat, min_lng, zoom)
+    max_x, max_y = tile_for(min_lat, max_lng, zoom)
+
+    if max_lng - min_lng >= 360.0:
+        xs = range(n)
+    elif max_x >= min_x:
+        xs = range(min_x, max_x + 1)
+    else:  # Wraps around the antimeridian
+        xs = list(range(min_x, n)) + list(range(0, max_x + 1))
+
+    return [(x, y) for x in xs for y in range(min_y, max_y + 1)]
+
+
+def radius_prefilter(latitude, longitude, radius_m) -> Q:
+    """
+    Build a cheap, index-backed filter for rows that may lie within radius_m.
+    Combines geohash prefix ranges with a latitude/longitude bounding box;
+    callers still need an exact distance check on the survivors.
+    """
+    min_lat, min_lng, max_lat, max_lng = bounding_box(latitude, longitude, radius_m)
+    condition = Q(latitude__gte=min_lat, latitude__lte=max_lat)
+
+    # A box crossing the antimeridian cannot be expressed as one longitude range;
+    # the geohash cells below still restrict it correctly.
+    if -180.0 <= min_lng and max_lng <= 180.0:
+        condition &= Q(longitude__gte=min_lng, longitude__lte=max_lng)
+
+    cells = covering_cells(latitude, longitude, radius_m)
+    if cells:
+        cell_condition = Q()
+        for cell in cells:
+            cell_condition |= Q(geohash__startswith=cell)
+        condition &= cell_condition
+
+    return condition
+
+
+def distance_expression(latitude, longitude):
+    """Haversine great-circle distance in meters from a point, as a DB expression"""
+    latitude = float(latitude)
+    longitude = float(longitude)
+    row_lat = Radians("latitude", output_field=FloatField())
+    row_lng = Radians("longitude", output_field=FloatField())
+    return (
+        2
+        * EARTH_RADIUS_M
+        * ASin(
+            Sqrt(
+                Power(Sin((Radians(latitude) - row_lat) / 2), 2)
+                + Cos(Radians(latitude))
+                * Cos(row_lat)
+                * Power(Sin((Radians(longitude) - row_lng) / 2), 2)
+            )
+        )
+    )
@@ -0,0 +1,95 @@
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from .models import SearchHistory, TasteProfile
+
+logger = logging.getLogger(__name__)
+
+
+class SearchHistoryBuffer:
+    """
+    Collects SearchHistory rows in memory and writes them with bulk_create
+    from a background thread, once `max_size` rows are waiting or the oldest
+    has waited `max_delay` seconds. bulk_create sends no post_save, so taste
+    profiles are updated by the writer too.
+
+    Rows still buffered when a process is killed are lost; with a max_size
+    of 1 every row is written synchronously instead.
+    """
+
+    def __init__(self, max_size: int, max_delay: float):
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self._rows = []
+        self._oldest = None
+        self._condition = threading.Condition()
+        self._writer = None
+
+    def add(self, **fields) -> None:
+        """
+        Queue one search for the background writer. With a max_size of 1 the
+        row is written here, from the calling thread, instead.
+        """
+        row = SearchHistory(**fields)
+        if self.max_size <= 1:
+            self._write([row])
+            return
+
+        with self._condition:
+            if not self._rows:
+                self._oldest = time.monotonic()
+            self._rows.append(row)
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(
+                    target=self._run, name="search-history-writer", daemon=True
+                )
+                self._writer.start()
+            if len(self._rows) >= self.max_size:
+                self._condition.notify()
+
+    def flush(self) -> None:
+        """Write everything buffered now, from the calling thread"""
+        self._write(self._take())
+
+    def _take(self):
+        with self._condition:
+            rows, self._rows = self._rows, []
+            return rows
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._rows:
+                    self._condition.wait()
+                deadline = self._oldest + self.max_delay
+                while len(self._rows) < self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+            self._write(self._take())
+
+    def _write(self, rows) -> None:
+        if not rows:
+            return
+        try:
+            SearchHistory.objects.bulk_create(rows, batch_size=500)
+            for row in rows:
+                TasteProfile.record_search(row)
+        except Exception as e:
+            logger.warning(f"Could not write {len(rows)} search history rows: {e}")
+        finally:
+            if threading.current_thread() is self._writer:
+                close_old_connections()
+
+
+search_history_buffer = SearchHistoryBuffer(
+    max_size=getattr(settings, "SEARCH_HISTORY_BUFFER_SIZE", 100),
+    max_delay=getattr(settings, "SEARCH_HISTORY_FLUSH_INTERVAL", 5.0),
+)
+atexit.register(search_history_buffer.flush)
@@ -0,0 +1,142 @@
+import logging
+import threading
+import time
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised instead of calling a service whose circuit breaker is open"""
+
+    pass
+
+
+class CircuitBreaker:
+    """
+    Stop calling a failing service for a cool-down period.
+    After `failure_threshold` consecutive failures the circuit opens; once
+    `reset_timeout` seconds have passed a single trial call is let through.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                # Half-open: let one trial request through
+                self._opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return self._opened_at is not None
+
+
+class ServiceClient:
+    """
+    Pooled, keep-alive HTTP client for one external service.
+    Retries 429/5xx with exponential backoff (honouring Retry-After), applies
+    a default timeout and trips a circuit breaker on repeated failures.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        timeout,
+        headers: dict = None,
+        retries: int = None,
+        backoff_factor: float = 0.5,
+        pool_size: int = None,
+    ):
+        self.name = name
+        self.timeout = timeout
+        self.breaker = CircuitBreaker(
+            failure_threshold=getattr(settings, "EXTERNAL_HTTP_FAILURE_THRESHOLD", 5),
+            reset_timeout=getattr(settings, "EXTERNAL_HTTP_RESET_TIMEOUT", 30.0),
+        )
+
+        if retries is None:
+            retries = getattr(settings, "EXTERNAL_HTTP_RETRIES", 2)
+        if pool_size is None:
+            pool_size = getattr(settings, "EXTERNAL_HTTP_POOL_SIZE", 10)
+
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=0,  # A timed out read already spent its budget
+            status=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"GET", "POST"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=pool_size, max_retries=retry
+        )
+
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        if headers:
+            self.session.headers.update(headers)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        if not self.breaker.allow_request():
+            raise CircuitOpenError(f"{self.name} is unavailable, circuit open")
+
+        kwargs.setdefault("timeout", self.timeout)
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except requests.exceptions.RequestException:
+            self.breaker.record_failure()
+            raise
+
+        if response.status_code in RETRY_STATUSES:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+
+# (connect, read) timeouts per service in seconds
+google_maps_client = ServiceClient("Google Maps", timeout=(3.05, 10))
+nominatim_client = ServiceClient(
+    "Nominatim",
+    timeout=(3.05, 10),
+    headers={"User-Agent": "RecipeHub-FoodMap/1.0"},
+)
+overpass_client = ServiceClient("Overpass", timeout=(3.05, 30))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from food_map.models import FoodItem
+
+
+class Command(BaseCommand):
+    help = "Recompute stored rating and favorites aggregates of food items"
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            updated = FoodItem.objects.rebuild_rating_aggregates()
+            FoodItem.objects.rebuild_favorites_counts()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt rating aggregates for {updated} food items")
+        )
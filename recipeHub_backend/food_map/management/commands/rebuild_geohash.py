@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from food_map.geo import encode_geohash
+from food_map.models import FoodItem
+
+
+class Command(BaseCommand):
+    help = "Recompute the geohash cell index for every food item"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of rows written per bulk update",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        batch = []
+        updated = 0
+
+        queryset = FoodItem.objects.only("id", "latitude", "longitude", "geohash")
+        for food_item in queryset.iterator(chunk_size=batch_size):
+            geohash = encode_geohash(food_item.latitude, food_item.longitude)
+            if food_item.geohash != geohash:
+                food_item.geohash = geohash
+                batch.append(food_item)
+
+            if len(batch) >= batch_size:
+                FoodItem.objects.bulk_update(batch, ["geohash"])
+                updated += len(batch)
+                batch = []
+
+        if batch:
+            FoodItem.objects.bulk_update(batch, ["geohash"])
+            updated += len(batch)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Updated geohash for {updated} food items")
+        )
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from food_map.models import FoodItem
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index of food items"
+
+    def handle(self, *args, **options):
+        count = 0
+        for food_item in FoodItem.objects.iterator(chunk_size=500):
+            food_item.update_search_index()
+            count += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} food items"))
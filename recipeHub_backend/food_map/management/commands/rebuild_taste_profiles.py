@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+
+from food_map.cache import shared_cache
+from food_map.models import (
+    SearchHistory,
+    TasteProfile,
+    UserFavoriteFoodItem,
+    taste_cache_key,
+)
+from food_map.taste import FAVORITE_WEIGHT, SEARCH_WEIGHT
+
+HISTORY_PER_USER = 100  # Most recent searches replayed per user
+
+
+class Command(BaseCommand):
+    help = "Rebuild user taste profiles by replaying favorites and search history"
+
+    def handle(self, *args, **options):
+        events = {}  # user_id -> [(timestamp, food items, weight)]
+
+        favorites = UserFavoriteFoodItem.objects.select_related("food_item")
+        for favorite in favorites.iterator(chunk_size=500):
+            events.setdefault(favorite.user_id, []).append(
+                (favorite.created_at, [favorite.food_item], FAVORITE_WEIGHT)
+            )
+
+        user_ids = SearchHistory.objects.filter(user__isnull=False).values_list(
+            "user_id", flat=True
+        )
+        for user_id in set(user_ids):
+            for history in SearchHistory.objects.filter(user_id=user_id)[
+                :HISTORY_PER_USER
+            ]:
+                interests = TasteProfile.search_interests(history)
+                if interests:
+                    events.setdefault(user_id, []).append(
+                        (history.created_at, interests, SEARCH_WEIGHT / len(interests))
+                    )
+
+        for user_id, user_events in events.items():
+            profile, _ = TasteProfile.objects.get_or_create(user_id=user_id)
+            for dimension in TasteProfile.DIMENSIONS:
+                setattr(profile, dimension, {})
+            for _, food_items, weight in sorted(user_events, key=lambda e: e[0]):
+                profile.apply(food_items, weight)
+            profile.save()
+            shared_cache().delete(taste_cache_key(user_id))
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {len(events)} taste profiles"))
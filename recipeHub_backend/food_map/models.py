@@ -1,12 +1,39 @@
+import math
 import uuid
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, Exists, F, OuterRef, Subquery, Value, When
+from django.db.models.functions import Cast, Coalesce
+
+from .cache import shared_cache
+from .geo import distance_expression, encode_geohash, radius_prefilter
+from .search import BM25_B, BM25_K1, MAX_TERM_LENGTH, analyze, document_terms
+from .taste import (
+    NEARBY_QUERY_PREFIX,
+    PRICE_BANDS,
+    SEARCH_RESULTS_OBSERVED,
+    SEARCH_WEIGHT,
+    item_features,
+    normalized,
+    observe,
+)
 
 User = get_user_model()
 
 
+class FoodCategoryQuerySet(models.QuerySet):
+    def with_food_items_count(self):
+        """Annotate the number of active food items in each category"""
+        return self.annotate(
+            active_food_items_count=models.Count(
+                "food_items", filter=models.Q(food_items__is_active=True)
+            )
+        )
+
+
 class FoodCategory(models.Model):
     """Categories for food items (e.g., Pizza, Burgers, Desserts, etc.)"""
 
@@ -18,6 +45,8 @@ class FoodCategory(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = FoodCategoryQuerySet.as_manager()
+
     class Meta:
         verbose_name_plural = "Food Categories"
         ordering = ["name"]
@@ -26,6 +55,221 @@ class FoodCategory(models.Model):
         return self.name
 
 
+class FoodItemQuerySet(models.QuerySet):
+    """Query helpers for food items"""
+
+    def with_distance(self, latitude, longitude):
+        """Annotate each row with its great-circle distance in meters"""
+        return self.annotate(distance=distance_expression(latitude, longitude))
+
+    def for_list(self, user=None):
+        """
+        Fetch everything FoodItemListSerializer renders in a constant number of
+        queries: the favorite flag as an annotation, the category with its
+        active item count and the primary image prefetched.
+        """
+        queryset = self.select_related("created_by").prefetch_related(
+            models.Prefetch(
+                "category",
+                queryset=FoodCategory.objects.with_food_items_count(),
+            ),
+            models.Prefetch(
+                "images",
+                queryset=FoodItemImage.objects.filter(is_primary=True),
+                to_attr="primary_images",
+            ),
+        )
+
+        if user is not None and user.is_authenticated:
+            queryset = queryset.annotate(
+                favorited=Exists(
+                    UserFavoriteFoodItem.objects.filter(
+                        user=user, food_item=OuterRef("pk")
+                    )
+                )
+            )
+
+        return queryset
+
+    def adjust_rating(self, food_item_id, sum_delta, count_delta):
+        """
+        Apply a change in review ratings to the stored aggregates of one item.
+        Must run inside the transaction that changed the review.
+        """
+        items = self.filter(pk=food_item_id)
+        items.update(
+            rating_sum=F("rating_sum") + sum_delta,
+            rating_count=F("rating_count") + count_delta,
+        )
+        items.update(avg_rating=self._average_expression())
+
+    def rebuild_rating_aggregates(self):
+        """Recompute the stored review aggregates from FoodItemReview"""
+        reviews = (
+            FoodItemReview.objects.filter(food_item=OuterRef("pk"), is_active=True)
+            .order_by()
+            .values("food_item")
+        )
+        updated = self.update(
+            rating_sum=Coalesce(
+                Subquery(reviews.annotate(value=models.Sum("rating")).values("value")),
+                0,
+            ),
+            rating_count=Coalesce(
+                Subquery(reviews.annotate(value=models.Count("pk")).values("value")),
+                0,
+            ),
+        )
+        self.update(avg_rating=self._average_expression())
+        return updated
+
+    def adjust_favorites(self, food_item_id, delta):
+        """Apply a change in favorites to the stored count of one item"""
+        self.filter(pk=food_item_id).update(
+            favorites_count=F("favorites_count") + delta
+        )
+
+    def rebuild_favorites_counts(self):
+        """Recompute the stored favorites counts from UserFavoriteFoodItem"""
+        favorites = (
+            UserFavoriteFoodItem.objects.filter(food_item=OuterRef("pk"))
+            .order_by()
+            .values("food_item")
+            .annotate(value=models.Count("pk"))
+            .values("value")
+        )
+        return self.update(favorites_count=Coalesce(Subquery(favorites), 0))
+
+    @staticmethod
+    def _average_expression():
+        return Case(
+            When(
+                rating_count__gt=0,
+                then=Cast("rating_sum", models.FloatField()) / F("rating_count"),
+            ),
+            default=Value(0.0),
+            output_field=models.FloatField(),
+        )
+
+    def search(self, query):
+        """
+        Full-text match against the inverted index, annotated with a BM25
+        `relevance` score. Only rows containing a query term are touched.
+        """
+        no_match = self.none().annotate(
+            relevance=Value(0.0, output_field=models.FloatField())
+        )
+        terms = sorted(set(analyze(query)))
+        if not terms:
+            return no_match
+
+        document_frequencies = dict(
+            FoodItemSearchTerm.objects.filter(term__in=terms, food_item__is_active=True)
+            .values_list("term")
+            .annotate(df=models.Count("pk"))
+        )
+        if not document_frequencies:
+            return no_match
+
+        stats = search_index_stats()
+        total = max(stats["documents"], 1)
+        idf = {
+            term: math.log(1 + (total - df + 0.5) / (df + 0.5))
+            for term, df in document_frequencies.items()
+        }
+
+        frequency = Cast("frequency", models.FloatField())
+        length_norm = BM25_K1 * (
+            1
+            - BM25_B
+            + BM25_B
+            * Cast("food_item__search_length", models.FloatField())
+            / max(stats["average_length"], 1.0)
+        )
+        term_weight = Case(
+            *[When(term=term, then=Value(weight)) for term, weight in idf.items()],
+            default=Value(0.0),
+            output_field=models.FloatField(),
+        )
+        scores = (
+            FoodItemSearchTerm.objects.filter(
+                food_item=OuterRef("pk"), term__in=list(idf)
+            )
+            .order_by()
+            .values("food_item")
+            .annotate(
+                score=models.Sum(
+                    term_weight * frequency * (BM25_K1 + 1) / (frequency + length_norm)
+                )
+            )
+            .values("score")
+        )
+        matching = FoodItemSearchTerm.objects.filter(term__in=list(idf)).values(
+            "food_item"
+        )
+
+        return self.filter(pk__in=matching).annotate(
+            relevance=Subquery(scores, output_field=models.FloatField())
+        )
+
+    def with_affinity(self, taste):
+        """
+        Annotate `affinity` in [0, 1], how closely each item matches a user's
+        normalized taste vector (see taste_vector), averaged over category,
+        food type and price band. Zero for every row when taste is empty.
+        """
+        if not taste:
+            return self.annotate(affinity=Value(0.0, output_field=models.FloatField()))
+
+        def weight_case(conditions, default=0.0):
+            return Case(
+                *[When(then=Value(weight), **lookup) for lookup, weight in conditions],
+                default=Value(default),
+                output_field=models.FloatField(),
+            )
+
+        categories = taste.get("categories", {})
+        food_types = taste.get("food_types", {})
+        bands = taste.get("price_bands", {})
+
+        category_weight = weight_case(
+            [({"category_id": value}, weight) for value, weight in categories.items()]
+        )
+        food_type_weight = weight_case(
+            [({"food_type": value}, weight) for value, weight in food_types.items()]
+        )
+        # Bands are checked cheapest first, so each When only needs an upper bound
+        price_weight = weight_case(
+            [
+                ({"price__lt": upper}, bands.get(str(band), 0.0))
+                for band, upper in enumerate(PRICE_BANDS)
+            ],
+            default=bands.get(str(len(PRICE_BANDS)), 0.0),
+        )
+        return self.annotate(
+            affinity=(category_weight + food_type_weight + price_weight) / 3.0
+        )
+
+    def near(self, latitude, longitude, meters):
+        """
+        Candidates for a radius search from the index-backed geohash/bounding
+        box filter alone: every item within `meters` plus some corner rows.
+        """
+        return self.filter(radius_prefilter(latitude, longitude, meters))
+
+    def within_radius(self, latitude, longitude, meters):
+        """
+        Food items within `meters` of a point, annotated with `distance`.
+        The index-backed near() filter runs first so the exact distance is
+        only evaluated for candidate rows.
+        """
+        return (
+            self.near(latitude, longitude, meters)
+            .with_distance(latitude, longitude)
+            .filter(distance__lte=meters)
+        )
+
+
 class FoodItem(models.Model):
     """Model for user-added food items with location and pricing"""
 
@@ -73,6 +317,9 @@ class FoodItem(models.Model):
     longitude = models.DecimalField(max_digits=11, decimal_places=8)
     city = models.CharField(max_length=100, default="")
     country = models.CharField(max_length=100, default="")
+    geohash = models.CharField(
+        max_length=12, blank=True, editable=False
+    )  # Spatial cell index derived from latitude/longitude
 
     # Additional details
     ingredients = models.TextField(blank=True, help_text="List main ingredients")
@@ -106,6 +353,16 @@ class FoodItem(models.Model):
     is_active = models.BooleanField(default=True)
     is_verified = models.BooleanField(default=False)
 
+    # Aggregates, maintained incrementally from FoodItemReview and
+    # UserFavoriteFoodItem
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+    rating_count = models.PositiveIntegerField(default=0, editable=False)
+    avg_rating = models.FloatField(default=0, editable=False)
+    favorites_count = models.PositiveIntegerField(default=0, editable=False)
+    search_length = models.PositiveIntegerField(
+        default=0, editable=False
+    )  # Weighted number of indexed terms, for BM25 length normalization
+
     # Metadata
     created_by = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name="food_items"
@@ -113,31 +370,124 @@ class FoodItem(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = FoodItemQuerySet.as_manager()
+
+    AGGREGATE_FIELDS = (
+        "rating_sum",
+        "rating_count",
+        "avg_rating",
+        "favorites_count",
+        "search_length",
+    )
+
     class Meta:
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["latitude", "longitude"]),
+            models.Index(fields=["geohash"]),
             models.Index(fields=["city"]),
             models.Index(fields=["food_type"]),
-            models.Index(fields=["is_active"]),
             models.Index(fields=["availability_status"]),
+            # Filter + sort combinations used by FoodItemListCreateView
+            models.Index(fields=["is_active", "-created_at"]),
+            models.Index(fields=["is_active", "city", "-created_at"]),
+            models.Index(fields=["is_active", "food_type", "price"]),
+            models.Index(fields=["is_active", "price"]),
+            models.Index(fields=["is_active", "-avg_rating"]),
+            models.Index(fields=["is_active", "-rating_count"]),
+            models.Index(fields=["is_active", "-favorites_count"]),
         ]
 
     def __str__(self):
         return f"{self.name} - {self.price} {self.currency}"
 
+    def save(self, *args, **kwargs):
+        """Keep the geohash cell in sync with the coordinates"""
+        if self.latitude is not None and self.longitude is not None:
+            self.geohash = encode_geohash(self.latitude, self.longitude)
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and (
+            "latitude" in update_fields or "longitude" in update_fields
+        ):
+            kwargs["update_fields"] = set(update_fields) | {"geohash"}
+
+        # Never write back aggregate counters from a possibly stale instance,
+        # they are only changed with F() updates (see FoodItemQuerySet)
+        if update_fields is None and not self._state.adding:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.AGGREGATE_FIELDS
+            ]
+
+        super().save(*args, **kwargs)
+
+    def update_search_index(self):
+        """Replace this item's postings in the full-text index"""
+        terms = document_terms(self)
+        search_length = sum(terms.values())
+        with transaction.atomic():
+            FoodItemSearchTerm.objects.filter(food_item=self).delete()
+            FoodItemSearchTerm.objects.bulk_create(
+                FoodItemSearchTerm(food_item=self, term=term, frequency=frequency)
+                for term, frequency in terms.items()
+            )
+            FoodItem.objects.filter(pk=self.pk).update(search_length=search_length)
+            transaction.on_commit(lambda: shared_cache().delete(SEARCH_INDEX_STATS_KEY))
+        self.search_length = search_length
+
     @property
     def average_rating(self):
-        """Calculate average rating from user reviews"""
-        reviews = self.reviews.filter(is_active=True)
-        if reviews.exists():
-            return reviews.aggregate(models.Avg("rating"))["rating__avg"]
+        """Average rating of active user reviews"""
+        if self.rating_count:
+            return self.avg_rating
         return None
 
     @property
     def reviews_count(self):
         """Count of active user reviews"""
-        return self.reviews.filter(is_active=True).count()
+        return self.rating_count
+
+
+class FoodItemSearchTerm(models.Model):
+    """Inverted index posting: how often a stemmed term occurs in a food item"""
+
+    term = models.CharField(max_length=MAX_TERM_LENGTH)
+    food_item = models.ForeignKey(
+        FoodItem, on_delete=models.CASCADE, related_name="search_terms"
+    )
+    frequency = models.PositiveIntegerField()  # Field-weighted term frequency
+
+    class Meta:
+        unique_together = ["term", "food_item"]
+
+
+SEARCH_INDEX_STATS_KEY = "food_map:search_index_stats"
+
+
+def search_index_stats():
+    """
+    Corpus size and average document length for BM25, cached briefly in the
+    shared cache so every worker scores a query alike. Dropped whenever an
+    item's postings are rewritten.
+    """
+
+    def compute():
+        stats = FoodItem.objects.filter(is_active=True).aggregate(
+            documents=models.Count("pk"),
+            average_length=models.Avg("search_length"),
+        )
+        return {
+            "documents": stats["documents"],
+            "average_length": float(stats["average_length"] or 0),
+        }
+
+    return shared_cache().get_or_set(
+        SEARCH_INDEX_STATS_KEY,
+        compute,
+        getattr(settings, "SEARCH_INDEX_STATS_TIMEOUT", 300),
+    )
 
 
 class FoodItemImage(models.Model):
@@ -194,10 +544,20 @@ class FoodItemReview(models.Model):
     class Meta:
         unique_together = ["food_item", "user"]
         ordering = ["-created_at"]
+        indexes = [
+            # Keyset pages of FoodItemReviewListCreateView
+            models.Index(fields=["food_item", "is_active", "-created_at", "-id"]),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.food_item.name} ({self.rating}/5)"
 
+    def save(self, *args, **kwargs):
+        # The post_save handler updates FoodItem rating aggregates, keep both
+        # writes in one transaction
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
 
 class UserFavoriteFoodItem(models.Model):
     """User's favorite food items"""
@@ -215,6 +575,9 @@ class UserFavoriteFoodItem(models.Model):
     class Meta:
         unique_together = ["user", "food_item"]
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["user", "-created_at", "-id"]),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.food_item.name}"
@@ -254,6 +617,137 @@ class SearchHistory(models.Model):
         return f"{user_info} searched '{self.query}'"
 
 
+class TasteProfile(models.Model):
+    """
+    A user's affinity for food categories, food types and price bands,
+    learned incrementally from favorites and searches
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, related_name="taste_profile"
+    )
+    # {value: weight} per dimension, strongest MAX_FEATURES values only
+    categories = models.JSONField(default=dict)
+    food_types = models.JSONField(default=dict)
+    price_bands = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    DIMENSIONS = ("categories", "food_types", "price_bands")
+
+    def __str__(self):
+        return f"Taste profile of {self.user.username}"
+
+    def apply(self, food_items, weight):
+        """Decay the profile and add `weight` for every interacted food item"""
+        features = [item_features(food_item) for food_item in food_items]
+        decay = getattr(settings, "TASTE_PROFILE_DECAY", 0.95)
+        for dimension in self.DIMENSIONS:
+            setattr(
+                self,
+                dimension,
+                observe(
+                    getattr(self, dimension),
+                    [feature[dimension] for feature in features],
+                    weight,
+                    decay,
+                ),
+            )
+
+    @classmethod
+    def record(cls, user_id, food_items, weight, create=True):
+        """
+        Fold interactions with food items into a user's stored profile,
+        creating it unless `create` is False
+        """
+        food_items = list(food_items)
+        if not food_items:
+            return
+        with transaction.atomic():
+            profiles = cls.objects.select_for_update()
+            if create:
+                profile, _ = profiles.get_or_create(user_id=user_id)
+            else:
+                profile = profiles.filter(user_id=user_id).first()
+                if profile is None:
+                    return
+            profile.apply(food_items, weight)
+            profile.save()
+        shared_cache().delete(taste_cache_key(user_id))
+
+    @staticmethod
+    def search_interests(history):
+        """The top matches of a recorded search, what the user was looking for"""
+        if not history.query or history.query.startswith(NEARBY_QUERY_PREFIX):
+            return []
+        return list(
+            FoodItem.objects.filter(is_active=True)
+            .search(history.query)
+            .order_by("-relevance")
+            .only("category_id", "food_type", "price")[:SEARCH_RESULTS_OBSERVED]
+        )
+
+    @classmethod
+    def record_search(cls, history):
+        """Fold a recorded search into its user's profile"""
+        if not history.user_id:
+            return
+        interests = cls.search_interests(history)
+        if interests:
+            cls.record(history.user_id, interests, SEARCH_WEIGHT / len(interests))
+
+
+def taste_cache_key(user_id):
+    return f"food_map:taste-vector:{user_id}"
+
+
+def taste_snapshot_key(user_id, version):
+    return f"food_map:taste:{user_id}:{version}"
+
+
+def taste_vector(user):
+    """
+    A user's taste profile with each dimension scaled to [0, 1], as used by
+    FoodItemQuerySet.with_affinity, and its version (None without a
+    profile). Cached, empty for anonymous users.
+    """
+    if user is None or not user.is_authenticated:
+        return None, {}
+    timeout = getattr(settings, "TASTE_PROFILE_CACHE_TIMEOUT", 3600)
+
+    def compute():
+        profile = (
+            TasteProfile.objects.filter(user=user)
+            .values("updated_at", *TasteProfile.DIMENSIONS)
+            .first()
+        )
+        if not profile:
+            return None, {}
+        version = int(profile.pop("updated_at").timestamp() * 1000)
+        vector = {
+            dimension: normalized(weights) for dimension, weights in profile.items()
+        }
+        # Kept after the profile changes, see taste_snapshot
+        shared_cache().set(taste_snapshot_key(user.pk, version), vector, timeout)
+        return version, vector
+
+    return tuple(shared_cache().get_or_set(taste_cache_key(user.pk), compute, timeout))
+
+
+def taste_snapshot(user, version):
+    """
+    The taste vector of an earlier taste_vector call, so that later pages of
+    a result list are ranked the same as the first one even if the profile
+    changed in between. Falls back to the current vector once expired.
+    """
+    if version is None:
+        return {}
+    vector = shared_cache().get(taste_snapshot_key(user.pk, version))
+    if vector is None:
+        _, vector = taste_vector(user)
+    return vector
+
+
 # Keep legacy models for backward compatibility but mark as deprecated
 class FoodPlace(models.Model):
     """DEPRECATED: Legacy model for restaurant places - use FoodItem instead"""
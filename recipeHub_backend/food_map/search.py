@@ -0,0 +1,89 @@
+import re
+from collections import Counter
+from typing import List
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Text fields indexed for full-text search and how much a match in each counts
+FIELD_WEIGHTS = {
+    "name": 3,
+    "restaurant_name": 2,
+    "ingredients": 1,
+    "description": 1,
+    "address": 1,
+}
+
+MAX_TERM_LENGTH = 64
+
+STOP_WORDS = frozenset("""
+    a an and are as at be but by for from has have in is it its of on or
+    that the this to was were will with
+    """.split())
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Suffixes stripped by the stemmer, longest first
+_SUFFIXES = (
+    ("ational", "ate"),
+    ("fulness", "ful"),
+    ("iveness", "ive"),
+    ("ization", "ize"),
+    ("ousness", "ous"),
+    ("ations", "ate"),
+    ("ation", "ate"),
+    ("ness", ""),
+    ("ment", ""),
+    ("ings", ""),
+    ("ing", ""),
+    ("ies", "y"),
+    ("ied", "y"),
+    ("ed", ""),
+    ("ly", ""),
+    ("s", ""),
+)
+
+
+def stem(word: str) -> str:
+    """
+    Light suffix-stripping stemmer so that e.g. "fries"/"fry",
+    "noodles"/"noodle" and "grilled"/"grilling"/"grill" share a term.
+    """
+    if len(word) <= 3 or word.isdigit():
+        return word
+
+    for suffix, replacement in _SUFFIXES:
+        if suffix == "s" and word.endswith(("ss", "us")):
+            continue
+        if word.endswith(suffix) and len(word) - len(suffix) >= 2:
+            word = word[: -len(suffix)] + replacement
+            break
+
+    # "shopping" -> "shopp" -> "shop", but keep "grill", "glass", "jazz"
+    if len(word) > 3 and word[-1] == word[-2] and word[-1] not in "lsz":
+        word = word[:-1]
+    # "cheese"/"cheeses" -> "chees", "baked"/"bake" -> "bak"
+    if len(word) >= 4 and word.endswith("e"):
+        word = word[:-1]
+    return word
+
+
+def analyze(text: str) -> List[str]:
+    """Lowercase, tokenize, drop stop words and stem a piece of text"""
+    if not text:
+        return []
+    return [
+        stem(token)[:MAX_TERM_LENGTH]
+        for token in _TOKEN_RE.findall(text.lower())
+        if token not in STOP_WORDS and token != "_"
+    ]
+
+
+def document_terms(food_item) -> Counter:
+    """Weighted term frequencies of a food item's searchable fields"""
+    terms = Counter()
+    for field, weight in FIELD_WEIGHTS.items():
+        for term in analyze(getattr(food_item, field, "")):
+            terms[term] += weight
+    return terms
@@ -41,6 +41,9 @@ class FoodCategorySerializer(serializers.ModelSerializer):
         ]
 
     def get_food_items_count(self, obj):
+        # Annotated by FoodCategory.objects.with_food_items_count()
+        if hasattr(obj, "active_food_items_count"):
+            return obj.active_food_items_count
         return obj.food_items.filter(is_active=True).count()
 
 
@@ -143,7 +146,11 @@ class FoodItemListSerializer(serializers.ModelSerializer):
 
     def get_primary_image(self, obj):
         """Get the primary image URL"""
-        primary_image = obj.images.filter(is_primary=True).first()
+        # Prefetched by FoodItem.objects.for_list()
+        if hasattr(obj, "primary_images"):
+            primary_image = obj.primary_images[0] if obj.primary_images else None
+        else:
+            primary_image = obj.images.filter(is_primary=True).first()
         if primary_image:
             request = self.context.get("request")
             return (
@@ -168,6 +175,8 @@ class FoodItemListSerializer(serializers.ModelSerializer):
         """Check if food item is in user's favorites"""
         request = self.context.get("request")
         if request and request.user.is_authenticated:
+            if hasattr(obj, "favorited"):
+                return obj.favorited
             return UserFavoriteFoodItem.objects.filter(
                 user=request.user, food_item=obj
             ).exists()
@@ -359,6 +368,11 @@ class NearbyFoodItemsSerializer(serializers.Serializer):
     is_vegetarian = serializers.BooleanField(required=False)
     is_vegan = serializers.BooleanField(required=False)
     is_gluten_free = serializers.BooleanField(required=False)
+    include_location_context = serializers.BooleanField(default=True)
+    personalize = serializers.BooleanField(default=True)
+    cursor = serializers.CharField(required=False, allow_blank=True)
+    page_size = serializers.IntegerField(default=50, min_value=1, max_value=100)
+    include_count = serializers.BooleanField(default=False)
 
 
 class FoodItemSearchSerializer(serializers.Serializer):
@@ -372,6 +386,11 @@ class FoodItemSearchSerializer(serializers.Serializer):
     radius = serializers.IntegerField(
         default=5000, min_value=100, max_value=10000, required=False
     )
+    include_location_context = serializers.BooleanField(default=True)
+    personalize = serializers.BooleanField(default=True)
+    cursor = serializers.CharField(required=False, allow_blank=True)
+    page_size = serializers.IntegerField(default=50, min_value=1, max_value=100)
+    include_count = serializers.BooleanField(default=False)
 
 
 # Legacy serializers for backward compatibility
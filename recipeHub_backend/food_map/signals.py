@@ -0,0 +1,106 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import (
+    FoodItem,
+    FoodItemReview,
+    SearchHistory,
+    TasteProfile,
+    User,
+    UserFavoriteFoodItem,
+)
+from .search import FIELD_WEIGHTS
+from .taste import FAVORITE_WEIGHT
+
+
+def _contribution(food_item_id, rating, is_active):
+    """(food_item_id, rating) a review adds to the aggregates, 0 when inactive"""
+    return food_item_id, rating if is_active and rating else 0
+
+
+def _apply(food_item_id, rating, sign):
+    if food_item_id is not None and rating:
+        FoodItem.objects.adjust_rating(food_item_id, sign * rating, sign)
+
+
+@receiver(pre_save, sender=FoodItemReview)
+def remember_stored_rating(sender, instance, **kwargs):
+    # What the stored row contributes before this save, locked until commit
+    # (FoodItemReview.save runs in a transaction)
+    stored = None
+    if not instance._state.adding:
+        stored = (
+            FoodItemReview.objects.select_for_update()
+            .filter(pk=instance.pk)
+            .values_list("food_item_id", "rating", "is_active")
+            .first()
+        )
+    instance._stored_rating = _contribution(*stored) if stored else (None, 0)
+
+
+@receiver(post_save, sender=FoodItemReview)
+def update_rating_on_save(sender, instance, **kwargs):
+    old_item, old_rating = getattr(instance, "_stored_rating", (None, 0))
+    new_item, new_rating = _contribution(
+        instance.food_item_id, instance.rating, instance.is_active
+    )
+
+    if old_item == new_item:
+        if old_rating != new_rating:
+            FoodItem.objects.adjust_rating(
+                new_item,
+                new_rating - old_rating,
+                bool(new_rating) - bool(old_rating),
+            )
+    else:
+        _apply(old_item, old_rating, -1)
+        _apply(new_item, new_rating, 1)
+
+
+@receiver(post_delete, sender=FoodItemReview)
+def update_rating_on_delete(sender, instance, **kwargs):
+    food_item_id, rating = _contribution(
+        instance.food_item_id, instance.rating, instance.is_active
+    )
+    _apply(food_item_id, rating, -1)
+
+
+@receiver(post_save, sender=UserFavoriteFoodItem)
+def increment_favorites_count(sender, instance, created, **kwargs):
+    if created:
+        FoodItem.objects.adjust_favorites(instance.food_item_id, 1)
+
+
+@receiver(post_delete, sender=UserFavoriteFoodItem)
+def decrement_favorites_count(sender, instance, **kwargs):
+    FoodItem.objects.adjust_favorites(instance.food_item_id, -1)
+
+
+@receiver(post_save, sender=FoodItem)
+def update_search_index(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or set(update_fields) & set(FIELD_WEIGHTS):
+        instance.update_search_index()
+
+
+@receiver(post_save, sender=UserFavoriteFoodItem)
+def learn_taste_from_favorite(sender, instance, created, **kwargs):
+    if created:
+        TasteProfile.record(instance.user_id, [instance.food_item], FAVORITE_WEIGHT)
+
+
+@receiver(post_delete, sender=UserFavoriteFoodItem)
+def unlearn_taste_from_favorite(sender, instance, origin=None, **kwargs):
+    # Favorites removed along with their user take the profile with them
+    if isinstance(origin, User):
+        return
+    TasteProfile.record(
+        instance.user_id, [instance.food_item], -FAVORITE_WEIGHT, create=False
+    )
+
+
+@receiver(post_save, sender=SearchHistory)
+def learn_taste_from_search(sender, instance, created, **kwargs):
+    # Rows written by search_history_buffer are bulk created and recorded
+    # explicitly, this covers every other create
+    if created:
+        TasteProfile.record_search(instance)
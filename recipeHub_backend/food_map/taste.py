@@ -0,0 +1,61 @@
+from decimal import Decimal
+from typing import Dict, Iterable
+
+# Upper bounds of the price bands a profile tracks, the last band is open
+PRICE_BANDS = (Decimal("5"), Decimal("10"), Decimal("20"), Decimal("50"))
+
+# How strongly each kind of interaction moves a profile
+FAVORITE_WEIGHT = 3.0
+SEARCH_WEIGHT = 1.0
+SEARCH_RESULTS_OBSERVED = 5  # Top search results counted as an interest
+
+MAX_FEATURES = 10  # Strongest values kept per dimension, bounds the SQL
+MIN_WEIGHT = 0.01  # Weights decayed below this are dropped
+
+# Searches recorded by the nearby view, which carry no interest signal
+NEARBY_QUERY_PREFIX = "Nearby search"
+
+
+def price_band(price) -> str:
+    """Index of the price band a price falls in, as a JSON-friendly key"""
+    for band, upper in enumerate(PRICE_BANDS):
+        if price < upper:
+            return str(band)
+    return str(len(PRICE_BANDS))
+
+
+def item_features(food_item) -> Dict[str, str]:
+    """The (dimension -> value) features of a food item a profile learns"""
+    return {
+        "categories": str(food_item.category_id) if food_item.category_id else "",
+        "food_types": food_item.food_type,
+        "price_bands": price_band(food_item.price),
+    }
+
+
+def observe(
+    weights: Dict[str, float], values: Iterable[str], weight: float, decay: float
+) -> Dict[str, float]:
+    """
+    Decay one dimension of a profile and add `weight` to each observed value.
+    Older interests fade geometrically with every new observation.
+    """
+    updated = {value: old * decay for value, old in weights.items()}
+    for value in values:
+        if value:
+            updated[value] = max(updated.get(value, 0.0) + weight, 0.0)
+
+    strongest = sorted(updated.items(), key=lambda pair: pair[1], reverse=True)
+    return {
+        value: round(score, 4)
+        for value, score in strongest[:MAX_FEATURES]
+        if score >= MIN_WEIGHT
+    }
+
+
+def normalized(weights: Dict[str, float]) -> Dict[str, float]:
+    """Scale one dimension so its strongest value is 1"""
+    top = max(weights.values(), default=0.0)
+    if top <= 0:
+        return {}
+    return {value: score / top for value, score in weights.items()}
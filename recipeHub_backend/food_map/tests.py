@@ -1,3 +1,104 @@
+from django.contrib.auth import get_user_model
 from django.test import TestCase
 
-# Create your tests here.
+from .cache import shared_cache
+from .models import (
+    SEARCH_INDEX_STATS_KEY,
+    FoodCategory,
+    FoodItem,
+    TasteProfile,
+    UserFavoriteFoodItem,
+)
+
+User = get_user_model()
+
+
+class FavoriteTasteSignalTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("cook@example.com", "cook", "password")
+        category = FoodCategory.objects.create(name="Curry")
+        self.food_item = FoodItem.objects.create(
+            name="Chicken curry",
+            description="Home cooked",
+            category=category,
+            price=5,
+            address="Dhanmondi",
+            latitude=23.7461,
+            longitude=90.3742,
+            created_by=self.user,
+        )
+
+    def test_deleting_user_with_favorites(self):
+        UserFavoriteFoodItem.objects.create(user=self.user, food_item=self.food_item)
+
+        self.user.delete()
+
+        self.assertFalse(User.objects.exists())
+        self.assertFalse(TasteProfile.objects.exists())
+
+    def test_unfavorite_without_profile_creates_none(self):
+        favorite = UserFavoriteFoodItem.objects.create(
+            user=self.user, food_item=self.food_item
+        )
+        TasteProfile.objects.all().delete()
+
+        favorite.delete()
+
+        self.assertFalse(TasteProfile.objects.exists())
+
+
+class SearchRankingTests(TestCase):
+    def setUp(self):
+        shared_cache().delete(SEARCH_INDEX_STATS_KEY)
+        self.user = User.objects.create_user("cook@example.com", "cook", "password")
+        self.category = FoodCategory.objects.create(name="Dinner")
+        self.chicken = self.create_item("Chicken curry", "Spicy chicken curry")
+        self.beef = self.create_item("Beef curry", "Mild curry")
+        self.create_item("Vegetable rice", "Rice with vegetables")
+
+    def create_item(self, name, description, **fields):
+        return FoodItem.objects.create(
+            name=name,
+            description=description,
+            category=self.category,
+            price=5,
+            address="Dhanmondi",
+            latitude=23.7461,
+            longitude=90.3742,
+            created_by=self.user,
+            **fields,
+        )
+
+    def ranking(self, query):
+        return list(
+            FoodItem.objects.filter(is_active=True)
+            .search(query)
+            .order_by("-relevance")
+            .values_list("name", "relevance")
+        )
+
+    def test_only_matching_items(self):
+        self.assertEqual(
+            [name for name, _ in self.ranking("chicken")], ["Chicken curry"]
+        )
+        self.assertEqual(self.ranking("pizza"), [])
+        self.assertEqual(self.ranking(""), [])
+
+    def test_rare_terms_outweigh_common_ones(self):
+        # Both items mention curry, only one mentions beef
+        self.assertEqual(
+            [name for name, _ in self.ranking("beef curry")],
+            ["Beef curry", "Chicken curry"],
+        )
+
+    def test_matching_more_terms_ranks_first(self):
+        self.assertEqual(
+            [name for name, _ in self.ranking("chicken curry")],
+            ["Chicken curry", "Beef curry"],
+        )
+
+    def test_inactive_items_do_not_count(self):
+        before = dict(self.ranking("beef"))
+        self.create_item("Beef stew", "Beef", is_active=False)
+        self.create_item("Beef roast", "Beef", is_active=False)
+        self.assertEqual(dict(self.ranking("beef")), before)
@@ -57,6 +57,11 @@ urlpatterns = [
     path(
         "reverse-geocode/", views.ReverseGeocodeView.as_view(), name="reverse_geocode"
     ),
+    path(
+        "reverse-geocode/cache-stats/",
+        views.GeocodeCacheStatsView.as_view(),
+        name="reverse_geocode_cache_stats",
+    ),
     # Enhanced Location Services
     path(
         "location-context/",
@@ -1,11 +1,18 @@
 import logging
 import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from decimal import Decimal
 from typing import Dict, List, Optional
 
 import requests
 from django.conf import settings
 
+from .cache import TieredCache, coordinate_cache_key
+from .geo import covering_tiles, tile_bounds, tile_for
+from .http import google_maps_client, nominatim_client, overpass_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -31,7 +38,7 @@ class GoogleMapsService:
         params = {"address": address, "key": self.api_key}
 
         try:
-            response = requests.get(url, params=params)
+            response = google_maps_client.get(url, params=params)
             response.raise_for_status()
             data = response.json()
 
@@ -64,7 +71,7 @@ class GoogleMapsService:
         params = {"latlng": f"{latitude},{longitude}", "key": self.api_key}
 
         try:
-            response = requests.get(url, params=params)
+            response = google_maps_client.get(url, params=params)
             response.raise_for_status()
             data = response.json()
 
@@ -110,7 +117,7 @@ class GoogleMapsService:
             params["keyword"] = keyword
 
         try:
-            response = requests.get(url, params=params)
+            response = google_maps_client.get(url, params=params)
             response.raise_for_status()
             data = response.json()
 
@@ -143,7 +150,7 @@ class GoogleMapsService:
             params["radius"] = radius
 
         try:
-            response = requests.get(url, params=params)
+            response = google_maps_client.get(url, params=params)
             response.raise_for_status()
             data = response.json()
 
@@ -175,7 +182,7 @@ class GoogleMapsService:
         }
 
         try:
-            response = requests.get(url, params=params)
+            response = google_maps_client.get(url, params=params)
             response.raise_for_status()
             data = response.json()
 
@@ -290,10 +297,49 @@ def calculate_distance(lat1, lon1, lat2, lon2):
     return round(c * r, 2)
 
 
+reverse_geocode_cache = TieredCache(
+    "reverse_geocode",
+    timeout=getattr(settings, "GEOCODE_CACHE_TIMEOUT", 60 * 60 * 24 * 7),
+    max_entries=getattr(settings, "GEOCODE_CACHE_MAX_ENTRIES", 10000),
+)
+
+
 def get_location_from_coordinates(latitude, longitude):
     """
     Get address information from coordinates using Nominatim (OpenStreetMap)
-    Free service, no API key required
+    Free service, no API key required. Results are cached per quantized
+    coordinate (see GEOCODE_CACHE_PRECISION) so nearby lookups share an entry.
+    """
+    precision = getattr(settings, "GEOCODE_CACHE_PRECISION", 4)
+    cache_key = coordinate_cache_key(latitude, longitude, precision)
+
+    location = reverse_geocode_cache.get(cache_key)
+    if location is None:
+        location = _reverse_geocode_nominatim(latitude, longitude)
+        if location is not None:
+            reverse_geocode_cache.set(cache_key, location)
+
+    if location is not None:
+        return {**location, "latitude": float(latitude), "longitude": float(longitude)}
+
+    return _unknown_location(latitude, longitude)
+
+
+def _unknown_location(latitude, longitude):
+    """Placeholder location used when no address could be resolved"""
+    return {
+        "formatted_address": f"{latitude}, {longitude}",
+        "city": "Unknown",
+        "country": "Unknown",
+        "latitude": float(latitude),
+        "longitude": float(longitude),
+    }
+
+
+def _reverse_geocode_nominatim(latitude, longitude):
+    """
+    Query Nominatim for the address at the given coordinates.
+    Returns None when the lookup fails so that failures are never cached.
     """
     try:
         url = "https://nominatim.openstreetmap.org/reverse"
@@ -304,9 +350,8 @@ def get_location_from_coordinates(latitude, longitude):
             "zoom": 18,
             "addressdetails": 1,
         }
-        headers = {"User-Agent": "RecipeHub-FoodMap/1.0"}
 
-        response = requests.get(url, params=params, headers=headers, timeout=10)
+        response = nominatim_client.get(url, params=params)
         response.raise_for_status()
 
         data = response.json()
@@ -359,13 +404,7 @@ def get_location_from_coordinates(latitude, longitude):
     except Exception as e:
         print(f"Geocoding error: {e}")
 
-    return {
-        "formatted_address": f"{latitude}, {longitude}",
-        "city": "Unknown",
-        "country": "Unknown",
-        "latitude": float(latitude),
-        "longitude": float(longitude),
-    }
+    return None
 
 
 def get_coordinates_from_address(address):
@@ -375,9 +414,8 @@ def get_coordinates_from_address(address):
     try:
         url = "https://nominatim.openstreetmap.org/search"
         params = {"format": "json", "q": address, "limit": 1, "addressdetails": 1}
-        headers = {"User-Agent": "RecipeHub-FoodMap/1.0"}
 
-        response = requests.get(url, params=params, headers=headers, timeout=10)
+        response = nominatim_client.get(url, params=params)
         response.raise_for_status()
 
         data = response.json()
@@ -398,79 +436,135 @@ def get_coordinates_from_address(address):
     return None
 
 
+overpass_tile_cache = TieredCache(
+    "overpass_tile",
+    timeout=getattr(settings, "OVERPASS_TILE_MAX_AGE", 60 * 60 * 24),
+    max_entries=getattr(settings, "OVERPASS_TILE_CACHE_MAX_ENTRIES", 5000),
+)
+
+OVERPASS_AMENITIES = ("restaurant", "cafe", "fast_food", "bar", "pub")
+
+
 def find_nearby_locations(latitude, longitude, radius_km=5, location_type=None):
     """
     Find nearby locations using Overpass API (OpenStreetMap)
     location_type can be: restaurant, cafe, fast_food, etc.
+
+    Results are cached per slippy-map tile (OVERPASS_TILE_ZOOM) for all food
+    amenities; a query unions the tiles covering the radius, fetches only the
+    missing or stale ones, and filters by distance and type in-process.
+    """
+    zoom = getattr(settings, "OVERPASS_TILE_ZOOM", 15)
+    tiles = covering_tiles(latitude, longitude, radius_km * 1000, zoom)
+
+    places = []
+    missing_tiles = []
+    for tile in tiles:
+        cached = overpass_tile_cache.get(_overpass_tile_key(tile, zoom))
+        if cached is None:
+            missing_tiles.append(tile)
+        else:
+            places.extend(cached)
+
+    if missing_tiles:
+        fetched = _fetch_overpass_tiles(missing_tiles, zoom)
+        if fetched is not None:
+            for tile in missing_tiles:
+                tile_places = fetched.get(tile, [])
+                overpass_tile_cache.set(_overpass_tile_key(tile, zoom), tile_places)
+                places.extend(tile_places)
+
+    locations = []
+    for place in places:
+        if location_type in ("restaurant", "cafe", "fast_food"):
+            if place["amenity"] != location_type:
+                continue
+
+        # Calculate distance
+        distance = calculate_distance(
+            latitude, longitude, place["latitude"], place["longitude"]
+        )
+        if distance <= radius_km:
+            locations.append({**place, "distance": distance})
+
+    # Sort by distance
+    locations.sort(key=lambda x: x["distance"])
+    return locations[:20]  # Return top 20 closest
+
+
+def _overpass_tile_key(tile, zoom):
+    x, y = tile
+    return f"{zoom}/{x}/{y}"
+
+
+def _fetch_overpass_tiles(tiles, zoom):
+    """
+    Fetch food amenities for a set of tiles with a single Overpass query over
+    their combined bounding box, and group the results by tile.
+    Returns None if the request fails so nothing gets cached.
     """
     try:
-        # Overpass API query for nearby restaurants/food places
         overpass_url = "http://overpass-api.de/api/interpreter"
 
-        # Convert radius to degrees (approximate)
-        radius_deg = radius_km / 111.0  # 1 degree ≈ 111 km
-
-        # Build query based on location type
-        if location_type == "restaurant":
-            amenity_filter = 'amenity="restaurant"'
-        elif location_type == "cafe":
-            amenity_filter = 'amenity="cafe"'
-        elif location_type == "fast_food":
-            amenity_filter = 'amenity="fast_food"'
-        else:
-            amenity_filter = 'amenity~"restaurant|cafe|fast_food|bar|pub"'
+        bounds = [tile_bounds(x, y, zoom) for x, y in tiles]
+        south = min(b[0] for b in bounds)
+        west = min(b[1] for b in bounds)
+        north = max(b[2] for b in bounds)
+        east = max(b[3] for b in bounds)
+        bbox = f"{south},{west},{north},{east}"
+        amenity_filter = f'amenity~"{"|".join(OVERPASS_AMENITIES)}"'
 
         query = f"""
         [out:json][timeout:25];
         (
-          node[{amenity_filter}]({latitude-radius_deg},{longitude-radius_deg},{latitude+radius_deg},{longitude+radius_deg});
-          way[{amenity_filter}]({latitude-radius_deg},{longitude-radius_deg},{latitude+radius_deg},{longitude+radius_deg});
-          relation[{amenity_filter}]({latitude-radius_deg},{longitude-radius_deg},{latitude+radius_deg},{longitude+radius_deg});
+          node[{amenity_filter}]({bbox});
+          way[{amenity_filter}]({bbox});
+          relation[{amenity_filter}]({bbox});
         );
         out center meta;
         """
 
-        response = requests.post(overpass_url, data=query, timeout=30)
+        response = overpass_client.post(overpass_url, data=query)
         response.raise_for_status()
 
         data = response.json()
-        locations = []
-
-        for element in data.get("elements", []):
-            # Get coordinates
-            if element["type"] == "node":
-                lat, lon = element["lat"], element["lon"]
-            elif "center" in element:
-                lat, lon = element["center"]["lat"], element["center"]["lon"]
-            else:
-                continue
-
-            # Calculate distance
-            distance = calculate_distance(latitude, longitude, lat, lon)
-            if distance <= radius_km:
-                tags = element.get("tags", {})
-                locations.append(
-                    {
-                        "name": tags.get("name", "Unnamed location"),
-                        "latitude": lat,
-                        "longitude": lon,
-                        "distance": distance,
-                        "amenity": tags.get("amenity", ""),
-                        "cuisine": tags.get("cuisine", ""),
-                        "address": tags.get("addr:full", ""),
-                        "phone": tags.get("phone", ""),
-                        "website": tags.get("website", ""),
-                        "opening_hours": tags.get("opening_hours", ""),
-                    }
-                )
-
-        # Sort by distance
-        locations.sort(key=lambda x: x["distance"])
-        return locations[:20]  # Return top 20 closest
 
     except Exception as e:
         print(f"Nearby locations error: {e}")
-        return []
+        return None
+
+    wanted = set(tiles)
+    places_by_tile = {tile: [] for tile in tiles}
+
+    for element in data.get("elements", []):
+        # Get coordinates
+        if element["type"] == "node":
+            lat, lon = element["lat"], element["lon"]
+        elif "center" in element:
+            lat, lon = element["center"]["lat"], element["center"]["lon"]
+        else:
+            continue
+
+        tile = tile_for(lat, lon, zoom)
+        if tile not in wanted:
+            continue
+
+        tags = element.get("tags", {})
+        places_by_tile[tile].append(
+            {
+                "name": tags.get("name", "Unnamed location"),
+                "latitude": lat,
+                "longitude": lon,
+                "amenity": tags.get("amenity", ""),
+                "cuisine": tags.get("cuisine", ""),
+                "address": tags.get("addr:full", ""),
+                "phone": tags.get("phone", ""),
+                "website": tags.get("website", ""),
+                "opening_hours": tags.get("opening_hours", ""),
+            }
+        )
+
+    return places_by_tile
 
 
 def validate_coordinates(latitude, longitude):
@@ -489,20 +583,65 @@ def validate_coordinates(latitude, longitude):
         return False, None, None
 
 
+_location_context_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, "LOCATION_CONTEXT_WORKERS", 8),
+    thread_name_prefix="location-context",
+)
+
+
 def get_user_location_context(latitude, longitude):
     """
     Get comprehensive location context for a user's position
+
+    The address and nearby-places lookups run concurrently, each with its own
+    deadline (GEOCODE_DEADLINE / NEARBY_PLACES_DEADLINE seconds). Whatever has
+    not finished in time is replaced by a placeholder and listed under
+    "pending"; the lookup keeps running in the background and fills the cache
+    for the next request.
     """
-    location_info = get_location_from_coordinates(latitude, longitude)
-    nearby_places = find_nearby_locations(latitude, longitude, radius_km=1)
+    started = time.monotonic()
+    location_future = _location_context_executor.submit(
+        get_location_from_coordinates, latitude, longitude
+    )
+    nearby_future = _location_context_executor.submit(
+        find_nearby_locations, latitude, longitude, radius_km=1
+    )
+
+    pending = []
+
+    location_info = _result_before(
+        location_future, started + getattr(settings, "GEOCODE_DEADLINE", 3.0)
+    )
+    if location_info is None:
+        location_info = _unknown_location(latitude, longitude)
+        pending.append("user_location")
+
+    nearby_places = _result_before(
+        nearby_future, started + getattr(settings, "NEARBY_PLACES_DEADLINE", 3.0)
+    )
+    if nearby_places is None:
+        nearby_places = []
+        pending.append("nearby_restaurants")
 
     return {
         "user_location": location_info,
         "nearby_restaurants": nearby_places,
         "coordinates": {"latitude": float(latitude), "longitude": float(longitude)},
+        "pending": pending,
     }
 
 
+def _result_before(future, deadline):
+    """Result of a future if it completes before the monotonic deadline, else None"""
+    try:
+        return future.result(timeout=max(deadline - time.monotonic(), 0))
+    except FutureTimeoutError:
+        return None
+    except Exception as e:
+        logger.error(f"Location context lookup failed: {e}")
+        return None
+
+
 # Legacy Google Maps functions for backward compatibility
 def extract_address_components(address_components):
     """Legacy function for backward compatibility"""
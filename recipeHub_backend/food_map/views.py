@@ -1,22 +1,31 @@
+import hashlib
+import json
 import logging
+from urllib.parse import urlencode
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db.models import Q
-from django.db.models.functions import Cos, Power, Radians, Sin
+from django.db.models import F, Prefetch
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags, quote_etag
 from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from recipeHub_backend.pagination import KeysetPagination, cursor_state, keyset_page
+
 from .models import (
     FoodCategory,
     FoodItem,
     FoodItemReview,
     SearchHistory,
     UserFavoriteFoodItem,
+    taste_snapshot,
+    taste_vector,
 )
 from .serializers import (
     CreateFoodItemReviewSerializer,
@@ -30,8 +39,11 @@ from .serializers import (
     SearchHistorySerializer,
     UserFavoriteFoodItemSerializer,
 )
+from .history import search_history_buffer
+from .taste import NEARBY_QUERY_PREFIX
 from .utils import (
     get_coordinates_from_address,
+    reverse_geocode_cache,
     get_location_from_coordinates,
     get_user_location_context,
     validate_coordinates,
@@ -41,10 +53,39 @@ logger = logging.getLogger(__name__)
 User = get_user_model()
 
 
-class StandardResultsPagination(PageNumberPagination):
-    page_size = 20
-    page_size_query_param = "page_size"
-    max_page_size = 100
+def taste_weight():
+    """How much a perfect taste match boosts an item's rank"""
+    return getattr(settings, "TASTE_PROFILE_WEIGHT", 0.5)
+
+
+def ranking_taste(request, data):
+    """
+    (version, vector) of the taste profile to rank a result list with. Later
+    pages reuse the version the first page was ranked with, so the order
+    stays stable while the search itself updates the profile.
+    """
+    if not data.get("personalize", True):
+        return None, {}
+    if data.get("cursor"):
+        version = cursor_state(data["cursor"]).get("taste")
+        return version, taste_snapshot(request.user, version)
+    return taste_vector(request.user)
+
+
+def location_context_url(request, latitude, longitude):
+    """
+    Absolute URL of the cacheable location context for a position.
+    Coordinates are quantized like the geocoding cache so that every page of a
+    search session points at the same URL and can reuse the client's copy.
+    """
+    precision = getattr(settings, "GEOCODE_CACHE_PRECISION", 4)
+    query = urlencode(
+        {
+            "latitude": f"{round(float(latitude), precision):.{precision}f}",
+            "longitude": f"{round(float(longitude), precision):.{precision}f}",
+        }
+    )
+    return request.build_absolute_uri(f"{reverse('food_map:location_context')}?{query}")
 
 
 @api_view(["GET"])
@@ -57,7 +98,7 @@ def get_google_maps_api_key(request):
 class FoodCategoryListView(generics.ListAPIView):
     """List all food categories"""
 
-    queryset = FoodCategory.objects.all()
+    queryset = FoodCategory.objects.with_food_items_count()
     serializer_class = FoodCategorySerializer
     permission_classes = [permissions.AllowAny]
 
@@ -65,15 +106,22 @@ class FoodCategoryListView(generics.ListAPIView):
 class FoodItemListCreateView(generics.ListCreateAPIView):
     """List and create food items"""
 
-    pagination_class = StandardResultsPagination
+    pagination_class = KeysetPagination
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
+    ORDERING_OPTIONS = {
+        "newest": ("-created_at",),
+        "rating": ("-avg_rating", "-created_at"),
+        "reviews": ("-rating_count", "-created_at"),
+        "favorites": ("-favorites_count", "-created_at"),
+        "price": ("price", "-created_at"),
+        "-price": ("-price", "-created_at"),
+        "distance": ("distance", "-created_at"),
+        "relevance": ("-relevance", "-created_at"),
+    }
+
     def get_queryset(self):
-        queryset = (
-            FoodItem.objects.filter(is_active=True)
-            .select_related("created_by", "category")
-            .prefetch_related("images", "reviews")
-        )
+        queryset = FoodItem.objects.filter(is_active=True).for_list(self.request.user)
 
         # Filter by category
         category = self.request.query_params.get("category")
@@ -85,20 +133,19 @@ class FoodItemListCreateView(generics.ListCreateAPIView):
         if food_type:
             queryset = queryset.filter(food_type=food_type)
 
-        # Filter by city
+        # Filter by city, partial match; ?city_exact= is an exact match that
+        # can use the (is_active, city, -created_at) index
         city = self.request.query_params.get("city")
         if city:
             queryset = queryset.filter(city__icontains=city)
+        city_exact = self.request.query_params.get("city_exact")
+        if city_exact:
+            queryset = queryset.filter(city=city_exact)
 
-        # Search by name, description, or ingredients
+        # Full-text search over name, description, ingredients, etc.
         search = self.request.query_params.get("search")
         if search:
-            queryset = queryset.filter(
-                Q(name__icontains=search)
-                | Q(description__icontains=search)
-                | Q(ingredients__icontains=search)
-                | Q(restaurant_name__icontains=search)
-            )
+            queryset = queryset.search(search)
 
         # Filter by dietary restrictions
         if self.request.query_params.get("is_vegetarian") == "true":
@@ -123,7 +170,33 @@ class FoodItemListCreateView(generics.ListCreateAPIView):
         if availability:
             queryset = queryset.filter(availability_status=availability)
 
-        return queryset.order_by("-created_at")
+        # Ordering, each option is backed by an (is_active, ...) index
+        ordering = self.request.query_params.get(
+            "ordering", "relevance" if search else "newest"
+        )
+        if ordering == "relevance" and not search:
+            raise ValidationError(
+                {"ordering": "Ordering by relevance requires a search term"}
+            )
+        if ordering not in self.ORDERING_OPTIONS:
+            raise ValidationError(
+                {"ordering": f"Must be one of: {', '.join(self.ORDERING_OPTIONS)}"}
+            )
+        if ordering == "distance":
+            is_valid, lat, lng = validate_coordinates(
+                self.request.query_params.get("user_latitude"),
+                self.request.query_params.get("user_longitude"),
+            )
+            if not is_valid:
+                raise ValidationError(
+                    {
+                        "ordering": "Ordering by distance requires valid "
+                        "user_latitude and user_longitude"
+                    }
+                )
+            queryset = queryset.with_distance(lat, lng)
+
+        return queryset.order_by(*self.ORDERING_OPTIONS[ordering])
 
     def get_serializer_class(self):
         if self.request.method == "POST":
@@ -232,49 +305,65 @@ class NearbyFoodItemsView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Get user location context (address, nearby places)
-        location_context = get_user_location_context(lat, lng)
+        # Get user location context (address, nearby places) unless the client
+        # fetches it separately from the location-context endpoint; later
+        # pages of the same search never repeat it
+        location_context = None
+        if data.get("include_location_context", True) and not data.get("cursor"):
+            location_context = get_user_location_context(lat, lng)
 
-        # Calculate distance using Haversine formula in database
-        earth_radius = 6371000  # Earth's radius in meters
-
-        queryset = (
-            FoodItem.objects.filter(is_active=True)
-            .annotate(
-                distance=earth_radius
-                * 2
-                * Sin(
-                    Power(Sin((Radians(user_lat) - Radians("latitude")) / 2), 2)
-                    + Cos(Radians(user_lat))
-                    * Cos(Radians("latitude"))
-                    * Power(Sin((Radians(user_lng) - Radians("longitude")) / 2), 2),
-                    0.5,
-                )
-            )
-            .filter(distance__lte=radius)
-        )
+        candidates = FoodItem.objects.filter(is_active=True)
 
         # Apply additional filters
         if data.get("category"):
-            queryset = queryset.filter(category__name__icontains=data["category"])
+            candidates = candidates.filter(category__name__icontains=data["category"])
 
         if data.get("food_type"):
-            queryset = queryset.filter(food_type=data["food_type"])
+            candidates = candidates.filter(food_type=data["food_type"])
 
         if data.get("max_price"):
-            queryset = queryset.filter(price__lte=data["max_price"])
+            candidates = candidates.filter(price__lte=data["max_price"])
 
         if data.get("is_vegetarian"):
-            queryset = queryset.filter(is_vegetarian=True)
+            candidates = candidates.filter(is_vegetarian=True)
 
         if data.get("is_vegan"):
-            queryset = queryset.filter(is_vegan=True)
+            candidates = candidates.filter(is_vegan=True)
 
         if data.get("is_gluten_free"):
-            queryset = queryset.filter(is_gluten_free=True)
+            candidates = candidates.filter(is_gluten_free=True)
+
+        # Indexed prefilter plus exact distance check, see FoodItemQuerySet
+        queryset = candidates.within_radius(lat, lng, radius).for_list(request.user)
+
+        # Order by distance, or for users with a taste profile by distance
+        # discounted by how well each item matches their taste
+        taste_version, taste = ranking_taste(request, data)
+        if taste:
+            queryset = queryset.with_affinity(taste).annotate(
+                rank=(1.0 + taste_weight() * F("affinity"))
+                / (1.0 + F("distance") / radius)
+            )
+            keys = [("rank", True), ("distance", False), ("id", False)]
+        else:
+            keys = [("distance", False), ("id", False)]
+
+        # One query for the page, continuing after the cursor
+        items, next_cursor = keyset_page(
+            queryset,
+            keys,
+            data.get("cursor"),
+            data["page_size"],
+            state={"taste": taste_version},
+        )
 
-        # Order by distance
-        queryset = queryset.order_by("distance")
+        # Rows in the geohash/bounding box cells, a cheap upper bound of the
+        # total that skips the distance computation
+        # Search history records it too, once per search (not per page)
+        record_history = request.user.is_authenticated and not data.get("cursor")
+        approximate_count = None
+        if data.get("include_count") or record_history:
+            approximate_count = candidates.near(lat, lng, radius).count()
 
         # Add user location to context for serializer
         context = {"request": request}
@@ -283,33 +372,46 @@ class NearbyFoodItemsView(APIView):
             "longitude": user_lng,
         }
 
-        # Save search history if user is authenticated
-        if request.user.is_authenticated:
-            SearchHistory.objects.create(
+        results = FoodItemListSerializer(items, many=True, context=context).data
+
+        # Record search history, buffered (see SearchHistoryBuffer)
+        if record_history:
+            search_history_buffer.add(
                 user=request.user,
-                query=f"Nearby search ({radius}m radius)",
-                location=location_context["user_location"]["formatted_address"],
+                query=f"{NEARBY_QUERY_PREFIX} ({radius}m radius)",
+                location=(
+                    location_context["user_location"]["formatted_address"]
+                    if location_context
+                    else ""
+                ),
                 latitude=user_lat,
                 longitude=user_lng,
-                results_count=queryset.count(),
+                results_count=approximate_count,
             )
 
-        serializer = FoodItemListSerializer(queryset, many=True, context=context)
-
-        return Response(
-            {
-                "results": serializer.data,
-                "count": queryset.count(),
-                "radius": radius,
-                "center": {"latitude": user_lat, "longitude": user_lng},
-                "location_context": location_context,
-                "search_area": {
-                    "address": location_context["user_location"]["formatted_address"],
-                    "city": location_context["user_location"]["city"],
-                    "country": location_context["user_location"]["country"],
-                },
+        response_data = {
+            "results": results,
+            # Rows of this page only (this replaced `count`), the total is
+            # not counted (see include_count for an estimate)
+            "page_count": len(results),
+            "has_more": next_cursor is not None,
+            "next_cursor": next_cursor,
+            "radius": radius,
+            "center": {"latitude": user_lat, "longitude": user_lng},
+            "location_context_url": location_context_url(request, lat, lng),
+        }
+        if data.get("include_count"):
+            response_data["approximate_count"] = approximate_count
+
+        if location_context:
+            response_data["location_context"] = location_context
+            response_data["search_area"] = {
+                "address": location_context["user_location"]["formatted_address"],
+                "city": location_context["user_location"]["city"],
+                "country": location_context["user_location"]["country"],
             }
-        )
+
+        return Response(response_data)
 
 
 class FoodItemSearchView(APIView):
@@ -325,17 +427,21 @@ class FoodItemSearchView(APIView):
         data = serializer.validated_data
         query = data["query"]
 
-        # Base queryset
-        queryset = FoodItem.objects.filter(is_active=True).filter(
-            Q(name__icontains=query)
-            | Q(description__icontains=query)
-            | Q(ingredients__icontains=query)
-            | Q(restaurant_name__icontains=query)
-            | Q(address__icontains=query)
+        # Base queryset, ranked by full-text relevance boosted by how well
+        # each item matches the user's taste profile
+        taste_version, taste = ranking_taste(request, data)
+        matches = FoodItem.objects.filter(is_active=True).search(query)
+        queryset = (
+            matches.for_list(request.user)
+            .with_affinity(taste)
+            .annotate(relevance=F("relevance") * (1.0 + taste_weight() * F("affinity")))
         )
+        keys = [("relevance", True), ("created_at", True), ("id", False)]
 
         location_context = None
         search_location = None
+        context_url = None
+        context = {"request": request}
 
         # Add location-based filtering if provided
         if data.get("latitude") and data.get("longitude"):
@@ -346,64 +452,77 @@ class FoodItemSearchView(APIView):
             # Validate coordinates
             is_valid, lat, lng = validate_coordinates(user_lat, user_lng)
             if is_valid:
-                # Get location context
-                location_context = get_user_location_context(lat, lng)
-                search_location = location_context["user_location"]["formatted_address"]
-
-                # Filter by distance
-                earth_radius = 6371000
-                queryset = (
-                    queryset.annotate(
-                        distance=earth_radius
-                        * 2
-                        * Sin(
-                            Power(Sin((Radians(user_lat) - Radians("latitude")) / 2), 2)
-                            + Cos(Radians(user_lat))
-                            * Cos(Radians("latitude"))
-                            * Power(
-                                Sin((Radians(user_lng) - Radians("longitude")) / 2), 2
-                            ),
-                            0.5,
-                        )
-                    )
-                    .filter(distance__lte=radius)
-                    .order_by("distance")
+                # Get location context unless the client fetches it separately,
+                # once per search (not per page)
+                if data.get("include_location_context", True) and not data.get(
+                    "cursor"
+                ):
+                    location_context = get_user_location_context(lat, lng)
+                    search_location = location_context["user_location"][
+                        "formatted_address"
+                    ]
+                context_url = location_context_url(request, lat, lng)
+
+                # Filter by distance and rank by relevance damped by distance,
+                # an item at the edge of the radius counts half as much
+                queryset = queryset.within_radius(lat, lng, radius).annotate(
+                    rank=F("relevance") / (1.0 + F("distance") / radius)
                 )
+                keys = [("rank", True), ("distance", False), ("id", False)]
+                matches = matches.near(lat, lng, radius)
 
                 # Add user location to context
-                context = {"request": request}
                 context["request"].user_location = {
                     "latitude": user_lat,
                     "longitude": user_lng,
                 }
-            else:
-                context = {"request": request}
-                queryset = queryset.order_by("-created_at")
-        else:
-            context = {"request": request}
-            queryset = queryset.order_by("-created_at")
 
-        # Save search history if user is authenticated
-        if request.user.is_authenticated:
-            SearchHistory.objects.create(
+        # One query for the page, continuing after the cursor
+        items, next_cursor = keyset_page(
+            queryset,
+            keys,
+            data.get("cursor"),
+            data["page_size"],
+            state={"taste": taste_version},
+        )
+
+        # Matching rows, within the geohash/bounding box cells for a located
+        # search, without ranking or distance
+        # Search history records it too, once per search (not per page)
+        record_history = request.user.is_authenticated and not data.get("cursor")
+        approximate_count = None
+        if data.get("include_count") or record_history:
+            approximate_count = matches.count()
+
+        results = FoodItemListSerializer(items, many=True, context=context).data
+
+        # Record search history, buffered (see SearchHistoryBuffer)
+        if record_history:
+            search_history_buffer.add(
                 user=request.user,
                 query=query,
                 location=search_location or "",
                 latitude=data.get("latitude"),
                 longitude=data.get("longitude"),
-                results_count=queryset.count(),
+                results_count=approximate_count,
             )
 
-        serializer = FoodItemListSerializer(queryset, many=True, context=context)
-
         response_data = {
-            "results": serializer.data,
-            "count": queryset.count(),
+            "results": results,
+            # Rows of this page only (this replaced `count`), the total is
+            # not counted (see include_count for an estimate)
+            "page_count": len(results),
+            "has_more": next_cursor is not None,
+            "next_cursor": next_cursor,
             "query": query,
         }
+        if data.get("include_count"):
+            response_data["approximate_count"] = approximate_count
 
         if location_context:
             response_data["location_context"] = location_context
+        if context_url:
+            response_data["location_context_url"] = context_url
 
         return Response(response_data)
 
@@ -412,7 +531,7 @@ class FoodItemReviewListCreateView(generics.ListCreateAPIView):
     """List and create reviews for a food item"""
 
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
-    pagination_class = StandardResultsPagination
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         food_item_id = self.kwargs["food_item_id"]
@@ -440,13 +559,17 @@ class UserFavoriteFoodItemsListView(generics.ListAPIView):
 
     serializer_class = UserFavoriteFoodItemSerializer
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = StandardResultsPagination
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         return (
             UserFavoriteFoodItem.objects.filter(user=self.request.user)
-            .select_related("food_item")
-            .prefetch_related("food_item__category", "food_item__images")
+            .prefetch_related(
+                Prefetch(
+                    "food_item",
+                    queryset=FoodItem.objects.for_list(self.request.user),
+                )
+            )
             .order_by("-created_at")
         )
 
@@ -482,7 +605,7 @@ class SearchHistoryListView(generics.ListAPIView):
 
     serializer_class = SearchHistorySerializer
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = StandardResultsPagination
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         return SearchHistory.objects.filter(user=self.request.user).order_by(
@@ -544,6 +667,17 @@ class ReverseGeocodeView(APIView):
         return Response(result)
 
 
+class GeocodeCacheStatsView(APIView):
+    """Hit/miss counters of the reverse geocoding cache for this worker process"""
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        stats = reverse_geocode_cache.stats()
+        stats["precision"] = getattr(settings, "GEOCODE_CACHE_PRECISION", 4)
+        return Response(stats)
+
+
 class LocationContextView(APIView):
     """Get comprehensive location context including nearby restaurants"""
 
@@ -569,7 +703,26 @@ class LocationContextView(APIView):
 
         # Get comprehensive location context
         context = get_user_location_context(lat, lng)
-        return Response(context)
+
+        etag = quote_etag(
+            hashlib.md5(
+                json.dumps(context, sort_keys=True, default=str).encode()
+            ).hexdigest()
+        )
+        if context["pending"]:
+            # Partial context, let the client ask again shortly
+            max_age = 0
+        else:
+            max_age = getattr(settings, "LOCATION_CONTEXT_MAX_AGE", 300)
+
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(context)
+
+        response["ETag"] = etag
+        patch_cache_control(response, public=True, max_age=max_age)
+        return response
 
 
 # Legacy views for backward compatibility
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Min
+
+from comments.models import Reaction
+from kitchen.models import Recipe
+
+
+class Command(BaseCommand):
+    help = (
+        "Remove duplicate reactions of a user to the same recipe, keeping the "
+        "oldest, and recompute the stored reaction counts of recipes. Run "
+        "before creating the (user, recipe) unique constraint on a database "
+        "that predates it."
+    )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            duplicates = (
+                Reaction.objects.filter(user__isnull=False, recipe__isnull=False)
+                .values("user", "recipe")
+                .annotate(keep=Min("pk"), total=Count("pk"))
+                .filter(total__gt=1)
+            )
+            removed = 0
+            for duplicate in duplicates:
+                removed += (
+                    Reaction.objects.filter(
+                        user=duplicate["user"], recipe=duplicate["recipe"]
+                    )
+                    .exclude(pk=duplicate["keep"])
+                    .delete()[0]
+                )
+            updated = Recipe.objects.rebuild_reaction_counts()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Removed {removed} duplicate reactions, "
+                f"rebuilt reaction counts for {updated} recipes"
+            )
+        )
@@ -1,6 +1,28 @@
 from django.db import models
+from django.db.models import F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from user.models import CustomUser
 
+
+class RecipeQuerySet(models.QuerySet):
+    def adjust_reactions(self, recipe_id, delta):
+        """Apply a change in reactions to the stored count of one recipe"""
+        self.filter(pk=recipe_id).update(reaction_count=F('reaction_count') + delta)
+
+    def rebuild_reaction_counts(self):
+        """Recompute the stored reaction counts from Reaction"""
+        from comments.models import Reaction
+
+        reactions = (
+            Reaction.objects.filter(recipe=OuterRef('pk'), react=True)
+            .order_by()
+            .values('recipe')
+            .annotate(value=models.Count('pk'))
+            .values('value')
+        )
+        return self.update(reaction_count=Coalesce(Subquery(reactions), 0))
+
+
 class Recipe(models.Model):
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, blank=True, null=True)
     
@@ -12,8 +34,24 @@ class Recipe(models.Model):
     creation_date = models.DateTimeField(auto_now_add=True)
     seasonal = models.CharField(max_length=150, null=True, blank=True)
 
+    # Reactions with react=True, kept up to date by comments.signals
+    reaction_count = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = RecipeQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['reaction_count']),
+        ]
+
     def __str__(self):
         return self.title
 
 
-
+def deleting_recipes(origin):
+    """
+    Whether a delete that started at `origin` (the post_delete argument)
+    removes recipes. Counters and scores of those recipes go with them, so
+    their reactions and comments need not update them one by one.
+    """
+    return isinstance(origin, Recipe) or getattr(origin, 'model', None) is Recipe
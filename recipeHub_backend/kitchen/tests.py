@@ -1,3 +1,61 @@
 from django.test import TestCase
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
 
-# Create your tests here.
+from recipeHub_backend.pagination import (
+    LinkHeaderKeysetPagination,
+    decode_cursor,
+    encode_cursor,
+    keyset_page,
+)
+from user.models import CustomUser
+from .models import Recipe
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        user = CustomUser.objects.create_user('cook@example.com', 'cook', 'password')
+        self.recipes = [
+            Recipe.objects.create(
+                user=user, title=f'Recipe {i}', ingredients='Rice', flavour='Savory', region='Dhaka'
+            )
+            for i in range(5)
+        ]
+
+    def test_cursor_round_trip(self):
+        cursor = encode_cursor([3, 'Dhaka'], {'query': 'rice'})
+        self.assertEqual(decode_cursor(cursor, 2), [3, 'Dhaka'])
+        with self.assertRaises(ValidationError):
+            decode_cursor(cursor, 1)
+        with self.assertRaises(ValidationError):
+            decode_cursor('not a cursor', 1)
+
+    def test_pages_cover_every_row_once(self):
+        keys = [('region', False), ('pk', True)]
+        seen, cursor = [], None
+        while True:
+            rows, cursor = keyset_page(Recipe.objects.all(), keys, cursor, 2)
+            seen.extend(row.pk for row in rows)
+            if cursor is None:
+                break
+        self.assertEqual(seen, [recipe.pk for recipe in reversed(self.recipes)])
+
+    def test_link_header_pages_newest_first(self):
+        factory = APIRequestFactory()
+        paginator = LinkHeaderKeysetPagination()
+        request = Request(factory.get('/api/kitchen/post/', {'page_size': 3}))
+        rows = paginator.paginate_queryset(Recipe.objects.all(), request)
+        self.assertEqual(rows, self.recipes[:1:-1])
+
+        response = paginator.get_paginated_response([row.pk for row in rows])
+        next_url = response['Link'].split(';')[0].strip('<>')
+        request = Request(factory.get(next_url))
+        rows = LinkHeaderKeysetPagination().paginate_queryset(Recipe.objects.all(), request)
+        self.assertEqual(rows, self.recipes[1::-1])
+
+    def test_lists_are_always_bounded(self):
+        request = Request(APIRequestFactory().get('/api/kitchen/post/'))
+        paginator = LinkHeaderKeysetPagination()
+        paginator.page_size = 2
+        self.assertEqual(len(paginator.paginate_queryset(Recipe.objects.all(), request)), 2)
@@ -1,6 +1,10 @@
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 from rest_framework import viewsets
+from rest_framework.exceptions import ValidationError
+
+from recipeHub_backend.filters import FieldFilter
+from recipeHub_backend.pagination import LinkHeaderKeysetPagination
 
 from . import models, serializers
 
@@ -9,3 +13,18 @@ from . import models, serializers
 class RecipeViewset(viewsets.ModelViewSet):
     queryset = models.Recipe.objects.all()
     serializer_class = serializers.RecipeSerializers
+    pagination_class = LinkHeaderKeysetPagination
+    filter_backends = [FieldFilter]
+    filter_fields = ("user",)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+
+        # Popular recipes, a read of the stored reaction count
+        min_reactions = self.request.query_params.get("min_reactions")
+        if min_reactions:
+            try:
+                queryset = queryset.filter(reaction_count__gte=int(min_reactions))
+            except ValueError:
+                raise ValidationError({"min_reactions": "Must be an integer."})
+        return queryset
@@ -2,6 +2,9 @@ from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 from rest_framework import viewsets
 
+from recipeHub_backend.filters import FieldFilter
+from recipeHub_backend.pagination import LinkHeaderKeysetPagination
+
 from . import models, serializers
 
 # Create your views here.
@@ -11,3 +14,6 @@ from . import models, serializers
 class OrderViewset(viewsets.ModelViewSet):
     queryset = models.Order.objects.all()
     serializer_class = serializers.OrderSerializers
+    pagination_class = LinkHeaderKeysetPagination
+    filter_backends = [FieldFilter]
+    filter_fields = ("user", "pay_reason")
@@ -2,6 +2,9 @@ from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 from rest_framework import viewsets
 
+from recipeHub_backend.filters import FieldFilter
+from recipeHub_backend.pagination import LinkHeaderKeysetPagination
+
 from . import models, serializers
 
 # Create your views here.
@@ -11,9 +14,11 @@ from . import models, serializers
 class PodcastViewset(viewsets.ModelViewSet):
     queryset = models.Podcast.objects.all()
     serializer_class = serializers.PodcastSerializers
+    pagination_class = LinkHeaderKeysetPagination
 
 
 @method_decorator(csrf_exempt, name="dispatch")
 class PremiumPodcastViewset(viewsets.ModelViewSet):
     queryset = models.PremimumPodcast.objects.all()
     serializer_class = serializers.PremimumPodcastSerializers
+    pagination_class = LinkHeaderKeysetPagination
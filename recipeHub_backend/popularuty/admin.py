@@ -1,6 +1,9 @@
 from django.contrib import admin
-from .models import Popularity
+from .models import RecipePopularity
 
 
-
-admin.site.register(Popularity)
\ No newline at end of file
+@admin.register(RecipePopularity)
+class RecipePopularityAdmin(admin.ModelAdmin):
+    list_display = ['recipe', 'region', 'flavour', 'score']
+    list_filter = ['region', 'flavour']
+    readonly_fields = ['score']
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class PopularutyConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'popularuty'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .models import check_settings
+
+        check_settings()
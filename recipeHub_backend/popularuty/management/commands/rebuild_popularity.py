@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from kitchen.models import Recipe
+from popularuty.models import RecipePopularity, compute_scores, normalize
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the popularity scores of all recipes from their reactions "
+        "and comments. Scores are updated on every event, run this "
+        "periodically to correct drift and after changing the weights or "
+        "half-life."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of recipes scored per batch",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        recipe_ids = list(Recipe.objects.order_by("pk").values_list("pk", flat=True))
+
+        rebuilt = 0
+        for start in range(0, len(recipe_ids), batch_size):
+            recipes = Recipe.objects.filter(
+                pk__in=recipe_ids[start : start + batch_size]
+            )
+            scores = compute_scores(recipes)
+            rows = [
+                RecipePopularity(
+                    recipe_id=pk,
+                    region=normalize(region),
+                    flavour=normalize(flavour),
+                    score=scores[pk],
+                )
+                for pk, region, flavour in recipes.values_list(
+                    "pk", "region", "flavour"
+                )
+                if pk in scores
+            ]
+            with transaction.atomic():
+                RecipePopularity.objects.bulk_create(
+                    rows,
+                    update_conflicts=True,
+                    unique_fields=["recipe"],
+                    update_fields=["region", "flavour", "score"],
+                )
+            rebuilt += len(rows)
+
+        # Rows of recipes deleted behind the signals' back
+        RecipePopularity.objects.exclude(recipe__in=Recipe.objects.all()).delete()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt popularity of {rebuilt} recipes")
+        )
@@ -1,9 +1,139 @@
+import math
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
 from django.db import models
-from comments.models import Reaction
+from django.db.models import F, Value
+from django.db.models.functions import Abs, Exp, Greatest, Ln
+
+from kitchen.models import Recipe
+
+# Scores are kept in log space relative to a fixed epoch, see `event_score`
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def decay_time():
+    """Seconds for a contribution to decay by a factor e"""
+    return settings.POPULARITY_HALF_LIFE_HOURS * 3600 / math.log(2)
+
+
+def check_settings():
+    """Scores are logarithms of weights, every weight must be positive"""
+    for name in (
+        "POPULARITY_HALF_LIFE_HOURS",
+        "POPULARITY_RECIPE_WEIGHT",
+        "POPULARITY_REACTION_WEIGHT",
+        "POPULARITY_COMMENT_WEIGHT",
+    ):
+        if getattr(settings, name) <= 0:
+            raise ImproperlyConfigured(f"{name} must be positive")
+
+
+def event_score(weight, when):
+    """
+    Log-space score of one event: ln(weight) + t / tau.
+
+    A recipe's score is the logarithm of the sum of its events' weights,
+    each grown by e^(t / tau) from the epoch. Comparing two recipes at any
+    later moment divides both sums by the same e^(now / tau), so the order
+    of stored scores is the order of the decayed (Hacker News style) scores
+    and never has to be recomputed as time passes.
+    """
+    return math.log(weight) + (when - EPOCH).total_seconds() / decay_time()
+
+
+def combine_scores(a, b):
+    """ln(e^a + e^b) without overflowing"""
+    if a is None:
+        return b
+    high, low = max(a, b), min(a, b)
+    return high + math.log1p(math.exp(low - high))
+
+
+def normalize(value):
+    return (value or "").strip().lower()
+
+
+class RecipePopularityQuerySet(models.QuerySet):
+    def add_event(self, recipe_id, weight, when):
+        """Add one reaction or comment to a recipe's score, in one update"""
+        score = Value(event_score(weight, when))
+        return self.filter(pk=recipe_id).update(
+            score=Greatest(F("score"), score) + Ln(1 + Exp(-Abs(F("score") - score)))
+        )
+
+    def recompute(self, recipe_id):
+        """Recompute the score of one recipe, after an event was taken back"""
+        scores = compute_scores(Recipe.objects.filter(pk=recipe_id))
+        if recipe_id in scores:
+            self.filter(pk=recipe_id).update(score=scores[recipe_id])
+
+    def trending(self, region=None, flavour=None):
+        """Popularity rows best first, each filter served by its own index"""
+        queryset = self
+        if region:
+            queryset = queryset.filter(region=normalize(region))
+        if flavour:
+            queryset = queryset.filter(flavour=normalize(flavour))
+        return queryset.order_by("-score", "-recipe")
+
+
+def compute_scores(recipes):
+    """
+    Scores of `recipes` from their creation, reactions and comments. Events
+    without a timestamp count from the recipe's creation.
+    """
+    from comments.models import Comment, Reaction
+
+    created = dict(recipes.values_list("pk", "creation_date"))
+    scores = {
+        pk: event_score(settings.POPULARITY_RECIPE_WEIGHT, when)
+        for pk, when in created.items()
+    }
+    events = [
+        (
+            settings.POPULARITY_REACTION_WEIGHT,
+            Reaction.objects.filter(recipe__in=list(created), react=True),
+            "created",
+        ),
+        (
+            settings.POPULARITY_COMMENT_WEIGHT,
+            Comment.objects.filter(recipe__in=list(created)),
+            "creation_date",
+        ),
+    ]
+    for weight, queryset, time_field in events:
+        for recipe_id, when in queryset.values_list("recipe_id", time_field).iterator():
+            score = event_score(weight, when or created[recipe_id])
+            scores[recipe_id] = combine_scores(scores[recipe_id], score)
+    return scores
+
+
+class RecipePopularity(models.Model):
+    """
+    Time-decayed popularity of a recipe, kept up to date by
+    popularuty.signals. Region and flavour are copied from the recipe,
+    normalized, so a trending list of one region or flavour is a single
+    range read of an index.
+    """
+
+    recipe = models.OneToOneField(
+        Recipe, on_delete=models.CASCADE, primary_key=True, related_name="popularity"
+    )
+    region = models.CharField(max_length=50, blank=True)
+    flavour = models.CharField(max_length=100, blank=True)
+    score = models.FloatField(default=0.0)
+
+    objects = RecipePopularityQuerySet.as_manager()
 
-class Popularity(models.Model):
-    react_count = models.ForeignKey(Reaction, on_delete=models.CASCADE)
+    class Meta:
+        verbose_name_plural = "Recipe popularities"
+        indexes = [
+            models.Index(fields=["-score", "-recipe"]),
+            models.Index(fields=["region", "-score", "-recipe"]),
+            models.Index(fields=["flavour", "-score", "-recipe"]),
+        ]
 
     def __str__(self):
-        return self.react_count
-    
\ No newline at end of file
+        return f"{self.recipe} ({self.score:.2f})"
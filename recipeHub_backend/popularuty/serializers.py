@@ -1,9 +1,9 @@
 from rest_framework import serializers
-from . import models
 
 
-class PopularitySerializers(serializers.ModelSerializer):
-    class Meta:
-        model = models.Popularity
-        fields = '__all__'
+class TrendingQuerySerializer(serializers.Serializer):
+    """Query parameters of the trending recipes list"""
 
+    region = serializers.CharField(required=False, allow_blank=True)
+    flavour = serializers.CharField(required=False, allow_blank=True)
+    limit = serializers.IntegerField(default=20, min_value=1, max_value=100)
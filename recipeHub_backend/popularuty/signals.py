@@ -0,0 +1,70 @@
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from comments.models import Comment, Reaction
+from kitchen.models import Recipe, deleting_recipes
+
+from .models import RecipePopularity, event_score, normalize
+
+
+@receiver(post_save, sender=Recipe)
+def sync_recipe_popularity(sender, instance, created, **kwargs):
+    fields = {
+        "region": normalize(instance.region),
+        "flavour": normalize(instance.flavour),
+    }
+    if created:
+        score = event_score(settings.POPULARITY_RECIPE_WEIGHT, instance.creation_date)
+        RecipePopularity.objects.create(recipe=instance, score=score, **fields)
+    else:
+        RecipePopularity.objects.filter(pk=instance.pk).update(**fields)
+
+
+@receiver(post_save, sender=Reaction)
+def reaction_popularity(sender, instance, created, **kwargs):
+    # comments.signals compares the saved reaction with the stored row before
+    # the save: only a new like adds to the score, anything else is recomputed
+    before = getattr(instance, "_counted_recipe", None)
+    after = instance.recipe_id if instance.react else None
+    if before == after:
+        return
+    if before is not None:
+        RecipePopularity.objects.recompute(before)
+    if after is not None:
+        if before is None:
+            RecipePopularity.objects.add_event(
+                after,
+                settings.POPULARITY_REACTION_WEIGHT,
+                instance.created or timezone.now(),
+            )
+        else:
+            RecipePopularity.objects.recompute(after)
+
+
+@receiver(post_delete, sender=Reaction)
+def reaction_removed_popularity(sender, instance, origin=None, **kwargs):
+    # Reactions deleted along with their recipe take its score with them
+    if deleting_recipes(origin):
+        return
+    if instance.react and instance.recipe_id is not None:
+        RecipePopularity.objects.recompute(instance.recipe_id)
+
+
+@receiver(post_save, sender=Comment)
+def comment_popularity(sender, instance, created, **kwargs):
+    if created and instance.recipe_id is not None:
+        RecipePopularity.objects.add_event(
+            instance.recipe_id,
+            settings.POPULARITY_COMMENT_WEIGHT,
+            instance.creation_date or timezone.now(),
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def comment_removed_popularity(sender, instance, origin=None, **kwargs):
+    if deleting_recipes(origin):
+        return
+    if instance.recipe_id is not None:
+        RecipePopularity.objects.recompute(instance.recipe_id)
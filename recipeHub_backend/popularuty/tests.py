@@ -1,3 +1,79 @@
-from django.test import TestCase
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase, override_settings
 
-# Create your tests here.
+from comments.models import Comment, Reaction
+from kitchen.models import Recipe
+from user.models import CustomUser
+
+from .models import RecipePopularity, check_settings, compute_scores
+
+
+class PopularityTests(TestCase):
+    def setUp(self):
+        self.users = [
+            CustomUser.objects.create_user(f"user{i}@example.com", f"user{i}", "pw")
+            for i in range(3)
+        ]
+        self.soup, self.curry = [
+            Recipe.objects.create(
+                user=self.users[0],
+                title=title,
+                ingredients="Rice",
+                flavour="Savory",
+                region="Dhaka",
+            )
+            for title in ("Soup", "Curry")
+        ]
+
+    def stored_scores(self):
+        return dict(RecipePopularity.objects.values_list("recipe_id", "score"))
+
+    def assertScoresMatchRecompute(self):
+        stored = self.stored_scores()
+        for recipe_id, score in compute_scores(Recipe.objects.all()).items():
+            self.assertAlmostEqual(stored[recipe_id], score, places=6)
+
+    def test_events_add_in_log_space(self):
+        for user in self.users:
+            Reaction.objects.create(user=user, recipe=self.curry, react=True)
+        Comment.objects.create(
+            user=self.users[1], recipe=self.curry, comment_text="Yum"
+        )
+        Comment.objects.create(user=self.users[2], recipe=self.soup, comment_text="Hot")
+
+        self.assertScoresMatchRecompute()
+        self.assertEqual(
+            list(
+                RecipePopularity.objects.trending().values_list("recipe_id", flat=True)
+            ),
+            [self.curry.pk, self.soup.pk],
+        )
+
+    def test_removed_events_are_recomputed(self):
+        reaction = Reaction.objects.create(
+            user=self.users[1], recipe=self.soup, react=True
+        )
+        comment = Comment.objects.create(
+            user=self.users[1], recipe=self.soup, comment_text="Yum"
+        )
+
+        reaction.delete()
+        comment.delete()
+
+        self.assertScoresMatchRecompute()
+
+    def test_deleting_a_recipe_skips_its_children(self):
+        for user in self.users:
+            Reaction.objects.create(user=user, recipe=self.soup, react=True)
+            Comment.objects.create(user=user, recipe=self.soup, comment_text="Yum")
+
+        # Collect and delete the rows, no recompute or count update per child
+        with self.assertNumQueries(6):
+            self.soup.delete()
+        self.assertEqual(list(self.stored_scores()), [self.curry.pk])
+
+    def test_weights_must_be_positive(self):
+        check_settings()
+        with override_settings(POPULARITY_COMMENT_WEIGHT=0):
+            with self.assertRaises(ImproperlyConfigured):
+                check_settings()
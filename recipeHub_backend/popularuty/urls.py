@@ -1,11 +1,7 @@
-from rest_framework.routers import DefaultRouter
-from django.urls import path, include
+from django.urls import path
 from . import views
 
-router = DefaultRouter()
-router.register('list', views.PopularityViewset)
-
 
 urlpatterns = [
-    path('', include(router.urls)),
-]
\ No newline at end of file
+    path('trending/', views.TrendingRecipesView.as_view(), name='trending_recipes'),
+]
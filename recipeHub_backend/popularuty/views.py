@@ -1,13 +1,30 @@
-from django.utils.decorators import method_decorator
-from django.views.decorators.csrf import csrf_exempt
-from rest_framework import viewsets
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from kitchen.serializers import RecipeSerializers
 
 from . import models, serializers
 
-# Create your views here.
 
+class TrendingRecipesView(APIView):
+    """
+    The most popular recipes right now, optionally of one region and/or
+    flavour: `?region=&flavour=&limit=`. One query, reading the matching
+    popularity index from the top.
+    """
+
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        query = serializers.TrendingQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        data = query.validated_data
 
-@method_decorator(csrf_exempt, name="dispatch")
-class PopularityViewset(viewsets.ModelViewSet):
-    queryset = models.Popularity.objects.all()
-    serializer_class = serializers.PopularitySerializers
+        popular = models.RecipePopularity.objects.trending(
+            region=data.get("region"), flavour=data.get("flavour")
+        ).select_related("recipe__user")[: data["limit"]]
+        recipes = [popularity.recipe for popularity in popular]
+        return Response(
+            RecipeSerializers(recipes, many=True, context={"request": request}).data
+        )
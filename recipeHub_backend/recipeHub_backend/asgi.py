@@ -2,18 +2,24 @@ import os
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'recipeHub_backend.settings')
 from django.core.asgi import get_asgi_application
 
+# Set up Django before importing consumers, which import models
+django_asgi_app = get_asgi_application()
+
 from channels.routing import ProtocolTypeRouter, URLRouter
 from chatAPI.routing import chatAPI_urlpatterns
 from comments.routing import comments_urlpatterns
 from channels.auth import AuthMiddlewareStack
+from recipeHub_backend.middleware import JWTAuthMiddleware
 
 websocket_urlpatterns = chatAPI_urlpatterns + comments_urlpatterns
 
 application = ProtocolTypeRouter({
-    "http": get_asgi_application(),
+    "http": django_asgi_app,
     "websocket": AuthMiddlewareStack(
-        URLRouter(
-            websocket_urlpatterns,
+        JWTAuthMiddleware(
+            URLRouter(
+                websocket_urlpatterns,
+            )
         )
     ),
 })
@@ -0,0 +1,22 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+
+class FieldFilter(BaseFilterBackend):
+    """
+    Exact-match filtering on the fields a view lists in `filter_fields`,
+    e.g. GET /api/comment/list/?recipe=3, so clients fetch the rows they need
+    instead of the whole table.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        filters = {
+            field: request.query_params[field]
+            for field in getattr(view, "filter_fields", ())
+            if request.query_params.get(field, "") != ""
+        }
+        try:
+            return queryset.filter(**filters)
+        except (ValueError, DjangoValidationError):
+            raise ValidationError({field: "Invalid value." for field in filters})
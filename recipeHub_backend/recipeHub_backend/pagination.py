@@ -0,0 +1,201 @@
+import base64
+import binascii
+import datetime
+import decimal
+import json
+import uuid
+from typing import Any, List, Optional, Sequence, Tuple
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+# (attribute, descending) pairs; the last one must be unique, e.g. the primary key
+Keys = Sequence[Tuple[str, bool]]
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, (uuid.UUID, decimal.Decimal)):
+        return str(value)
+    return value
+
+
+def encode_cursor(values: Sequence[Any], state: Optional[dict] = None) -> str:
+    """
+    Opaque, URL-safe cursor for the sort key values of a row. `state` holds
+    whatever else a view needs to continue the same ordering on later pages.
+    """
+    payload = json.dumps(
+        {"after": [_json_value(value) for value in values], **(state or {})}
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValidationError({"cursor": "Invalid cursor."})
+    if not isinstance(payload, dict) or not isinstance(payload.get("after"), list):
+        raise ValidationError({"cursor": "Invalid cursor."})
+    return payload
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """Sort key values of a cursor, raising ValidationError when malformed"""
+    values = _decode(cursor)["after"]
+    if len(values) != size:
+        raise ValidationError({"cursor": "Invalid cursor."})
+    return values
+
+
+def cursor_state(cursor: Optional[str]) -> dict:
+    """The state a cursor was encoded with, empty without a cursor"""
+    if not cursor:
+        return {}
+    state = _decode(cursor)
+    del state["after"]
+    return state
+
+
+def keyset_filter(keys: Keys, values: Sequence[Any]) -> Q:
+    """Rows sorting strictly after the row whose sort key values are given"""
+    condition = Q()
+    ties = Q()  # Equal on every key so far
+    for (field, descending), value in zip(keys, values):
+        lookup = "lt" if descending else "gt"
+        condition |= ties & Q(**{f"{field}__{lookup}": value})
+        ties &= Q(**{field: value})
+    return condition
+
+
+def keyset_page(
+    queryset,
+    keys: Keys,
+    cursor: Optional[str],
+    page_size: int,
+    state: Optional[dict] = None,
+) -> Tuple[list, Optional[str]]:
+    """
+    One page of a queryset ordered by keys, starting after the cursor.
+
+    Runs a single query for page_size + 1 rows: the extra row only tells
+    whether there is a next page. Returns (rows, next cursor or None).
+    """
+    queryset = queryset.order_by(
+        *[f"-{field}" if descending else field for field, descending in keys]
+    )
+    if cursor:
+        queryset = queryset.filter(
+            keyset_filter(keys, decode_cursor(cursor, len(keys)))
+        )
+
+    rows = list(queryset[: page_size + 1])
+    if len(rows) <= page_size:
+        return rows, None
+
+    rows = rows[:page_size]
+    return rows, encode_cursor([getattr(rows[-1], field) for field, _ in keys], state)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over the queryset's ordering, with the primary key
+    appended as a tie-breaker so cursors stay stable under inserts. Each page
+    is one range scan: no COUNT(*) and no OFFSET. Querysets without an
+    ordering are ordered by `ordering`.
+
+    Responses are {"next": <url or null>, "results": [...]}.
+    """
+
+    ordering = ("pk",)
+    page_size = 20
+    max_page_size = 100
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+
+    def get_keys(self, queryset) -> List[Tuple[str, bool]]:
+        ordering = (
+            queryset.query.order_by or queryset.model._meta.ordering or self.ordering
+        )
+        keys = []
+        for field in ordering:
+            if not isinstance(field, str) or "__" in field or field == "?":
+                raise ImproperlyConfigured(
+                    f"Keyset pagination cannot order by {field!r}, "
+                    "only by fields and annotations of the model"
+                )
+            keys.append((field.lstrip("-"), field.startswith("-")))
+
+        pk_name = queryset.model._meta.pk.name
+        if not any(field in ("pk", pk_name) for field, _ in keys):
+            keys.append(("pk", keys[-1][1] if keys else False))
+        return keys
+
+    def get_page_size(self, request) -> int:
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        rows, self.next_cursor = keyset_page(
+            queryset,
+            self.get_keys(queryset),
+            request.query_params.get(self.cursor_query_param),
+            self.get_page_size(request),
+        )
+        return rows
+
+    def get_next_link(self) -> Optional[str]:
+        if self.next_cursor is None:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.next_cursor,
+        )
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class LinkHeaderKeysetPagination(KeysetPagination):
+    """
+    KeysetPagination for endpoints whose clients expect a plain JSON array:
+    the body stays the list of results and the next page is announced in a
+    `Link: <url>; rel="next"` header. Every list is paginated, newest first
+    unless the queryset is ordered, so no request reads a whole table.
+    """
+
+    ordering = ("-pk",)
+    page_size = 100
+    max_page_size = 500
+
+    def get_paginated_response(self, data):
+        headers = {}
+        next_link = self.get_next_link()
+        if next_link:
+            headers["Link"] = f'<{next_link}>; rel="next"'
+        return Response(data, headers=headers)
+
+    def get_paginated_response_schema(self, schema):
+        return schema
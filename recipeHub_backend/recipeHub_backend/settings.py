@@ -17,6 +17,8 @@ DEBUG = True
 
 ALLOWED_HOSTS = ["*"]
 CORS_ORIGIN_ALLOW_ALL = True
+# List endpoints announce their next page in a Link header (see pagination.py)
+CORS_EXPOSE_HEADERS = ["Link"]
 CSRF_TRUSTED_ORIGINS = [
     "http://127.0.0.1:8000",
     "https://recipehub-backend-ya12.onrender.com",
@@ -55,6 +57,8 @@ INSTALLED_APPS = [
     "chatAPI",
     "masterChef",
     "food_map",
+    "semantic_search",
+    "recommendations",
     "corsheaders",
 ]
 
@@ -221,3 +225,135 @@ CHANNEL_LAYERS = {
 # Google Maps API Configuration
 GOOGLE_MAPS_API_KEY = config("GOOGLE_MAPS_API_KEY")
 GOOGLE_PLACES_API_KEY = config("GOOGLE_PLACES_API_KEY")
+
+# Caches
+# Geocoding results are kept on disk so they survive restarts and are shared
+# between workers on the same host. State all workers must agree on, such as
+# cached taste vectors and their invalidation, lives in Redis ("shared").
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "shared": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": config(
+            "SHARED_CACHE_URL",
+            default=f"redis://{os.environ.get('REDIS_HOST', '127.0.0.1')}:6379/1",
+        ),
+        "KEY_PREFIX": "recipehub",
+    },
+    "geocoding": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": BASE_DIR / ".cache" / "geocoding",
+        "TIMEOUT": 60 * 60 * 24 * 7,
+        "OPTIONS": {"MAX_ENTRIES": 100000},
+    },
+}
+
+# Reverse geocoding cache: coordinates are rounded to this many decimal places
+# (4 ~ 11m) before lookup; entries live GEOCODE_CACHE_TIMEOUT seconds and the
+# in-process LRU holds at most GEOCODE_CACHE_MAX_ENTRIES of them.
+GEOCODE_CACHE_PRECISION = config("GEOCODE_CACHE_PRECISION", default=4, cast=int)
+GEOCODE_CACHE_TIMEOUT = config(
+    "GEOCODE_CACHE_TIMEOUT", default=60 * 60 * 24 * 7, cast=int
+)
+GEOCODE_CACHE_MAX_ENTRIES = config("GEOCODE_CACHE_MAX_ENTRIES", default=10000, cast=int)
+
+# Overpass (OpenStreetMap) results are cached per slippy-map tile at this zoom
+# level and refetched once older than OVERPASS_TILE_MAX_AGE seconds.
+OVERPASS_TILE_ZOOM = config("OVERPASS_TILE_ZOOM", default=15, cast=int)
+OVERPASS_TILE_MAX_AGE = config("OVERPASS_TILE_MAX_AGE", default=60 * 60 * 24, cast=int)
+OVERPASS_TILE_CACHE_MAX_ENTRIES = config(
+    "OVERPASS_TILE_CACHE_MAX_ENTRIES", default=5000, cast=int
+)
+
+# Location context lookups run concurrently; each side is given this many
+# seconds before the response is sent without it.
+LOCATION_CONTEXT_WORKERS = config("LOCATION_CONTEXT_WORKERS", default=8, cast=int)
+GEOCODE_DEADLINE = config("GEOCODE_DEADLINE", default=3.0, cast=float)
+NEARBY_PLACES_DEADLINE = config("NEARBY_PLACES_DEADLINE", default=3.0, cast=float)
+LOCATION_CONTEXT_MAX_AGE = config("LOCATION_CONTEXT_MAX_AGE", default=300, cast=int)
+
+# Outgoing HTTP calls to map services (Google Maps, Nominatim, Overpass) share
+# pooled keep-alive sessions, retry 429/5xx with backoff and stop calling a
+# service for EXTERNAL_HTTP_RESET_TIMEOUT seconds after repeated failures.
+EXTERNAL_HTTP_POOL_SIZE = config("EXTERNAL_HTTP_POOL_SIZE", default=10, cast=int)
+EXTERNAL_HTTP_RETRIES = config("EXTERNAL_HTTP_RETRIES", default=2, cast=int)
+EXTERNAL_HTTP_FAILURE_THRESHOLD = config(
+    "EXTERNAL_HTTP_FAILURE_THRESHOLD", default=5, cast=int
+)
+EXTERNAL_HTTP_RESET_TIMEOUT = config(
+    "EXTERNAL_HTTP_RESET_TIMEOUT", default=30.0, cast=float
+)
+
+# Semantic search: recipes and food items are embedded with this
+# sentence-transformers model into float32 matrices under
+# SEMANTIC_SEARCH_INDEX_DIR, encoded SEMANTIC_SEARCH_BATCH_SIZE rows at a time.
+# Saves that change an embedded field are re-embedded in the background unless
+# SEMANTIC_SEARCH_SYNC is off.
+SEMANTIC_SEARCH_MODEL = config(
+    "SEMANTIC_SEARCH_MODEL", default="sentence-transformers/all-MiniLM-L6-v2"
+)
+SEMANTIC_SEARCH_INDEX_DIR = config(
+    "SEMANTIC_SEARCH_INDEX_DIR", default=str(BASE_DIR / "var" / "embeddings")
+)
+SEMANTIC_SEARCH_BATCH_SIZE = config("SEMANTIC_SEARCH_BATCH_SIZE", default=64, cast=int)
+SEMANTIC_SEARCH_SYNC = config("SEMANTIC_SEARCH_SYNC", default=True, cast=bool)
+
+# Nearest-neighbour index used by semantic search: "exact" scans every row,
+# "ivf" only scans the SEMANTIC_SEARCH_IVF_PROBES closest of
+# SEMANTIC_SEARCH_IVF_LISTS clusters (0 picks about 4 * sqrt(rows)).
+SEMANTIC_SEARCH_INDEX = config("SEMANTIC_SEARCH_INDEX", default="exact")
+SEMANTIC_SEARCH_IVF_LISTS = config("SEMANTIC_SEARCH_IVF_LISTS", default=0, cast=int)
+SEMANTIC_SEARCH_IVF_PROBES = config("SEMANTIC_SEARCH_IVF_PROBES", default=8, cast=int)
+
+# Recommendations: neighbours kept per recipe / food item, and how many of a
+# user's latest interactions per source seed their recommendations.
+RECOMMENDATION_NEIGHBOURS = config("RECOMMENDATION_NEIGHBOURS", default=20, cast=int)
+RECOMMENDATION_SEED_ITEMS = config("RECOMMENDATION_SEED_ITEMS", default=50, cast=int)
+
+# Personalized ranking: a food item fully matching a user's taste profile
+# ranks (1 + TASTE_PROFILE_WEIGHT) times higher; older interests decay by
+# TASTE_PROFILE_DECAY with every new interaction.
+TASTE_PROFILE_WEIGHT = config("TASTE_PROFILE_WEIGHT", default=0.5, cast=float)
+TASTE_PROFILE_DECAY = config("TASTE_PROFILE_DECAY", default=0.95, cast=float)
+TASTE_PROFILE_CACHE_TIMEOUT = config(
+    "TASTE_PROFILE_CACHE_TIMEOUT", default=60 * 60, cast=int
+)
+
+# Search history is buffered in memory and bulk written by a background thread
+# once SEARCH_HISTORY_BUFFER_SIZE rows are waiting or the oldest has waited
+# SEARCH_HISTORY_FLUSH_INTERVAL seconds; a size of 1 writes synchronously.
+SEARCH_HISTORY_BUFFER_SIZE = config("SEARCH_HISTORY_BUFFER_SIZE", default=100, cast=int)
+SEARCH_HISTORY_FLUSH_INTERVAL = config(
+    "SEARCH_HISTORY_FLUSH_INTERVAL", default=5.0, cast=float
+)
+
+# Chat messages received over WebSockets are broadcast immediately and written
+# with one bulk insert once CHAT_MESSAGE_BUFFER_SIZE are waiting or
+# CHAT_MESSAGE_FLUSH_INTERVAL seconds after the first one.
+CHAT_MESSAGE_BUFFER_SIZE = config("CHAT_MESSAGE_BUFFER_SIZE", default=100, cast=int)
+CHAT_MESSAGE_FLUSH_INTERVAL = config(
+    "CHAT_MESSAGE_FLUSH_INTERVAL", default=1.0, cast=float
+)
+
+# Chat room presence is kept in the channel layer's Redis. Every worker
+# refreshes its connections every CHAT_PRESENCE_TTL / 3 seconds, connections of
+# a crashed worker expire after CHAT_PRESENCE_TTL. Count changes are broadcast
+# to a room at most once per CHAT_PRESENCE_BROADCAST_DELAY seconds.
+CHAT_PRESENCE_TTL = config("CHAT_PRESENCE_TTL", default=60, cast=int)
+CHAT_PRESENCE_BROADCAST_DELAY = config(
+    "CHAT_PRESENCE_BROADCAST_DELAY", default=1.0, cast=float
+)
+
+# Trending recipes: every reaction and comment adds its weight to a recipe's
+# popularity, and every contribution (including the recipe's own, at creation)
+# halves every POPULARITY_HALF_LIFE_HOURS hours. All four must be positive.
+POPULARITY_HALF_LIFE_HOURS = config(
+    "POPULARITY_HALF_LIFE_HOURS", default=24.0, cast=float
+)
+POPULARITY_RECIPE_WEIGHT = config("POPULARITY_RECIPE_WEIGHT", default=1.0, cast=float)
+POPULARITY_REACTION_WEIGHT = config(
+    "POPULARITY_REACTION_WEIGHT", default=1.0, cast=float
+)
+POPULARITY_COMMENT_WEIGHT = config("POPULARITY_COMMENT_WEIGHT", default=2.0, cast=float)
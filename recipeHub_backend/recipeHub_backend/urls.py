@@ -21,6 +21,8 @@ urlpatterns = [
     path("api/subscription/", include("subscription.urls")),
     path("api/ai/", include("masterChef.urls")),
     path("api/food-map/", include("food_map.urls")),
+    path("api/semantic/", include("semantic_search.urls")),
+    path("api/recommendations/", include("recommendations.urls")),
 ]
 
 urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,15 @@
+from django.contrib import admin
+
+from .models import InteractionWatermark, ItemNeighbours
+
+
+@admin.register(ItemNeighbours)
+class ItemNeighboursAdmin(admin.ModelAdmin):
+    list_display = ["kind", "item_id", "audience", "updated_at"]
+    list_filter = ["kind"]
+    search_fields = ["item_id"]
+
+
+@admin.register(InteractionWatermark)
+class InteractionWatermarkAdmin(admin.ModelAdmin):
+    list_display = ["source", "position", "last_id", "updated_at"]
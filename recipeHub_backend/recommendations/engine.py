@@ -0,0 +1,335 @@
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Set, Tuple
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from scipy import sparse
+
+from comments.models import Comment, Reaction
+from food_map.models import UserFavoriteFoodItem
+
+from .models import InteractionWatermark, ItemNeighbours
+
+logger = logging.getLogger(__name__)
+
+ITEM_CHUNK_SIZE = 1000  # Similarity rows computed per sparse product
+IN_QUERY_CHUNK_SIZE = 500  # Ids per `__in` lookup
+
+Pair = Tuple[int, str]  # (user id, item id)
+
+
+@dataclass(frozen=True)
+class InteractionSource:
+    """A table of (user, item) interactions, read forward along `cursor_field`"""
+
+    name: str
+    queryset: Callable
+    item_field: str
+    cursor_field: str
+
+    def rows(self):
+        return self.queryset().filter(
+            user__isnull=False, **{f"{self.item_field}__isnull": False}
+        )
+
+    def pairs(self, **filters) -> Set[Pair]:
+        return {
+            (user, str(item))
+            for user, item in self.rows()
+            .filter(**filters)
+            .values_list("user_id", self.item_field)
+        }
+
+
+# Any reaction, comment or favorite counts as one implicit "like"
+SOURCES = {
+    "recipe": [
+        # Read along `updated`, a reaction liked again keeps its id. Named
+        # apart from the old id-based source so its watermark is not reused
+        InteractionSource(
+            "reaction_updated",
+            lambda: Reaction.objects.filter(react=True),
+            "recipe_id",
+            "updated",
+        ),
+        InteractionSource("comment", lambda: Comment.objects.all(), "recipe_id", "id"),
+    ],
+    "food": [
+        InteractionSource(
+            "favorite",
+            lambda: UserFavoriteFoodItem.objects.all(),
+            "food_item_id",
+            "created_at",
+        ),
+    ],
+}
+
+
+def _chunks(values: Iterable, size: int) -> Iterable[list]:
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+def interaction_pairs(kind: str, users=None, items=None) -> Set[Pair]:
+    """Distinct (user, item) pairs of a kind, optionally restricted to users or items"""
+    if users is not None:
+        field, values = "user_id", users
+    elif items is not None:
+        field, values = None, items
+    else:
+        return set().union(*(source.pairs() for source in SOURCES[kind]))
+
+    pairs = set()
+    for source in SOURCES[kind]:
+        for chunk in _chunks(values, IN_QUERY_CHUNK_SIZE):
+            pairs |= source.pairs(**{f"{field or source.item_field}__in": chunk})
+    return pairs
+
+
+def similar_items(
+    pairs: Set[Pair], items: Iterable[str], audience: Dict[str, int], k: int = None
+) -> Dict[str, List[list]]:
+    """
+    Top-k (all when k is None) cosine neighbours of each of `items` over
+    binary user-item pairs. `pairs` must hold every interaction of every
+    user of those items and `audience` the number of distinct users of each
+    item in the full history.
+    """
+    user_index = {}
+    item_index = {}
+    rows, cols = [], []
+    for user, item in pairs:
+        rows.append(user_index.setdefault(user, len(user_index)))
+        cols.append(item_index.setdefault(item, len(item_index)))
+    item_ids = list(item_index)
+    item_keys = np.array(item_ids)
+
+    # users x items, and its transpose for slicing rows of items
+    matrix = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+        shape=(len(user_index), len(item_ids)),
+    )
+    by_item = matrix.T.tocsr()
+    norms = np.sqrt(np.maximum([audience.get(item, 1) for item in item_ids], 1)).astype(
+        np.float32
+    )
+
+    neighbours = {item: [] for item in items}
+    targets = [item_index[item] for item in neighbours if item in item_index]
+    for chunk in _chunks(targets, ITEM_CHUNK_SIZE):
+        co_occurrence = (by_item[chunk] @ matrix).tocsr()
+        for row, target in enumerate(chunk):
+            start, end = co_occurrence.indptr[row], co_occurrence.indptr[row + 1]
+            others = co_occurrence.indices[start:end]
+            counts = co_occurrence.data[start:end]
+            keep = others != target
+            others, counts = others[keep], counts[keep]
+            if not len(others):
+                continue
+
+            # Best first, ties by item id so that every run orders them alike
+            scores = np.round(counts / (norms[target] * norms[others]), 4)
+            top = np.lexsort((item_keys[others], -scores))[:k]
+            neighbours[item_ids[target]] = [
+                [item_ids[others[i]], float(scores[i])] for i in top
+            ]
+    return neighbours
+
+
+def _position(value) -> str:
+    """Watermark text of a cursor value (id or timestamp)"""
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+def _save(
+    kind: str,
+    neighbours: Dict[str, List[list]],
+    audience: Dict[str, int],
+    marks: Dict,
+    full: bool,
+):
+    with transaction.atomic():
+        if full:
+            ItemNeighbours.objects.filter(kind=kind).delete()
+        else:
+            for chunk in _chunks(neighbours, IN_QUERY_CHUNK_SIZE):
+                ItemNeighbours.objects.filter(kind=kind, item_id__in=chunk).delete()
+        # Items without neighbours are kept too, for their audience
+        ItemNeighbours.objects.bulk_create(
+            [
+                ItemNeighbours(
+                    kind=kind,
+                    item_id=item,
+                    neighbours=items,
+                    audience=audience.get(item, 0),
+                )
+                for item, items in neighbours.items()
+            ],
+            batch_size=1000,
+        )
+        for source, (position, pk) in marks.items():
+            InteractionWatermark.objects.update_or_create(
+                source=source,
+                defaults={"position": _position(position), "last_id": str(pk)},
+            )
+
+
+def _latest_positions(kind: str) -> Dict:
+    """Current (cursor, pk) of every source of a kind, skipping empty tables"""
+    marks = {}
+    for source in SOURCES[kind]:
+        last = (
+            source.rows()
+            .filter(**{f"{source.cursor_field}__isnull": False})
+            .order_by(f"-{source.cursor_field}", "-pk")
+            .values_list(source.cursor_field, "pk")
+            .first()
+        )
+        if last is not None:
+            marks[source.name] = last
+    return marks
+
+
+def _new_interactions(kind: str) -> Tuple[Set[Pair], Dict]:
+    """
+    Pairs of the interactions after each source's watermark, and the new
+    watermarks. Interactions are read in (cursor, pk) order, so rows sharing
+    a timestamp with the watermark are not skipped.
+    """
+    watermarks = {
+        source: (position, last_id)
+        for source, position, last_id in InteractionWatermark.objects.filter(
+            source__in=[source.name for source in SOURCES[kind]]
+        ).values_list("source", "position", "last_id")
+    }
+
+    new_pairs = set()
+    marks = {}
+    for source in SOURCES[kind]:
+        rows = source.rows()
+        cursor = source.cursor_field
+        if source.name in watermarks:
+            position, last_id = watermarks[source.name]
+            if last_id:
+                rows = rows.filter(
+                    Q(**{f"{cursor}__gt": position})
+                    | Q(**{cursor: position, "pk__gt": last_id})
+                )
+            else:
+                # Written before ties were broken by pk: re-reading rows at
+                # the position is harmless, updates are recomputed from scratch
+                rows = rows.filter(**{f"{cursor}__gte": position})
+        for user, item, position, pk in rows.order_by(cursor, "pk").values_list(
+            "user_id", source.item_field, cursor, "pk"
+        ):
+            new_pairs.add((user, str(item)))
+            if position is not None:
+                marks[source.name] = (position, pk)
+    return new_pairs, marks
+
+
+def rebuild(kind: str) -> int:
+    """Recompute the neighbours of every item from the full history"""
+    k = settings.RECOMMENDATION_NEIGHBOURS
+    marks = _latest_positions(kind)
+    pairs = interaction_pairs(kind)
+    audience = Counter(item for _, item in pairs)
+    neighbours = similar_items(pairs, audience, audience, k)
+    _save(kind, neighbours, audience, marks, full=True)
+    return len(neighbours)
+
+
+def update(kind: str) -> int:
+    """
+    Fold interactions added since the last run into the neighbour lists.
+
+    A new interaction with item i changes i's audience and so its
+    similarity to every item j it shares a user with; no other pair of
+    items changes. Only i's row is recomputed, from the histories of i's own
+    users, and each such j's stored list is patched with its new score for
+    i. Other items' audiences come from their stored rows.
+
+    Removed interactions are not seen here, and a j whose list had cut an
+    item that would now make its top k only gets it back on the next full
+    rebuild.
+    """
+    k = settings.RECOMMENDATION_NEIGHBOURS
+    new_pairs, marks = _new_interactions(kind)
+    if not new_pairs:
+        return 0
+
+    touched = {item for _, item in new_pairs}
+    touched_pairs = interaction_pairs(kind, items=touched)
+    pairs = interaction_pairs(kind, users={user for user, _ in touched_pairs})
+
+    # Distinct users per item: counted for the touched items, stored for the
+    # rest (items never saved fall back to the users seen here)
+    audience = Counter(item for _, item in pairs)
+    for chunk in _chunks(set(audience) - touched, IN_QUERY_CHUNK_SIZE):
+        for item, stored in ItemNeighbours.objects.filter(
+            kind=kind, item_id__in=chunk, audience__gt=0
+        ).values_list("item_id", "audience"):
+            audience[item] = stored
+
+    rows = similar_items(pairs, touched, audience, None)
+    neighbours = {item: row[:k] for item, row in rows.items()}
+
+    # Patch the new scores for touched items into their neighbours' lists
+    patches = {}
+    for item, row in rows.items():
+        for other, score in row:
+            if other not in touched:
+                patches.setdefault(other, []).append([item, score])
+    for chunk in _chunks(patches, IN_QUERY_CHUNK_SIZE):
+        stored = dict(
+            ItemNeighbours.objects.filter(kind=kind, item_id__in=chunk).values_list(
+                "item_id", "neighbours"
+            )
+        )
+        for other in chunk:
+            kept = [pair for pair in stored.get(other, []) if pair[0] not in touched]
+            neighbours[other] = sorted(
+                kept + patches[other], key=lambda pair: (-pair[1], pair[0])
+            )[:k]
+
+    _save(kind, neighbours, audience, marks, full=False)
+    logger.info(
+        f"Updated {kind} neighbours of {len(rows)} items and patched "
+        f"{len(patches)} of their neighbours from {len(new_pairs)} new interactions"
+    )
+    return len(neighbours)
+
+
+def recommend(kind: str, user, limit: int) -> List[Tuple[str, float]]:
+    """
+    Items similar to what the user recently interacted with, best first.
+    Neighbour lists of the seed items come from one indexed lookup.
+    """
+    seeds = []
+    for source in SOURCES[kind]:
+        seeds += [
+            str(item)
+            for item in source.rows()
+            .filter(user=user)
+            .order_by(f"-{source.cursor_field}")
+            .values_list(source.item_field, flat=True)[
+                : settings.RECOMMENDATION_SEED_ITEMS
+            ]
+        ]
+    if not seeds:
+        return []
+
+    seen = set(seeds)
+    scores = Counter()
+    for neighbours in ItemNeighbours.objects.filter(
+        kind=kind, item_id__in=seen
+    ).values_list("neighbours", flat=True):
+        for item, score in neighbours:
+            if item not in seen:
+                scores[item] += score
+    return [(item, round(score, 4)) for item, score in scores.most_common(limit)]
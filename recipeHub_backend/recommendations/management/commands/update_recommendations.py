@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from recommendations import engine
+
+
+class Command(BaseCommand):
+    help = "Fold new reactions, comments and favorites into the item neighbour lists"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--type",
+            choices=[*engine.SOURCES, "all"],
+            default="all",
+            help="Which kind of item to update (default: all)",
+        )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Recompute from the full history, also dropping removed interactions",
+        )
+
+    def handle(self, *args, **options):
+        kinds = list(engine.SOURCES) if options["type"] == "all" else [options["type"]]
+        for kind in kinds:
+            if options["full"]:
+                count = engine.rebuild(kind)
+            else:
+                count = engine.update(kind)
+            self.stdout.write(
+                self.style.SUCCESS(f"Updated neighbours of {count} {kind} items")
+            )
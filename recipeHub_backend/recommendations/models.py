@@ -0,0 +1,38 @@
+from django.db import models
+
+KIND_CHOICES = [
+    ("recipe", "Recipe"),
+    ("food", "Food Item"),
+]
+
+
+class ItemNeighbours(models.Model):
+    """Precomputed most similar items of one recipe or food item"""
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    item_id = models.CharField(max_length=36)
+    # [[item_id, cosine similarity], ...], most similar first
+    neighbours = models.JSONField(default=list)
+    # Distinct users of the item, the norm of its similarity scores
+    audience = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ["kind", "item_id"]
+        verbose_name_plural = "Item neighbours"
+
+    def __str__(self):
+        return f"{self.kind} {self.item_id}: {len(self.neighbours)} neighbours"
+
+
+class InteractionWatermark(models.Model):
+    """Last interaction of a source already folded into the neighbour lists"""
+
+    source = models.CharField(max_length=50, unique=True)
+    position = models.CharField(max_length=64)
+    # Primary key of that interaction, orders interactions at the same position
+    last_id = models.CharField(max_length=36, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.source} @ {self.position} #{self.last_id}"
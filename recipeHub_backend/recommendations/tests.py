@@ -0,0 +1,83 @@
+from django.test import TestCase, override_settings
+
+from comments.models import Comment, Reaction
+from kitchen.models import Recipe
+from user.models import CustomUser
+
+from . import engine
+from .models import ItemNeighbours
+
+
+@override_settings(RECOMMENDATION_NEIGHBOURS=50)
+class IncrementalUpdateTests(TestCase):
+    def setUp(self):
+        self.users = [
+            CustomUser.objects.create_user(f"user{i}@example.com", f"user{i}", "pw")
+            for i in range(5)
+        ]
+        self.recipes = [
+            Recipe.objects.create(
+                user=self.users[0],
+                title=f"Recipe {i}",
+                ingredients="Rice",
+                flavour="Savory",
+                region="Dhaka",
+            )
+            for i in range(6)
+        ]
+
+    def react(self, user, recipe, react=True):
+        return Reaction.objects.create(
+            user=self.users[user], recipe=self.recipes[recipe], react=react
+        )
+
+    def comment(self, user, recipe):
+        return Comment.objects.create(
+            user=self.users[user], recipe=self.recipes[recipe], comment_text="Yum"
+        )
+
+    def stored(self):
+        return {
+            item_id: (audience, [[other, round(score, 6)] for other, score in row])
+            for item_id, audience, row in ItemNeighbours.objects.filter(
+                kind="recipe"
+            ).values_list("item_id", "audience", "neighbours")
+            if row
+        }
+
+    def assertUpdateMatchesRebuild(self):
+        engine.update("recipe")
+        updated = self.stored()
+        engine.rebuild("recipe")
+        self.assertEqual(updated, self.stored())
+
+    def test_new_interactions(self):
+        self.react(0, 0)
+        self.react(1, 0)
+        self.react(1, 1)
+        self.comment(2, 1)
+        engine.rebuild("recipe")
+
+        self.react(2, 2)
+        self.react(3, 2)
+        self.comment(3, 0)
+        self.react(4, 1)
+        self.assertUpdateMatchesRebuild()
+
+    def test_reaction_liked_again(self):
+        unliked = self.react(1, 0, react=False)
+        self.react(0, 0)
+        self.react(0, 1)
+        self.react(1, 1)
+        engine.rebuild("recipe")
+
+        # Same row, same id, liked again after the watermark
+        unliked.react = True
+        unliked.save()
+        self.assertUpdateMatchesRebuild()
+
+    def test_nothing_new(self):
+        self.react(0, 0)
+        self.react(1, 0)
+        engine.rebuild("recipe")
+        self.assertEqual(engine.update("recipe"), 0)
@@ -0,0 +1,62 @@
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from food_map.models import FoodItem
+from food_map.serializers import FoodItemListSerializer
+from kitchen.models import Recipe
+from kitchen.serializers import RecipeSerializers
+
+from .engine import SOURCES, recommend
+
+MAX_RESULTS = 50
+
+
+class RecommendationsView(APIView):
+    """
+    Recipes or food items similar to the ones the user reacted to,
+    commented on or favorited.
+    GET ?type=recipe|food&limit=<n>
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        kind = request.query_params.get("type", "recipe")
+        if kind not in SOURCES:
+            return Response(
+                {"error": f"type must be one of: {', '.join(SOURCES)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            limit = min(max(int(request.query_params.get("limit", 20)), 1), MAX_RESULTS)
+        except ValueError:
+            return Response(
+                {"error": "limit must be an integer"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        matches = recommend(kind, request.user, limit)
+
+        if kind == "recipe":
+            queryset = Recipe.objects.select_related("user")
+            serializer_class = RecipeSerializers
+        else:
+            queryset = FoodItem.objects.filter(is_active=True).for_list(request.user)
+            serializer_class = FoodItemListSerializer
+        objects = {
+            str(obj.pk): obj
+            for obj in queryset.filter(pk__in=[item for item, _ in matches])
+        }
+
+        results = [
+            {
+                "score": score,
+                "item": serializer_class(
+                    objects[item], context={"request": request}
+                ).data,
+            }
+            for item, score in matches
+            if item in objects
+        ]
+        return Response({"type": kind, "results": results})
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class SemanticSearchConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'semantic_search'
+
+    def ready(self):
+        from . import signals  # noqa: F401
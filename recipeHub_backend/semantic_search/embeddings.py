@@ -0,0 +1,445 @@
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+from filelock import FileLock
+
+from food_map.models import FoodItem
+from kitchen.models import Recipe
+
+logger = logging.getLogger(__name__)
+
+KEY_DTYPE = np.dtype("<U36")  # Fits integer primary keys and UUIDs
+MIN_CAPACITY = 1024  # Rows allocated up front so single inserts rarely grow the file
+
+
+class SemanticSearchUnavailable(Exception):
+    """Raised when the sentence-transformers model or the index cannot be used"""
+
+    pass
+
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def get_model():
+    """Load the sentence-transformers model once per process, on first use"""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                try:
+                    from sentence_transformers import SentenceTransformer
+                except ImportError as e:
+                    raise SemanticSearchUnavailable(
+                        "sentence-transformers is not installed"
+                    ) from e
+                try:
+                    _model = SentenceTransformer(
+                        settings.SEMANTIC_SEARCH_MODEL, device="cpu"
+                    )
+                except Exception as e:
+                    # Missing or corrupt weights, no network to download them,
+                    # an unknown model name
+                    raise SemanticSearchUnavailable(
+                        f"Could not load {settings.SEMANTIC_SEARCH_MODEL}: {e}"
+                    ) from e
+    return _model
+
+
+def embedding_dimension() -> int:
+    return get_model().get_sentence_embedding_dimension()
+
+
+def encode(texts: List[str], batch_size: int = None) -> np.ndarray:
+    """Embed texts as unit-length float32 rows, so a dot product is the cosine"""
+    vectors = get_model().encode(
+        list(texts),
+        batch_size=batch_size or settings.SEMANTIC_SEARCH_BATCH_SIZE,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+        show_progress_bar=False,
+    )
+    return np.ascontiguousarray(vectors, dtype=np.float32)
+
+
+def recipe_text(recipe) -> str:
+    return ". ".join(
+        part
+        for part in (recipe.title, recipe.ingredients, recipe.flavour, recipe.region)
+        if part
+    )
+
+
+def food_item_text(food_item) -> str:
+    return ". ".join(
+        part
+        for part in (
+            food_item.name,
+            food_item.category.name if food_item.category_id else "",
+            food_item.get_food_type_display(),
+            food_item.description,
+            food_item.ingredients,
+        )
+        if part
+    )
+
+
+@dataclass(frozen=True)
+class Source:
+    """A model whose rows are embedded into one store"""
+
+    name: str
+    queryset: Callable
+    text: Callable
+    fields: Tuple[str, ...]  # Columns the text or the queryset's filter read
+
+
+SOURCES = {
+    "recipe": Source(
+        name="recipes",
+        queryset=lambda: Recipe.objects.all(),
+        text=recipe_text,
+        fields=("title", "ingredients", "flavour", "region"),
+    ),
+    "food": Source(
+        name="food_items",
+        queryset=lambda: FoodItem.objects.filter(is_active=True).select_related(
+            "category"
+        ),
+        text=food_item_text,
+        fields=(
+            "name",
+            "category_id",
+            "food_type",
+            "description",
+            "ingredients",
+            "is_active",
+        ),
+    ),
+}
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Positions of the k highest finite scores, best first"""
+    k = min(k, int(np.isfinite(scores).sum()))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+def _capacity_for(rows: int) -> int:
+    return max(MIN_CAPACITY, rows + rows // 4)
+
+
+class EmbeddingStore:
+    """
+    Embeddings of one source as a memory-mapped float32 matrix on disk.
+
+    `<name>.npy` holds one unit-length row per object and `<name>.keys.npy`
+    the primary key stored in that row. Rows with an empty key are free:
+    deletes blank the key and zero the row, inserts reuse free rows in place
+    and the files are only rewritten when they run out of rows. Writers from
+    any process serialize on a file lock; readers notice writes from other
+    processes through the keys file's modification time.
+
+    `<name>.stamps.npy` numbers every write: each upsert stamps its row with
+    a counter one above the highest stamp so far, so indexes built over the
+    store can find the rows written after they were built.
+    """
+
+    def __init__(self, name: str, directory=None):
+        self.name = name
+        self.directory = Path(directory or settings.SEMANTIC_SEARCH_INDEX_DIR)
+        self.vectors_path = self.directory / f"{name}.npy"
+        self.keys_path = self.directory / f"{name}.keys.npy"
+        self.stamps_path = self.directory / f"{name}.stamps.npy"
+        self._lock = threading.RLock()
+        self._version = None
+        self._vectors = None
+        self._keys = None
+        self._stamps = None
+        self._stamp = 0
+        self._rows = {}
+        self._free = []
+
+    def _file_lock(self) -> FileLock:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        return FileLock(str(self.directory / f"{self.name}.lock"))
+
+    def _load(self) -> None:
+        """(Re)map the files if they changed since the last load (lock held)"""
+        try:
+            version = os.stat(self.keys_path).st_mtime_ns
+        except FileNotFoundError:
+            self._version = self._vectors = self._keys = self._stamps = None
+            self._stamp = 0
+            self._rows, self._free = {}, []
+            return
+        if version == self._version:
+            return
+
+        vectors = np.load(self.vectors_path, mmap_mode="r")
+        keys = np.load(self.keys_path, mmap_mode="r")
+        try:
+            stamps = np.load(self.stamps_path, mmap_mode="r")
+        except FileNotFoundError:
+            stamps = None  # Written before stamps existed, created on first upsert
+        if len(vectors) != len(keys) or (
+            stamps is not None and len(stamps) != len(keys)
+        ):
+            return  # Caught between the renames of a rebuild, keep the old map
+
+        self._vectors, self._keys, self._version = vectors, keys, version
+        self._stamps = stamps
+        self._stamp = int(stamps.max()) if stamps is not None and len(stamps) else 0
+        self._rows = {}
+        self._free = []
+        for row, key in enumerate(keys.tolist()):
+            if key:
+                self._rows[key] = row
+            else:
+                self._free.append(row)
+        self._free.reverse()  # pop() hands out the lowest free row first
+
+    def _touch(self) -> None:
+        """Bump the version other processes compare against"""
+        os.utime(self.keys_path)
+        self._version = os.stat(self.keys_path).st_mtime_ns
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._load()
+            return len(self._rows)
+
+    @property
+    def version(self) -> Optional[int]:
+        """Changes whenever any process writes to the store"""
+        with self._lock:
+            self._load()
+            return self._version
+
+    @property
+    def dimension(self) -> Optional[int]:
+        with self._lock:
+            self._load()
+            return None if self._vectors is None else self._vectors.shape[1]
+
+    @property
+    def stamp(self) -> int:
+        """Stamp of the latest write, rows written later get higher stamps"""
+        with self._lock:
+            self._load()
+            return self._stamp
+
+    def snapshot(self) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """The current (vectors, keys) maps, for read-only scans"""
+        with self._lock:
+            self._load()
+            return self._vectors, self._keys
+
+    def rows_written_after(self, stamp: int) -> np.ndarray:
+        """Stored rows whose latest write is stamped after `stamp`"""
+        with self._lock:
+            self._load()
+            if self._keys is None:
+                return np.empty(0, dtype=np.intp)
+            if self._stamps is None:
+                stamps = np.zeros(len(self._keys), dtype=np.int64)
+            else:
+                stamps = self._stamps
+            return np.flatnonzero((stamps > stamp) & (self._keys != ""))
+
+    def upsert(self, key, vector: np.ndarray) -> None:
+        """Write one object's embedding, overwriting its row if it has one"""
+        key = str(key)
+        vector = np.asarray(vector, dtype=np.float32)
+        with self._lock, self._file_lock():
+            self._load()
+            if self._vectors is None or (key not in self._rows and not self._free):
+                self._grow(len(vector))
+            elif self._stamps is None:
+                self._add_stamps()
+
+            vectors = np.load(self.vectors_path, mmap_mode="r+")
+            keys = np.load(self.keys_path, mmap_mode="r+")
+            stamps = np.load(self.stamps_path, mmap_mode="r+")
+            row = self._rows.get(key)
+            if row is None:
+                row = self._free.pop()
+                keys[row] = key
+                self._rows[key] = row
+            vectors[row] = vector
+            self._stamp += 1
+            stamps[row] = self._stamp
+            vectors.flush()
+            stamps.flush()
+            keys.flush()
+            del vectors, keys, stamps
+            self._touch()
+
+    def delete(self, key) -> None:
+        """Free an object's row, a no-op when it is not stored"""
+        key = str(key)
+        with self._lock, self._file_lock():
+            self._load()
+            row = self._rows.pop(key, None)
+            if row is None:
+                return
+
+            vectors = np.load(self.vectors_path, mmap_mode="r+")
+            keys = np.load(self.keys_path, mmap_mode="r+")
+            vectors[row] = 0
+            keys[row] = ""
+            vectors.flush()
+            keys.flush()
+            del vectors, keys
+            self._free.append(row)
+            self._touch()
+
+    def _grow(self, dimension: int) -> None:
+        """Rewrite the files with room for more rows (both locks held)"""
+        used = 0 if self._vectors is None else len(self._vectors)
+        capacity = _capacity_for(max(used * 2, 1))
+
+        def copy_rows(vectors, keys, stamps):
+            if used:
+                vectors[:used] = self._vectors
+                keys[:used] = self._keys
+                if self._stamps is not None:
+                    stamps[:used] = self._stamps
+
+        self._write(capacity, dimension, copy_rows)
+        self._version = None
+        self._load()
+
+    def _add_stamps(self) -> None:
+        """Create the stamps of a store written before they existed (locks held)"""
+        tmp_path = self.directory / f"{self.name}.stamps.tmp.npy"
+        np.save(tmp_path, np.zeros(len(self._keys), dtype=np.int64))
+        os.replace(tmp_path, self.stamps_path)
+        self._version = None
+        self._load()
+
+    def _write(self, capacity: int, dimension: int, fill) -> None:
+        """Build new files next to the old ones, then swap them in atomically"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        vectors_tmp = self.directory / f"{self.name}.tmp.npy"
+        keys_tmp = self.directory / f"{self.name}.keys.tmp.npy"
+        stamps_tmp = self.directory / f"{self.name}.stamps.tmp.npy"
+
+        vectors = np.lib.format.open_memmap(
+            vectors_tmp, mode="w+", dtype=np.float32, shape=(capacity, dimension)
+        )
+        keys = np.lib.format.open_memmap(
+            keys_tmp, mode="w+", dtype=KEY_DTYPE, shape=(capacity,)
+        )
+        stamps = np.lib.format.open_memmap(
+            stamps_tmp, mode="w+", dtype=np.int64, shape=(capacity,)
+        )
+        fill(vectors, keys, stamps)
+        vectors.flush()
+        keys.flush()
+        stamps.flush()
+        del vectors, keys, stamps
+
+        # Keys last: readers reload when the keys file changes
+        os.replace(vectors_tmp, self.vectors_path)
+        os.replace(stamps_tmp, self.stamps_path)
+        os.replace(keys_tmp, self.keys_path)
+
+    def rebuild(
+        self,
+        batches: Iterable[Tuple[List[str], np.ndarray]],
+        rows: int,
+        dimension: int,
+    ) -> int:
+        """
+        Replace the store with freshly encoded rows.
+        `batches` yields (keys, vectors) pairs for about `rows` objects;
+        vectors are streamed to disk so the matrix never sits in memory.
+        Every row is stamped as a new write, indexes over the old rows no
+        longer apply to any of them.
+        """
+        written = 0
+        stamp = self.stamp + 1
+
+        def fill(vectors, keys, stamps):
+            nonlocal written
+            capacity = len(keys)
+            for batch_keys, batch_vectors in batches:
+                count = min(len(batch_keys), capacity - written)
+                if count <= 0:
+                    logger.warning(
+                        f"Embedding store {self.name} is full, rows added during "
+                        "the rebuild are left to incremental updates"
+                    )
+                    break
+                vectors[written : written + count] = batch_vectors[:count]
+                keys[written : written + count] = batch_keys[:count]
+                stamps[written : written + count] = stamp
+                written += count
+
+        with self._lock, self._file_lock():
+            self._write(_capacity_for(rows), dimension, fill)
+            self._version = None
+            self._load()
+        return written
+
+    def search(self, vector: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        """Top-k (key, cosine similarity) pairs for a unit-length query vector"""
+        vectors, keys = self.snapshot()
+        if vectors is None or k <= 0:
+            return []
+
+        scores = vectors @ np.asarray(vector, dtype=np.float32)
+        scores[keys == ""] = -np.inf
+        return [(str(keys[row]), float(scores[row])) for row in top_k(scores, k)]
+
+
+_stores: Dict[str, EmbeddingStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(kind: str) -> EmbeddingStore:
+    """The per-process store of a source kind ("recipe" or "food")"""
+    with _stores_lock:
+        if kind not in _stores:
+            _stores[kind] = EmbeddingStore(SOURCES[kind].name)
+        return _stores[kind]
+
+
+def sync_objects(kind: str, pks: Iterable) -> None:
+    """Re-embed objects from their current rows in one batch, dropping the gone ones"""
+    source = SOURCES[kind]
+    keys = [str(pk) for pk in pks]
+    instances = {str(obj.pk): obj for obj in source.queryset().filter(pk__in=keys)}
+    store = get_store(kind)
+    for key in keys:
+        if key not in instances:
+            store.delete(key)
+    if instances:
+        vectors = encode([source.text(obj) for obj in instances.values()])
+        for key, vector in zip(instances, vectors):
+            store.upsert(key, vector)
+
+
+def iter_batches(kind: str, batch_size: int):
+    """Yield (keys, vectors) for every row of a source, encoded batch_size at a time"""
+    source = SOURCES[kind]
+    keys, texts = [], []
+    for instance in source.queryset().iterator(chunk_size=batch_size):
+        keys.append(str(instance.pk))
+        texts.append(source.text(instance))
+        if len(keys) == batch_size:
+            yield keys, encode(texts, batch_size)
+            keys, texts = [], []
+    if keys:
+        yield keys, encode(texts, batch_size)
@@ -0,0 +1,223 @@
+import logging
+import math
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+from scipy import sparse
+
+from .embeddings import EmbeddingStore, SemanticSearchUnavailable, get_store, top_k
+
+logger = logging.getLogger(__name__)
+
+KMEANS_ITERATIONS = 20
+KMEANS_SAMPLE_PER_LIST = 64  # Training rows per centroid
+ASSIGN_CHUNK_ROWS = 8192  # Rows scored against the centroids at a time
+
+
+class VectorIndex:
+    """Nearest-neighbour lookup over the rows of an EmbeddingStore"""
+
+    name = None
+
+    def __init__(self, store: EmbeddingStore):
+        self.store = store
+
+    def search(self, vector: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        """Top-k (key, cosine similarity) pairs for a unit-length query vector"""
+        raise NotImplementedError
+
+    def build(self) -> None:
+        """Rebuild any structure kept alongside the store"""
+        pass
+
+
+class ExactIndex(VectorIndex):
+    """Brute-force scan of every row, the reference for recall"""
+
+    name = "exact"
+
+    def search(self, vector, k):
+        return self.store.search(vector, k)
+
+
+class IVFIndex(VectorIndex):
+    """
+    Inverted file index: rows are clustered around `n_lists` spherical k-means
+    centroids and a query only scans the rows of its `n_probe` closest lists.
+
+    The centroids, the row numbers grouped by list and the list offsets are
+    plain .npy files next to the store, memory-mapped on load, along with
+    the store's write stamp at build time. Rows written since then (new,
+    reusing a freed row or updated in place) may sit in the wrong list or in
+    none, so they are found by their stamp and scanned exhaustively until
+    the next build.
+    """
+
+    name = "ivf"
+
+    def __init__(self, store: EmbeddingStore, n_probe: int = None):
+        super().__init__(store)
+        self.n_probe = n_probe or settings.SEMANTIC_SEARCH_IVF_PROBES
+        self.centroids_path = store.directory / f"{store.name}.ivf.centroids.npy"
+        self.lists_path = store.directory / f"{store.name}.ivf.lists.npy"
+        self.offsets_path = store.directory / f"{store.name}.ivf.offsets.npy"
+        self.stamp_path = store.directory / f"{store.name}.ivf.stamp.npy"
+        self._lock = threading.Lock()
+        self._version = None
+        self._centroids = None
+        self._lists = None
+        self._offsets = None
+        self._stamp = None
+        self._dirty = None  # (store version, rows written since the build)
+
+    def _load(self) -> bool:
+        """(Re)map the index files if they changed, False when there are none"""
+        try:
+            version = os.stat(self.offsets_path).st_mtime_ns
+        except FileNotFoundError:
+            self._version = self._centroids = self._lists = self._offsets = None
+            return False
+        if version != self._version:
+            self._centroids = np.load(self.centroids_path, mmap_mode="r")
+            self._lists = np.load(self.lists_path, mmap_mode="r")
+            self._offsets = np.load(self.offsets_path)
+            try:
+                self._stamp = int(np.load(self.stamp_path)[0])
+            except FileNotFoundError:
+                self._stamp = -1  # Built before stamps existed, trust no row
+            self._version = version
+            self._dirty = None
+        return True
+
+    def _dirty_rows(self) -> np.ndarray:
+        """Rows written since the build, recomputed when the store changes"""
+        version = self.store.version
+        if self._dirty is None or self._dirty[0] != version:
+            self._dirty = (version, self.store.rows_written_after(self._stamp))
+        return self._dirty[1]
+
+    def search(self, vector, k):
+        vectors, keys = self.store.snapshot()
+        if vectors is None or k <= 0:
+            return []
+        with self._lock:
+            if not self._load():
+                return self.store.search(vector, k)
+            centroids, lists, offsets = self._centroids, self._lists, self._offsets
+            dirty = self._dirty_rows()
+
+        vector = np.asarray(vector, dtype=np.float32)
+        probes = top_k(centroids @ vector, self.n_probe)
+        rows = np.concatenate(
+            [lists[offsets[probe] : offsets[probe + 1]] for probe in probes] + [dirty]
+        )
+        # Sorted for sequential reads from the map, a dirty row may also be
+        # in a probed list
+        rows = np.unique(rows[rows < len(keys)])
+
+        scores = vectors[rows] @ vector
+        scores[keys[rows] == ""] = -np.inf
+        return [(str(keys[rows[i]]), float(scores[i])) for i in top_k(scores, k)]
+
+    def build(self, n_lists: int = None, seed: int = 0) -> int:
+        """Cluster the stored rows and write the index files, returns n_lists"""
+        # Stamp first: a row written after it is scanned even if the snapshot
+        # already has it
+        stamp = self.store.stamp
+        vectors, keys = self.store.snapshot()
+        if vectors is None:
+            return 0
+        rows = np.flatnonzero(keys != "")
+        if not len(rows):
+            return 0
+        if not n_lists:
+            n_lists = settings.SEMANTIC_SEARCH_IVF_LISTS or round(
+                4 * math.sqrt(len(rows))
+            )
+        n_lists = max(1, min(n_lists, len(rows)))
+
+        centroids = _spherical_kmeans(vectors, rows, n_lists, seed)
+        assignment = np.concatenate(
+            [
+                np.argmax(vectors[chunk] @ centroids.T, axis=1)
+                for chunk in np.array_split(
+                    rows, max(1, math.ceil(len(rows) / ASSIGN_CHUNK_ROWS))
+                )
+            ]
+        )
+        order = np.argsort(assignment, kind="stable")
+        lists = rows[order].astype(np.int64)
+        offsets = np.searchsorted(assignment[order], np.arange(n_lists + 1))
+
+        # Offsets last: readers reload when the offsets file changes
+        for path, array in (
+            (self.centroids_path, centroids),
+            (self.lists_path, lists),
+            (self.stamp_path, np.array([stamp], dtype=np.int64)),
+            (self.offsets_path, offsets.astype(np.int64)),
+        ):
+            tmp_path = path.with_name(f"{path.stem}.tmp.npy")
+            np.save(tmp_path, array)
+            os.replace(tmp_path, path)
+        return n_lists
+
+
+def _spherical_kmeans(
+    vectors: np.ndarray, rows: np.ndarray, n_lists: int, seed: int
+) -> np.ndarray:
+    """Unit-length centroids of a sample of rows, clustered by cosine similarity"""
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(rows), n_lists * KMEANS_SAMPLE_PER_LIST)
+    sample = np.asarray(
+        vectors[np.sort(rng.choice(rows, sample_size, replace=False))],
+        dtype=np.float32,
+    )
+    centroids = sample[rng.choice(sample_size, n_lists, replace=False)].copy()
+
+    for _ in range(KMEANS_ITERATIONS):
+        assignment = np.argmax(sample @ centroids.T, axis=1)
+        membership = sparse.csr_matrix(
+            (
+                np.ones(sample_size, dtype=np.float32),
+                (assignment, np.arange(sample_size)),
+            ),
+            shape=(n_lists, sample_size),
+        )
+        sums = np.asarray(membership @ sample)
+        sizes = np.asarray(membership.sum(axis=1)).ravel()
+
+        # Re-seed empty lists with random sample rows
+        empty = np.flatnonzero(sizes == 0)
+        if len(empty):
+            sums[empty] = sample[rng.choice(sample_size, len(empty), replace=False)]
+
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        new_centroids = sums / np.maximum(norms, 1e-12)
+        if np.allclose(new_centroids, centroids, atol=1e-5):
+            break
+        centroids = new_centroids.astype(np.float32)
+
+    return centroids
+
+
+INDEX_TYPES = {index.name: index for index in (ExactIndex, IVFIndex)}
+
+_indexes: Dict[Tuple[str, str], VectorIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(kind: str, index_type: Optional[str] = None) -> VectorIndex:
+    """The per-process index of a source kind, SEMANTIC_SEARCH_INDEX by default"""
+    index_type = index_type or settings.SEMANTIC_SEARCH_INDEX
+    if index_type not in INDEX_TYPES:
+        raise SemanticSearchUnavailable(
+            f"Unknown index {index_type!r}, SEMANTIC_SEARCH_INDEX must be one "
+            f"of: {', '.join(INDEX_TYPES)}"
+        )
+    with _indexes_lock:
+        if (kind, index_type) not in _indexes:
+            _indexes[kind, index_type] = INDEX_TYPES[index_type](get_store(kind))
+        return _indexes[kind, index_type]
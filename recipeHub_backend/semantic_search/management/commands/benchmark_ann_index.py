@@ -0,0 +1,74 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from semantic_search.embeddings import SOURCES, get_store
+from semantic_search.index import ExactIndex, IVFIndex
+
+
+def _timed_search(index, queries, k):
+    """Results and per-query latencies in milliseconds"""
+    results, latencies = [], []
+    for query in queries:
+        started = time.perf_counter()
+        results.append([key for key, _ in index.search(query, k)])
+        latencies.append((time.perf_counter() - started) * 1000)
+    return results, np.array(latencies)
+
+
+class Command(BaseCommand):
+    help = "Compare IVF recall and latency against the exact scan"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--type", choices=list(SOURCES), default="recipe")
+        parser.add_argument("--queries", type=int, default=200)
+        parser.add_argument("--k", type=int, default=10)
+        parser.add_argument(
+            "--probes",
+            default="1,2,4,8,16,32",
+            help="Comma separated n_probe values to try",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        store = get_store(options["type"])
+        vectors, keys = store.snapshot()
+        if vectors is None or not len(store):
+            raise CommandError("No embeddings stored, run rebuild_embeddings first")
+
+        # Stored rows, slightly perturbed, stand in for real queries
+        rng = np.random.default_rng(options["seed"])
+        rows = np.flatnonzero(keys != "")
+        sample = rng.choice(rows, min(options["queries"], len(rows)), replace=False)
+        queries = vectors[np.sort(sample)] + rng.normal(
+            0, 0.01, (len(sample), vectors.shape[1])
+        ).astype(np.float32)
+        queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+        k = options["k"]
+
+        exact, exact_latency = _timed_search(ExactIndex(store), queries, k)
+        self.stdout.write(
+            f"{len(store)} {store.name}, {len(queries)} queries, k={k}\n"
+            f"{'index':<12}{'recall@k':>10}{'p50 ms':>10}{'p95 ms':>10}"
+        )
+        self._report("exact", 1.0, exact_latency)
+
+        for n_probe in (int(value) for value in options["probes"].split(",")):
+            approximate, latency = _timed_search(
+                IVFIndex(store, n_probe=n_probe), queries, k
+            )
+            recall = np.mean(
+                [
+                    len(set(found) & set(expected)) / len(expected)
+                    for found, expected in zip(approximate, exact)
+                    if expected
+                ]
+            )
+            self._report(f"ivf/{n_probe}", recall, latency)
+
+    def _report(self, label, recall, latency):
+        self.stdout.write(
+            f"{label:<12}{recall:>10.3f}"
+            f"{np.percentile(latency, 50):>10.2f}{np.percentile(latency, 95):>10.2f}"
+        )
@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from semantic_search.embeddings import SOURCES, get_store
+from semantic_search.index import IVFIndex
+
+
+class Command(BaseCommand):
+    help = "Cluster stored embeddings into an IVF nearest-neighbour index"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--type", choices=list(SOURCES), default="recipe")
+        parser.add_argument(
+            "--lists",
+            type=int,
+            default=0,
+            help="Number of clusters (default: SEMANTIC_SEARCH_IVF_LISTS or 4 * sqrt(rows))",
+        )
+
+    def handle(self, *args, **options):
+        store = get_store(options["type"])
+        started = time.perf_counter()
+        n_lists = IVFIndex(store).build(n_lists=options["lists"])
+        if not n_lists:
+            self.stdout.write(
+                self.style.WARNING("No embeddings stored, nothing to index")
+            )
+            return
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Indexed {len(store)} {store.name} into {n_lists} lists "
+                f"in {time.perf_counter() - started:.1f}s"
+            )
+        )
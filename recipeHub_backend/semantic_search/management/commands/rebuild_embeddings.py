@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from semantic_search.embeddings import (
+    SOURCES,
+    embedding_dimension,
+    get_store,
+    iter_batches,
+)
+from semantic_search.index import get_index
+
+
+class Command(BaseCommand):
+    help = "Encode recipes and food items in batches and rebuild their embedding stores"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--type",
+            choices=[*SOURCES, "all"],
+            default="all",
+            help="Which store to rebuild (default: all)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.SEMANTIC_SEARCH_BATCH_SIZE,
+            help="Rows encoded per model call",
+        )
+
+    def handle(self, *args, **options):
+        kinds = list(SOURCES) if options["type"] == "all" else [options["type"]]
+        dimension = embedding_dimension()
+
+        for kind in kinds:
+            rows = SOURCES[kind].queryset().count()
+            written = get_store(kind).rebuild(
+                iter_batches(kind, options["batch_size"]), rows, dimension
+            )
+            self.stdout.write(
+                self.style.SUCCESS(f"Embedded {written} {SOURCES[kind].name}")
+            )
+            # Row numbers changed, so the ANN lists must be rebuilt as well
+            get_index(kind).build()
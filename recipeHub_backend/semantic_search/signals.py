@@ -0,0 +1,116 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from food_map.models import FoodCategory, FoodItem
+from kitchen.models import Recipe
+
+from .embeddings import SOURCES, sync_objects
+
+logger = logging.getLogger(__name__)
+
+# One writer per process: encoding stays off the request thread and updates
+# to the same store are applied in commit order
+_sync_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embeddings")
+
+
+def _sync(kind, pks):
+    try:
+        sync_objects(kind, pks)
+    except Exception as e:
+        logger.warning(f"Could not update {len(pks)} {kind} embeddings: {e}")
+    finally:
+        close_old_connections()
+
+
+def schedule_sync(kind, *pks):
+    """Re-embed objects in the background once the current transaction commits"""
+    if pks and getattr(settings, "SEMANTIC_SEARCH_SYNC", True):
+        transaction.on_commit(partial(_sync_executor.submit, _sync, kind, pks))
+
+
+def _touches_text(kind, update_fields):
+    fields = SOURCES[kind].fields
+    return update_fields is None or bool(set(update_fields) & set(fields))
+
+
+def remember_embedded_values(kind, instance, update_fields=None):
+    """Before a save, read the stored values the embedded text is built from"""
+    instance._embedded_values = None
+    if not instance._state.adding and _touches_text(kind, update_fields):
+        instance._embedded_values = (
+            type(instance)
+            .objects.filter(pk=instance.pk)
+            .values_list(*SOURCES[kind].fields)
+            .first()
+        )
+
+
+def embedded_values_changed(kind, instance, created, update_fields=None):
+    """After a save, whether the object's embedded text may differ"""
+    if created:
+        return True
+    if not _touches_text(kind, update_fields):
+        return False
+    current = tuple(getattr(instance, field) for field in SOURCES[kind].fields)
+    return getattr(instance, "_embedded_values", None) != current
+
+
+@receiver(pre_save, sender=Recipe)
+def remember_recipe_text(sender, instance, update_fields=None, **kwargs):
+    remember_embedded_values("recipe", instance, update_fields)
+
+
+@receiver(pre_save, sender=FoodItem)
+def remember_food_item_text(sender, instance, update_fields=None, **kwargs):
+    remember_embedded_values("food", instance, update_fields)
+
+
+@receiver(pre_save, sender=FoodCategory)
+def remember_category_name(sender, instance, **kwargs):
+    instance._embedded_name = None
+    if not instance._state.adding:
+        instance._embedded_name = (
+            FoodCategory.objects.filter(pk=instance.pk)
+            .values_list("name", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Recipe)
+def sync_recipe_embedding(sender, instance, created, update_fields=None, **kwargs):
+    if embedded_values_changed("recipe", instance, created, update_fields):
+        schedule_sync("recipe", instance.pk)
+
+
+@receiver(post_save, sender=FoodItem)
+def sync_food_item_embedding(sender, instance, created, update_fields=None, **kwargs):
+    # Counter updates (ratings, favorites, search length) and edits of other
+    # fields leave the text alone
+    if embedded_values_changed("food", instance, created, update_fields):
+        schedule_sync("food", instance.pk)
+
+
+@receiver(post_save, sender=FoodCategory)
+def sync_category_embeddings(sender, instance, created, **kwargs):
+    # A food item's text includes its category's name, re-embed the items of
+    # a renamed category in one batch
+    if created or getattr(instance, "_embedded_name", None) == instance.name:
+        return
+    items = FoodItem.objects.filter(category=instance, is_active=True)
+    schedule_sync("food", *items.values_list("pk", flat=True))
+
+
+@receiver(post_delete, sender=Recipe)
+def drop_recipe_embedding(sender, instance, **kwargs):
+    schedule_sync("recipe", instance.pk)
+
+
+@receiver(post_delete, sender=FoodItem)
+def drop_food_item_embedding(sender, instance, **kwargs):
+    schedule_sync("food", instance.pk)
@@ -0,0 +1,7 @@
+from django.urls import path
+
+from . import views
+
+urlpatterns = [
+    path("search/", views.SemanticSearchView.as_view(), name="semantic-search"),
+]
@@ -0,0 +1,77 @@
+import logging
+
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from food_map.models import FoodItem
+from food_map.serializers import FoodItemListSerializer
+from kitchen.models import Recipe
+from kitchen.serializers import RecipeSerializers
+
+from .embeddings import SOURCES, SemanticSearchUnavailable, encode
+from .index import get_index
+
+logger = logging.getLogger(__name__)
+
+MAX_RESULTS = 50
+
+
+class SemanticSearchView(APIView):
+    """
+    Find recipes or food items by meaning rather than exact words.
+    GET ?q=<text>&type=recipe|food&limit=<n>
+    """
+
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        query = request.query_params.get("q", "").strip()
+        kind = request.query_params.get("type", "recipe")
+        if not query:
+            return Response(
+                {"error": "Query parameter 'q' is required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if kind not in SOURCES:
+            return Response(
+                {"error": f"type must be one of: {', '.join(SOURCES)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            limit = min(max(int(request.query_params.get("limit", 10)), 1), MAX_RESULTS)
+        except ValueError:
+            return Response(
+                {"error": "limit must be an integer"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            index = get_index(kind)
+            query_vector = encode([query])[0]
+        except SemanticSearchUnavailable as e:
+            logger.error(f"Semantic search unavailable: {e}")
+            return Response(
+                {"error": "Semantic search is not available"},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+
+        matches = index.search(query_vector, limit)
+        keys = [key for key, _ in matches]
+
+        if kind == "recipe":
+            queryset = Recipe.objects.select_related("user")
+            serializer_class = RecipeSerializers
+        else:
+            queryset = FoodItem.objects.filter(is_active=True).for_list(request.user)
+            serializer_class = FoodItemListSerializer
+        objects = {str(obj.pk): obj for obj in queryset.filter(pk__in=keys)}
+
+        # Rows deleted since they were embedded are skipped
+        results = []
+        for key, score in matches:
+            if key in objects:
+                item = serializer_class(objects[key], context={"request": request}).data
+                results.append({"score": round(score, 4), "item": item})
+
+        return Response({"query": query, "type": kind, "results": results})